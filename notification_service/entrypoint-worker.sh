@@ -4,11 +4,19 @@ WORKER_TYPE=$1
 
 case $WORKER_TYPE in
     scheduler)
+        if [ "$NOTIFY_SCHEDULER_MODE" = "timer" ]; then
+            echo "Starting $WORKER_TYPE worker in timer mode..."
+            exec uv run workers/timer_scheduler.py
+        fi
         WORKER_MODULE="src.workers.scheduler"
         ;;
     repeater)
         WORKER_MODULE="src.workers.repeater"
         ;;
+    outbox-relay)
+        echo "Starting $WORKER_TYPE worker..."
+        exec uv run workers/outbox_relay.py
+        ;;
     *)
         echo "Unknown worker type: $WORKER_TYPE"
         exit 1
@@ -0,0 +1,70 @@
+# stdlib
+from collections.abc import Awaitable, Callable
+from typing import Annotated
+from uuid import UUID
+
+# thirdparty
+from fastapi import Depends, HTTPException, Request, Response
+from redis.asyncio import Redis
+from starlette import status
+
+# project
+from db.redis import get_redis
+from models.base import Base
+from repositories.sql.interfaces.repositories import IReadRepository
+from services.etag_cache import EtagCache, etag_matches, make_etag
+
+# Ответ можно хранить, но перед использованием нужно проверить его актуальность по ETag
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def get_etag_cache(kind: str) -> Callable[..., Awaitable[EtagCache]]:
+    """Создает зависимость, возвращающую кеш ETag записей указанного типа."""
+
+    async def dependency(redis: Annotated[Redis | None, Depends(get_redis)]) -> EtagCache:
+        return EtagCache(redis, kind)
+
+    return dependency
+
+
+async def get_not_modified(
+    request: Request,
+    etag_cache: EtagCache,
+    repo: IReadRepository,
+    id: UUID,
+    not_found_detail: str,
+) -> Response | None:
+    """
+    Возвращает ответ 304, если ETag из If-None-Match совпадает с текущим.
+
+    ETag берется из кеша, а при промахе вычисляется по одному `updated_at` без чтения всей строки.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return None
+
+    etag = await etag_cache.get(id)
+    if etag is None:
+        updated_at = await repo.get_updated_at(id)
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=not_found_detail,
+            )
+        etag = make_etag(id, updated_at)
+        await etag_cache.set(id, etag)
+
+    if not etag_matches(if_none_match, etag):
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
+
+async def set_etag(response: Response, etag_cache: EtagCache, db_obj: Base) -> None:
+    """Проставляет ETag записи в ответ и обновляет его в кеше."""
+    etag = make_etag(db_obj.id, db_obj.updated_at)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    await etag_cache.set(db_obj.id, etag)
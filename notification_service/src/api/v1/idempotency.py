@@ -0,0 +1,96 @@
+# stdlib
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any, TypeVar
+
+# thirdparty
+import orjson
+from fastapi import Depends, Header, Request, Response
+from fastapi.encoders import jsonable_encoder
+from redis.asyncio import Redis
+
+# project
+from db.redis import get_redis
+from schemas.auth import JwtToken
+from services.idempotency import IDEMPOTENCY_KEY_HEADER, IdempotencyStore
+from services.jwt_token import JWTBearer
+from services.rate_limiter import get_client_identity
+
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+T = TypeVar("T")
+
+
+async def get_idempotency_owner(
+    request: Request,
+    token_payload: Annotated[JwtToken | None, Depends(JWTBearer(auto_error=False))],
+) -> str:
+    """Владелец ключей идемпотентности: пользователь из проверенного токена, а без токена - клиент по адресу."""
+    if token_payload is not None:
+        return f"user:{token_payload.user}"
+    return get_client_identity(request)
+
+
+def get_idempotency(scope: str) -> Callable[..., Awaitable[IdempotencyStore | None]]:
+    """Создает зависимость, возвращающую хранилище ответа для ключа из заголовка Idempotency-Key."""
+
+    async def dependency(
+        request: Request,
+        redis: Annotated[Redis | None, Depends(get_redis)],
+        owner: Annotated[str, Depends(get_idempotency_owner)],
+        idempotency_key: Annotated[
+            str | None,
+            Header(
+                alias=IDEMPOTENCY_KEY_HEADER,
+                max_length=255,
+                description="Ключ, по которому повторы запроса получают ответ первого запроса без повторной отправки",
+            ),
+        ] = None,
+    ) -> IdempotencyStore | None:
+        if idempotency_key is None or redis is None:
+            return None
+        return IdempotencyStore(redis, scope, owner, idempotency_key, await request.body())
+
+    return dependency
+
+
+async def run_idempotent(
+    idempotency: IdempotencyStore | None,
+    handler: Callable[[], Awaitable[T]],
+    status_code: int,
+    is_final: Callable[[T], bool],
+) -> Response:
+    """
+    Выполняет обработчик запроса один раз на ключ идемпотентности и возвращает его результат в виде JSON.
+
+    Ответ сохраняется, только если `is_final` признает его окончательным: после ошибок публикации ключ
+    освобождается, и повтор запроса публикует сообщения заново.
+    """
+    if idempotency is None:
+        return json_response(await handler(), status_code)
+
+    stored = await idempotency.begin()
+    if stored is not None:
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={IDEMPOTENT_REPLAYED_HEADER: "true"},
+        )
+
+    try:
+        result = await handler()
+    except BaseException:
+        await idempotency.release()
+        raise
+    response = json_response(result, status_code)
+    if is_final(result):
+        await idempotency.complete(status_code, response.body)
+    else:
+        await idempotency.release()
+    return response
+
+
+def json_response(content: Any, status_code: int) -> Response:
+    return Response(
+        content=orjson.dumps(jsonable_encoder(content)), status_code=status_code, media_type="application/json"
+    )
@@ -2,18 +2,52 @@
 from typing import Annotated
 
 # thirdparty
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from starlette.requests import Request
 
 # project
+from api.v1.idempotency import (
+    get_idempotency,
+    get_idempotency_owner,
+    run_idempotent,
+)
+from api.v1.rate_limit import (
+    charge_publishing,
+    get_rate_limit_key,
+    get_rate_limiter,
+    limit_publishing,
+)
+from core.config import settings
+from db.broker import get_broker, get_coalescer
 from db.db import get_session
 from enums.db import get_priority_for_event
 from enums.rabbitmq import MessageType, get_queue_for_event
 from repositories.sql.template import TemplateRepository
-from schemas.messages import Message, MessageResponse, RabbitMQMessage
-from services.rabbitmq import RabbitMQService
+from schemas.messages import (
+    IngestProgress,
+    Message,
+    MessageHeader,
+    MessageResponse,
+    RabbitMQMessage,
+)
+from services.brokers import BrokerBase, PublishRequest
+from services.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IdempotencyStore,
+    get_idempotent_message_id,
+)
+from services.message_coalescer import MessageCoalescer
+from services.message_ingest import (
+    LineTooLongError,
+    SubscriberStreamIngestor,
+    build_message_body,
+    iter_lines,
+)
+from services.rate_limiter import RateLimiter
 
 router = APIRouter()
 
@@ -24,12 +58,31 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     description="Отправление сообщения в очередь на отправку",
     summary="Отправление сообщения в очередь",
+    dependencies=[Depends(limit_publishing)],
 )
 async def send_message(
     message: Message,
-    rabbitmq_service: Annotated[RabbitMQService, Depends(RabbitMQService)],
+    broker: Annotated[BrokerBase, Depends(get_broker)],
     db: Annotated[AsyncSession, Depends(get_session)],
     request: Request,
+    idempotency: Annotated[IdempotencyStore | None, Depends(get_idempotency("send-message"))],
+    coalescer: Annotated[MessageCoalescer | None, Depends(get_coalescer)],
+) -> Response:
+    return await run_idempotent(
+        idempotency,
+        lambda: publish_message(message, broker, db, request, idempotency, coalescer),
+        status.HTTP_201_CREATED,
+        is_final=is_published,
+    )
+
+
+async def publish_message(
+    message: Message,
+    broker: BrokerBase,
+    db: AsyncSession,
+    request: Request,
+    idempotency: IdempotencyStore | None,
+    coalescer: MessageCoalescer | None,
 ) -> MessageResponse:
     template_repo = TemplateRepository(db)
     template = await template_repo.get(message.template_id)
@@ -38,6 +91,10 @@ async def send_message(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Template not found",
         )
+    # Сообщения с ключом идемпотентности не объединяются: идентификатор выводится из ключа каждого запроса
+    if coalescer is not None and idempotency is None:
+        return await coalescer.submit(message, request.headers.get("X-Request-Id"))
+    message_id = idempotency.message_id if idempotency is not None else None
     message_body = RabbitMQMessage(
         context=message.context,
         subscribers=[str(m) for m in message.subscribers],
@@ -46,14 +103,170 @@ async def send_message(
         channel_type=message.channel_type,
         notification_id=None,
         message_type=MessageType.IMMEDIATE,
+        idempotency_id=message_id,
     )
     queue = get_queue_for_event(message.event_type)
     priority = get_priority_for_event(message.event_type)
 
-    result = await rabbitmq_service.send_message(
-        queue_name=queue.queue_name,
-        message_body=message_body.model_dump_json(),
-        priority=priority,
-        x_request_id=request.headers.get("X-Request-Id"),
+    (result,) = await broker.send_batch(
+        [
+            PublishRequest(
+                queue_name=queue.queue_name,
+                message_body=message_body.model_dump_json(),
+                priority=priority,
+                x_request_id=request.headers.get("X-Request-Id"),
+                message_id=message_id,
+            )
+        ]
     )
     return result
+
+
+def is_published(result: MessageResponse) -> bool:
+    return result.status == "success"
+
+
+def all_published(results: list[MessageResponse]) -> bool:
+    return all(is_published(result) for result in results)
+
+
+@router.post(
+    "/send-batch/",
+    response_model=list[MessageResponse],
+    status_code=status.HTTP_201_CREATED,
+    description=(
+        "Отправление пачки сообщений в очередь на отправку. Результаты возвращаются в порядке сообщений. "
+        "Размер пачки ограничен настройкой send_batch_max_size"
+    ),
+    summary="Пакетное отправление сообщений в очередь",
+)
+async def send_batch(
+    messages: Annotated[list[Message], Body(max_length=settings.send_batch_max_size)],
+    broker: Annotated[BrokerBase, Depends(get_broker)],
+    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
+    idempotency: Annotated[IdempotencyStore | None, Depends(get_idempotency("send-batch"))],
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+) -> Response:
+    # Пачка списывается из лимита отправки по числу сообщений, как и столько же запросов send-message
+    await charge_publishing(request, limiter, len(messages))
+    return await run_idempotent(
+        idempotency,
+        lambda: publish_batch(messages, broker, db, request, idempotency),
+        status.HTTP_201_CREATED,
+        is_final=all_published,
+    )
+
+
+async def publish_batch(
+    messages: list[Message],
+    broker: BrokerBase,
+    db: AsyncSession,
+    request: Request,
+    idempotency: IdempotencyStore | None,
+) -> list[MessageResponse]:
+    x_request_id = request.headers.get("X-Request-Id")
+    # Существование шаблонов проверяется одним запросом на всю пачку
+    template_ids = {message.template_id for message in messages}
+    existing_template_ids = await TemplateRepository(db).get_existing_ids(template_ids)
+
+    results: list[MessageResponse | None] = [None] * len(messages)
+    publish_indexes: list[int] = []
+    publish_requests: list[PublishRequest] = []
+    for index, message in enumerate(messages):
+        queue = get_queue_for_event(message.event_type)
+        priority = get_priority_for_event(message.event_type)
+        if message.template_id not in existing_template_ids:
+            results[index] = MessageResponse(
+                status="error",
+                message="Template not found",
+                queue=queue.queue_name,
+                priority=priority,
+                x_request_id=x_request_id,
+            )
+            continue
+        # Сообщения пачки получают идентификаторы, выведенные из ключа идемпотентности и своего номера
+        message_id = f"{idempotency.message_id}:{index}" if idempotency is not None else None
+        publish_indexes.append(index)
+        publish_requests.append(
+            PublishRequest(
+                queue_name=queue.queue_name,
+                message_body=build_message_body(message, message.subscribers, message_id),
+                priority=priority,
+                x_request_id=x_request_id,
+                message_id=message_id,
+            )
+        )
+
+    published = await broker.send_batch(publish_requests)
+    for index, result in zip(publish_indexes, published, strict=True):
+        results[index] = result
+    return [result for result in results if result is not None]
+
+
+@router.post(
+    "/send-stream/",
+    response_model=IngestProgress,
+    status_code=status.HTTP_201_CREATED,
+    description=(
+        "Потоковая отправка сообщения большому списку подписчиков в формате NDJSON. Первая строка - объект "
+        "с полями event_type, channel_type, template_id и context, каждая следующая - идентификатор подписчика. "
+        "Подписчики публикуются пачками по мере чтения, после чтения всего тела возвращается итог отправки"
+    ),
+    summary="Потоковая отправка сообщения",
+)
+async def send_stream(
+    broker: Annotated[BrokerBase, Depends(get_broker)],
+    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
+    response: Response,
+    idempotency_owner: Annotated[str, Depends(get_idempotency_owner)],
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+    idempotency_key: Annotated[
+        str | None,
+        Header(
+            alias=IDEMPOTENCY_KEY_HEADER,
+            max_length=255,
+            description="Ключ, по которому воркер отбрасывает пачки, уже отправленные предыдущей попыткой запроса",
+        ),
+    ] = None,
+) -> IngestProgress:
+    lines = iter_lines(request.stream(), settings.stream_ingest_max_line_length)
+    try:
+        header = MessageHeader.model_validate_json(await anext(lines))
+    except StopAsyncIteration:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Message header is missing",
+        )
+    except LineTooLongError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    if await TemplateRepository(db).get(header.template_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template not found",
+        )
+
+    # Ответ потоковой отправки не сохраняется: повтор публикует поток заново, а дубли отбрасывает воркер
+    ingestor = SubscriberStreamIngestor(
+        broker,
+        header,
+        request.headers.get("X-Request-Id"),
+        get_idempotent_message_id("send-stream", idempotency_owner, idempotency_key) if idempotency_key else None,
+        limiter,
+        get_rate_limit_key(request),
+    )
+
+    # Тело читается целиком до ответа: во время потокового ответа Starlette забирает оставшиеся части тела
+    # запроса, ожидая отключения клиента, и часть подписчиков была бы потеряна
+    progress = await ingestor.ingest(lines)
+    # Заголовки лимита добавляет в ответ middleware rate_limit_headers
+    request.state.rate_limit = ingestor.rate_limit
+    if progress.status == "error":
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    elif progress.status == "rate_limited":
+        response.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    return progress
@@ -1,12 +1,77 @@
+# stdlib
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID
+
 # thirdparty
-from fastapi import Query
+import orjson
+from fastapi import HTTPException, Query, Response
+from starlette import status
+
+# project
+from core.config import settings
+from repositories.sql.interfaces.repositories import IReadRepository
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 class PaginationParams:
     def __init__(
         self,
         page_size: int = Query(default=10, ge=1, le=50),
-        page_number: int = Query(default=1, ge=1),
+        page_number: int = Query(
+            default=1,
+            ge=1,
+            description="Номер страницы. Для глубокого листания используйте cursor",
+        ),
+        cursor: str | None = Query(
+            default=None,
+            description=f"Курсор следующей страницы из заголовка {NEXT_CURSOR_HEADER}. Заменяет page_number",
+        ),
     ) -> None:
         self.page_size = page_size
         self.page_number = page_number
+        self.cursor = cursor
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([created_at, id])).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor",
+        )
+
+
+def get_list_fields(fields: Sequence[str], heavy_fields: set[str], include: list[str] | None) -> list[str]:
+    """Возвращает поля для выборки списка: тяжелые поля попадают в нее, только если запрошены в `include`."""
+    requested = set(include or [])
+    return [field for field in fields if field not in heavy_fields or field in requested]
+
+
+async def paginate(repo: IReadRepository, params: PaginationParams, fields: Sequence[str]) -> Response:
+    """
+    Возвращает страницу записей в порядке (created_at, id) в виде JSON-списка.
+
+    Строки выборки сериализуются в JSON напрямую, без ORM-объектов и моделей ответа. Если есть
+    следующая страница, ее курсор передается в заголовке `X-Next-Cursor`.
+    """
+    after = decode_cursor(params.cursor) if params.cursor else None
+    skip = 0 if after is not None else (params.page_number - 1) * params.page_size
+    # Лишняя запись показывает, есть ли следующая страница
+    rows = await repo.get_page(fields=fields, after=after, skip=skip, limit=params.page_size + 1)
+
+    headers = {"Cache-Control": f"private, max-age={settings.list_cache_max_age}"}
+    if len(rows) > params.page_size:
+        rows = rows[: params.page_size]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    content = orjson.dumps([{field: row[field] for field in fields} for row in rows])
+    return Response(content=content, media_type="application/json", headers=headers)
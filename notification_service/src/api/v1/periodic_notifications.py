@@ -3,12 +3,18 @@ from typing import Annotated
 from uuid import UUID
 
 # thirdparty
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 # project
-from api.v1.pagination import PaginationParams
+from api.v1.conditional import get_etag_cache, get_not_modified, set_etag
+from api.v1.pagination import (
+    NEXT_CURSOR_HEADER,
+    PaginationParams,
+    get_list_fields,
+    paginate,
+)
 from db.db import get_session
 from repositories.sql.periodic_notification import (
     PeriodicNotificationRepository,
@@ -17,13 +23,17 @@ from schemas.auth import JwtToken
 from schemas.periodic_notifications import (
     PeriodicNotificationCreate,
     PeriodicNotificationInput,
+    PeriodicNotificationListItem,
     PeriodicNotificationResponse,
     PeriodicNotificationUpdate,
 )
+from services.etag_cache import EtagCache
 from services.jwt_token import JWTBearer
 
 router = APIRouter()
 
+NOTIFICATION_HEAVY_FIELDS = {"context", "subscriber_query_params"}
+
 
 @router.post(
     "/",
@@ -49,15 +59,24 @@ async def create_periodic_notification(
 )
 async def get_periodic_notification(
     notification_id: UUID,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_session)],
-) -> PeriodicNotificationResponse:
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("periodic"))],
+) -> PeriodicNotificationResponse | Response:
     repo = PeriodicNotificationRepository(db)
+    not_modified = await get_not_modified(
+        request, etag_cache, repo, notification_id, "Periodic notification not found"
+    )
+    if not_modified is not None:
+        return not_modified
     db_notification = await repo.get(notification_id)
     if db_notification is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Periodic notification not found",
         )
+    await set_etag(response, etag_cache, db_notification)
     return PeriodicNotificationResponse.model_validate(db_notification)
 
 
@@ -68,8 +87,10 @@ async def get_periodic_notification(
 async def update_periodic_notification(
     notification_id: UUID,
     notification: PeriodicNotificationInput,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_session)],
     token_payload: Annotated[JwtToken, Depends(JWTBearer())],
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("periodic"))],
 ) -> PeriodicNotificationResponse:
     repo = PeriodicNotificationRepository(db)
     db_notification = await repo.get(notification_id)
@@ -82,6 +103,7 @@ async def update_periodic_notification(
         db_obj=db_notification,
         obj_in=PeriodicNotificationUpdate(**notification.model_dump(), staff_id=token_payload.user),
     )
+    await set_etag(response, etag_cache, db_notification)
     return PeriodicNotificationResponse.model_validate(db_notification)
 
 
@@ -93,6 +115,7 @@ async def update_periodic_notification(
 async def delete_periodic_notification(
     notification_id: UUID,
     db: Annotated[AsyncSession, Depends(get_session)],
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("periodic"))],
 ) -> None:
     repo = PeriodicNotificationRepository(db)
     db_notification = await repo.delete(notification_id)
@@ -101,20 +124,22 @@ async def delete_periodic_notification(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Periodic notification not found",
         )
+    await etag_cache.invalidate(notification_id)
 
 
 @router.get(
     "/",
-    response_model=list[PeriodicNotificationResponse],
+    response_model=list[PeriodicNotificationListItem],
     dependencies=[Depends(JWTBearer())],
+    description=(
+        "Список уведомлений в порядке создания. Поля context и subscriber_query_params возвращаются, "
+        f"только если запрошены через include. Курсор следующей страницы передается в заголовке {NEXT_CURSOR_HEADER}"
+    ),
 )
 async def get_all_periodic_notifications(
     pagination_params: Annotated[PaginationParams, Depends()],
     db: Annotated[AsyncSession, Depends(get_session)],
-) -> list[PeriodicNotificationResponse]:
-    repo = PeriodicNotificationRepository(db)
-    notifications = await repo.get_multi(
-        skip=(pagination_params.page_number - 1) * pagination_params.page_size,
-        limit=pagination_params.page_size,
-    )
-    return [PeriodicNotificationResponse.model_validate(db_notification) for db_notification in notifications]
+    include: Annotated[list[str] | None, Query(description="Тяжелые поля, которые нужно вернуть")] = None,
+) -> Response:
+    fields = get_list_fields(list(PeriodicNotificationListItem.model_fields), NOTIFICATION_HEAVY_FIELDS, include)
+    return await paginate(PeriodicNotificationRepository(db), pagination_params, fields)
@@ -0,0 +1,98 @@
+# stdlib
+from typing import Annotated, Any
+
+# thirdparty
+from fastapi import Depends, Request, WebSocket
+from redis.asyncio import Redis
+
+# project
+from core.config import settings
+from db.broker import get_load_shedder
+from db.redis import get_redis
+from exceptions.rate_limit import OverloadedError, RateLimitExceededError
+from services.load_shedding import LoadShedder
+from services.rate_limiter import RateLimiter, get_client_identity
+
+
+async def get_rate_limiter(redis: Annotated[Redis | None, Depends(get_redis)]) -> RateLimiter | None:
+    if not settings.rate_limit_enabled or redis is None:
+        return None
+    return RateLimiter(redis)
+
+
+async def limit_requests(
+    request: Request,
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+) -> None:
+    """Ограничивает частоту запросов клиента к маршруту."""
+    await enforce_rate_limit(request, limiter, settings.rate_limit_capacity, settings.rate_limit_refill_rate)
+
+
+async def limit_publishing(
+    request: Request,
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+) -> None:
+    """Ограничивает частоту отправки сообщений клиентом, запрос стоит одно сообщение."""
+    await charge_publishing(request, limiter, 1)
+
+
+async def reject_overloaded(load_shedder: Annotated[LoadShedder | None, Depends(get_load_shedder)]) -> None:
+    """Отклоняет отправку сообщений при перегрузке."""
+    if load_shedder is not None and (reason := await load_shedder.get_overload_reason()) is not None:
+        raise OverloadedError(reason, settings.load_shedding_retry_after)
+
+
+async def charge_publishing(request: Request, limiter: RateLimiter | None, count: int) -> None:
+    """Списывает из лимита отправки клиента `count` сообщений запроса."""
+    await enforce_rate_limit(
+        request, limiter, settings.rate_limit_publish_capacity, settings.rate_limit_publish_refill_rate, count
+    )
+
+
+def get_rate_limit_key(request: Request) -> str:
+    route = request.scope.get("route")
+    path = route.path if route is not None else request.url.path
+    return f"{request.method}:{path}:{get_client_identity(request)}"
+
+
+async def enforce_rate_limit(
+    request: Request,
+    limiter: RateLimiter | None,
+    capacity: int,
+    refill_rate: float,
+    cost: int = 1,
+) -> None:
+    if limiter is None:
+        return
+    result = await limiter.hit(get_rate_limit_key(request), capacity, refill_rate, cost)
+    if result is None:
+        return
+    # Заголовки лимита добавляет в ответ middleware rate_limit_headers
+    request.state.rate_limit = result
+    if not result.allowed:
+        raise RateLimitExceededError("Rate limit exceeded", result.get_headers())
+
+
+async def get_socket_rejection(
+    websocket: WebSocket,
+    limiter: RateLimiter | None,
+    load_shedder: LoadShedder | None,
+    cost: int = 1,
+) -> dict[str, Any] | None:
+    """
+    Проверяет лимиты для сообщения веб-сокета из `cost` кадров.
+
+    Возвращает ответ с отказом или None, если сообщение можно принять.
+    """
+    if limiter is not None:
+        result = await limiter.hit(
+            f"WS:{websocket.url.path}:{get_client_identity(websocket)}",
+            settings.rate_limit_publish_capacity,
+            settings.rate_limit_publish_refill_rate,
+            cost,
+        )
+        if result is not None and not result.allowed:
+            return {"status": "rate_limited", "retry_after": result.retry_after}
+    if load_shedder is not None and (reason := await load_shedder.get_overload_reason()) is not None:
+        return {"status": "overloaded", "detail": reason, "retry_after": settings.load_shedding_retry_after}
+    return None
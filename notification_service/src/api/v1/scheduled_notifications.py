@@ -3,12 +3,18 @@ from typing import Annotated
 from uuid import UUID
 
 # thirdparty
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 # project
-from api.v1.pagination import PaginationParams
+from api.v1.conditional import get_etag_cache, get_not_modified, set_etag
+from api.v1.pagination import (
+    NEXT_CURSOR_HEADER,
+    PaginationParams,
+    get_list_fields,
+    paginate,
+)
 from db.db import get_session
 from repositories.sql.scheduled_notification import (
     ScheduledNotificationRepository,
@@ -17,13 +23,17 @@ from schemas.auth import JwtToken
 from schemas.scheduled_notifications import (
     ScheduledNotificationCreate,
     ScheduledNotificationInput,
+    ScheduledNotificationListItem,
     ScheduledNotificationResponse,
     ScheduledNotificationUpdate,
 )
+from services.etag_cache import EtagCache
 from services.jwt_token import JWTBearer
 
 router = APIRouter()
 
+NOTIFICATION_HEAVY_FIELDS = {"context", "subscriber_query_params"}
+
 
 @router.post(
     "/",
@@ -52,15 +62,24 @@ async def create_scheduled_notification(
 )
 async def get_scheduled_notification(
     notification_id: UUID,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_session)],
-) -> ScheduledNotificationResponse:
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("scheduled"))],
+) -> ScheduledNotificationResponse | Response:
     repo = ScheduledNotificationRepository(db)
+    not_modified = await get_not_modified(
+        request, etag_cache, repo, notification_id, "Scheduled notification not found"
+    )
+    if not_modified is not None:
+        return not_modified
     db_notification = await repo.get(notification_id)
     if db_notification is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scheduled notification not found",
         )
+    await set_etag(response, etag_cache, db_notification)
     return ScheduledNotificationResponse.model_validate(db_notification)
 
 
@@ -71,8 +90,10 @@ async def get_scheduled_notification(
 async def update_scheduled_notification(
     notification_id: UUID,
     notification: ScheduledNotificationInput,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_session)],
     token_payload: Annotated[JwtToken, Depends(JWTBearer())],
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("scheduled"))],
 ) -> ScheduledNotificationResponse:
     repo = ScheduledNotificationRepository(db)
     db_notification = await repo.get(notification_id)
@@ -85,6 +106,7 @@ async def update_scheduled_notification(
         db_obj=db_notification,
         obj_in=ScheduledNotificationUpdate(**notification.model_dump(), staff_id=token_payload.user),
     )
+    await set_etag(response, etag_cache, db_notification)
     return ScheduledNotificationResponse.model_validate(db_notification)
 
 
@@ -96,6 +118,7 @@ async def update_scheduled_notification(
 async def delete_scheduled_notification(
     notification_id: UUID,
     db: Annotated[AsyncSession, Depends(get_session)],
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("scheduled"))],
 ) -> None:
     repo = ScheduledNotificationRepository(db)
     db_notification = await repo.delete(notification_id)
@@ -104,20 +127,22 @@ async def delete_scheduled_notification(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scheduled notification not found",
         )
+    await etag_cache.invalidate(notification_id)
 
 
 @router.get(
     "/",
-    response_model=list[ScheduledNotificationResponse],
+    response_model=list[ScheduledNotificationListItem],
     dependencies=[Depends(JWTBearer())],
+    description=(
+        "Список уведомлений в порядке создания. Поля context и subscriber_query_params возвращаются, "
+        f"только если запрошены через include. Курсор следующей страницы передается в заголовке {NEXT_CURSOR_HEADER}"
+    ),
 )
 async def get_all_scheduled_notifications(
     pagination_params: Annotated[PaginationParams, Depends()],
     db: Annotated[AsyncSession, Depends(get_session)],
-) -> list[ScheduledNotificationResponse]:
-    repo = ScheduledNotificationRepository(db)
-    notifications = await repo.get_multi(
-        skip=(pagination_params.page_number - 1) * pagination_params.page_size,
-        limit=pagination_params.page_size,
-    )
-    return [ScheduledNotificationResponse.model_validate(db_notification) for db_notification in notifications]
+    include: Annotated[list[str] | None, Query(description="Тяжелые поля, которые нужно вернуть")] = None,
+) -> Response:
+    fields = get_list_fields(list(ScheduledNotificationListItem.model_fields), NOTIFICATION_HEAVY_FIELDS, include)
+    return await paginate(ScheduledNotificationRepository(db), pagination_params, fields)
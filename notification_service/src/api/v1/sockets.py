@@ -1,4 +1,6 @@
 # stdlib
+import asyncio
+import json
 from typing import Annotated
 
 # thirdparty
@@ -9,15 +11,20 @@ from starlette.responses import FileResponse
 from starlette.websockets import WebSocketDisconnect
 
 # project
-from core.config import STATIC_DIR
+from api.v1.rate_limit import get_rate_limiter, get_socket_rejection
+from core.config import STATIC_DIR, settings
+from db.broker import get_broker, get_load_shedder
 from db.db import get_session
 from enums.db import get_priority_for_event
 from enums.rabbitmq import MessageType, get_queue_for_event
 from exceptions.auth_exceptions import AuthError
 from repositories.sql.template import TemplateRepository
-from schemas.messages import Message, RabbitMQMessage
+from schemas.messages import Message, RabbitMQMessage, SocketFrame
+from services.brokers import BrokerBase
 from services.jwt_token import JWTBearer
-from services.rabbitmq import RabbitMQService
+from services.load_shedding import LoadShedder
+from services.rate_limiter import RateLimiter
+from services.socket_pipeline import SocketPipeline
 
 router = APIRouter()
 
@@ -35,13 +42,15 @@ async def get() -> FileResponse:
 @router.websocket("/ws/send-message")
 async def websocket_endpoint(
     websocket: WebSocket,
-    rabbitmq_service: Annotated[RabbitMQService, Depends(RabbitMQService)],
+    broker: Annotated[BrokerBase, Depends(get_broker)],
     db: Annotated[AsyncSession, Depends(get_session)],
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+    load_shedder: Annotated[LoadShedder | None, Depends(get_load_shedder)],
     access_token: Annotated[str, Cookie(description="JWT-токен доступа")] = "",
 ) -> None:
     await websocket.accept()
     try:
-        JWTBearer().verify_jwt(access_token)
+        await JWTBearer().verify_jwt(access_token)
     except AuthError:
         await websocket.send_json({"status": "auth_error", "detail": "Ошибка авторизации, проверьте куки"})
         return
@@ -49,6 +58,9 @@ async def websocket_endpoint(
     try:
         while True:
             data = await websocket.receive_json()
+            if (rejection := await get_socket_rejection(websocket, limiter, load_shedder)) is not None:
+                await websocket.send_json(rejection)
+                continue
             try:
                 message = Message(**data)
             except ValidationError as e:
@@ -74,7 +86,7 @@ async def websocket_endpoint(
             queue = get_queue_for_event(message.event_type)
             priority = get_priority_for_event(message.event_type)
 
-            result = await rabbitmq_service.send_message(
+            result = await broker.send_message(
                 queue_name=queue.queue_name,
                 message_body=message_body.model_dump_json(),
                 priority=priority,
@@ -86,3 +98,70 @@ async def websocket_endpoint(
     except Exception as e:
         await websocket.send_json({"status": "error", "detail": str(e)})
         await websocket.close()
+
+
+@router.websocket("/ws/v2/send-message")
+async def websocket_pipeline_endpoint(
+    websocket: WebSocket,
+    broker: Annotated[BrokerBase, Depends(get_broker)],
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+    load_shedder: Annotated[LoadShedder | None, Depends(get_load_shedder)],
+    access_token: Annotated[str, Cookie(description="JWT-токен доступа")] = "",
+) -> None:
+    """
+    Веб-сокет с конвейерной отправкой.
+
+    Кадр клиента - объект `{"id": ..., "message": {...}}` или массив таких объектов, где `id` - произвольный
+    идентификатор для сопоставления ответа. Сервер отвечает массивами подтверждений `{"id", "status", ...}`
+    в порядке публикации, не дожидаясь, пока клиент прочитает предыдущие. Массив может содержать
+    не больше `websocket_batch_size` кадров, а лимит частоты списывается за каждый кадр массива.
+    """
+    await websocket.accept()
+    try:
+        await JWTBearer().verify_jwt(access_token)
+    except AuthError:
+        await websocket.send_json({"status": "auth_error", "detail": "Ошибка авторизации, проверьте куки"})
+        return
+
+    pipeline = SocketPipeline(websocket, broker, websocket.headers.get("X-Request-Id"))
+    runner = asyncio.create_task(pipeline.run())
+    try:
+        while True:
+            try:
+                data = await websocket.receive_json()
+            except json.JSONDecodeError as e:
+                # Кадр без корректного JSON не разрывает соединение, остальные кадры продолжают обрабатываться
+                await pipeline.reply([{"id": None, "status": "validation_error", "detail": f"Некорректный JSON: {e}"}])
+                continue
+            raw_frames = data if isinstance(data, list) else [data]
+            if len(raw_frames) > settings.websocket_batch_size:
+                await websocket.send_json(
+                    {
+                        "status": "validation_error",
+                        "detail": f"Массив содержит больше {settings.websocket_batch_size} кадров",
+                    }
+                )
+                continue
+            rejection = await get_socket_rejection(websocket, limiter, load_shedder, len(raw_frames))
+            if rejection is not None:
+                await pipeline.reply(
+                    [
+                        {"id": raw_frame.get("id") if isinstance(raw_frame, dict) else None} | rejection
+                        for raw_frame in raw_frames
+                    ]
+                )
+                continue
+            for raw_frame in raw_frames:
+                try:
+                    frame = SocketFrame.model_validate(raw_frame)
+                except ValidationError as e:
+                    frame_id = raw_frame.get("id") if isinstance(raw_frame, dict) else None
+                    await pipeline.reply([{"id": frame_id, "status": "validation_error", "detail": str(e)}])
+                    continue
+                await pipeline.submit(frame)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        await pipeline.close()
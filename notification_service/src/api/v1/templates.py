@@ -3,20 +3,44 @@ from typing import Annotated
 from uuid import UUID
 
 # thirdparty
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 # project
-from api.v1.pagination import PaginationParams
+from api.v1.conditional import get_etag_cache, get_not_modified, set_etag
+from api.v1.pagination import (
+    NEXT_CURSOR_HEADER,
+    PaginationParams,
+    get_list_fields,
+    paginate,
+)
 from db.db import get_session
 from repositories.sql.template import TemplateRepository
 from schemas.auth import JwtToken
-from schemas.templates import TemplateCreate, TemplateResponse, TemplateUpdate
+from schemas.templates import (
+    TemplateCreate,
+    TemplateListItem,
+    TemplateResponse,
+    TemplateUpdate,
+)
+from services.etag_cache import EtagCache
 from services.jwt_token import JWTBearer
 
 router = APIRouter()
 
+TEMPLATE_HEAVY_FIELDS = {"body"}
+
 
 @router.post(
     "/",
@@ -57,15 +81,22 @@ async def create_template(
 )
 async def get_template(
     template_id: UUID,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_session)],
-) -> TemplateResponse:
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("template"))],
+) -> TemplateResponse | Response:
     repo = TemplateRepository(db)
+    not_modified = await get_not_modified(request, etag_cache, repo, template_id, "Template not found")
+    if not_modified is not None:
+        return not_modified
     db_template = await repo.get(template_id)
     if db_template is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Template not found",
         )
+    await set_etag(response, etag_cache, db_template)
     return TemplateResponse.model_validate(db_template)
 
 
@@ -73,13 +104,15 @@ async def get_template(
     "/{template_id}",
     response_model=TemplateResponse,
 )
-async def update_template(
+async def update_template(  # noqa: PLR0913
     template_id: UUID,
     name: Annotated[str, Form(...)],
     subject: Annotated[str, Form(...)],
     body: Annotated[UploadFile, File(...)],
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_session)],
     token_payload: Annotated[JwtToken, Depends(JWTBearer())],
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("template"))],
 ) -> TemplateResponse:
     repo = TemplateRepository(db)
     db_template = await repo.get(template_id)
@@ -104,6 +137,7 @@ async def update_template(
             detail=str(e),
         )
     db_template = await repo.update(db_obj=db_template, obj_in=template)
+    await set_etag(response, etag_cache, db_template)
     return TemplateResponse.model_validate(db_template)
 
 
@@ -115,6 +149,7 @@ async def update_template(
 async def delete_template(
     template_id: UUID,
     db: Annotated[AsyncSession, Depends(get_session)],
+    etag_cache: Annotated[EtagCache, Depends(get_etag_cache("template"))],
 ) -> None:
     repo = TemplateRepository(db)
     db_template = await repo.delete(template_id)
@@ -123,20 +158,22 @@ async def delete_template(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Template not found",
         )
+    await etag_cache.invalidate(template_id)
 
 
 @router.get(
     "/",
-    response_model=list[TemplateResponse],
+    response_model=list[TemplateListItem],
     dependencies=[Depends(JWTBearer())],
+    description=(
+        "Список шаблонов в порядке создания. Тело шаблона возвращается, только если запрошено через include=body. "
+        f"Курсор следующей страницы передается в заголовке {NEXT_CURSOR_HEADER}"
+    ),
 )
 async def get_all_templates(
     pagination_params: Annotated[PaginationParams, Depends()],
     db: Annotated[AsyncSession, Depends(get_session)],
-) -> list[TemplateResponse]:
-    repo = TemplateRepository(db)
-    templates = await repo.get_multi(
-        skip=(pagination_params.page_number - 1) * pagination_params.page_size,
-        limit=pagination_params.page_size,
-    )
-    return [TemplateResponse.model_validate(db_template) for db_template in templates]
+    include: Annotated[list[str] | None, Query(description="Тяжелые поля, которые нужно вернуть")] = None,
+) -> Response:
+    fields = get_list_fields(list(TemplateListItem.model_fields), TEMPLATE_HEAVY_FIELDS, include)
+    return await paginate(TemplateRepository(db), pagination_params, fields)
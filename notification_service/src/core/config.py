@@ -26,6 +26,17 @@ class ShortenerService(StrEnum):
     TINYCC = "tinycc"
 
 
+class SchedulerMode(StrEnum):
+    CRON = "cron"
+    TIMER = "timer"
+
+
+class BrokerBackend(StrEnum):
+    AMQP = "amqp"
+    MEMORY = "memory"
+    REDIS = "redis"
+
+
 class AppSettings(BaseSettings):
     project_name: str = Field(default="Notification API")
     api_production: bool = Field(default=True)
@@ -47,20 +58,258 @@ class AppSettings(BaseSettings):
         default=120,
         description="Время хранения успешно отправленных уведомлений в секундах",
     )
+    message_dedup_ttl: int = Field(
+        default=86400,
+        description="Время хранения идентификаторов обработанных сообщений для отбрасывания повторов в секундах",
+    )
+    message_processing_lease: int = Field(
+        default=60,
+        ge=1,
+        description=(
+            "Время аренды сообщения воркером в секундах. Если воркер упал во время обработки, повторная доставка "
+            "сообщения будет обработана после истечения аренды"
+        ),
+    )
+    message_lease_retry_delay: float = Field(
+        default=1.0,
+        ge=0,
+        description="Задержка возврата в очередь сообщения, которое обрабатывает другой воркер, в секундах",
+    )
+    idempotency_ttl: int = Field(
+        default=86400,
+        ge=1,
+        description="Время хранения ответов на запросы с заголовком Idempotency-Key в секундах",
+    )
+    idempotency_lock_timeout: int = Field(
+        default=30,
+        ge=1,
+        description="Время, на которое запрос захватывает ключ идемпотентности до сохранения ответа, в секундах",
+    )
+    idempotency_wait_timeout: float = Field(
+        default=5.0,
+        ge=0,
+        description="Время ожидания ответа на запрос с тем же ключом идемпотентности в секундах",
+    )
+    idempotency_poll_interval: float = Field(
+        default=0.05,
+        gt=0,
+        description="Интервал проверки ответа на запрос с тем же ключом идемпотентности в секундах",
+    )
 
     # Sentry
     sentry_dsn: str = Field(default="")
     sentry_traces_sample_rate: float = Field(default=1.0)
 
+    # Брокер сообщений
+    broker_backend: BrokerBackend = Field(
+        default=BrokerBackend.AMQP,
+        description=(
+            "Брокер сообщений: amqp - RabbitMQ, redis - Redis Streams, memory - очереди в памяти процесса "
+            "для тестов и замеров"
+        ),
+    )
+    redis_stream_max_length: int = Field(
+        default=100000,
+        ge=1,
+        description="Приблизительная максимальная длина потока одного приоритета очереди в брокере Redis Streams",
+    )
+    redis_stream_read_count: int = Field(
+        default=100,
+        ge=1,
+        description="Максимальное число сообщений, забираемых потребителем за одно чтение, если не задан prefetch",
+    )
+    redis_stream_block_timeout: int = Field(
+        default=1000,
+        ge=1,
+        description="Время ожидания новых сообщений одним блокирующим чтением в миллисекундах",
+    )
+    redis_stream_claim_idle: int = Field(
+        default=300000,
+        ge=1,
+        description="Время в миллисекундах, после которого неподтвержденное сообщение забирается другим потребителем",
+    )
+
     # RabbitMQ
     rabbitmq_host: str = Field(default="rabbitmq")
     rabbitmq_port: int = Field(default=5672)
     rabbitmq_user: str = Field(default="guest")
     rabbitmq_password: str = Field(default="password")
+    rabbitmq_publish_window: int = Field(
+        default=100,
+        description="Максимальное число сообщений, ожидающих подтверждения публикации",
+    )
+    rabbitmq_channel_pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Количество каналов публикации на одно соединение процесса",
+    )
+    rabbitmq_channel_max_in_flight: int = Field(
+        default=256,
+        ge=1,
+        description="Максимальное число неподтвержденных публикаций в одном канале",
+    )
+
+    # API
+    send_batch_max_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Максимальное число сообщений в одном запросе пакетной отправки",
+    )
+    stream_ingest_chunk_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Число подписчиков в одном сообщении очереди при потоковой отправке",
+    )
+    stream_ingest_max_line_length: int = Field(
+        default=65536,
+        ge=1,
+        description="Максимальная длина строки NDJSON при потоковой отправке в байтах",
+    )
+
+    etag_cache_ttl: int = Field(
+        default=30,
+        ge=1,
+        description="Время хранения ETag записи в кеше в секундах, задержка видимости изменений в обход API",
+    )
+    list_cache_max_age: int = Field(
+        default=5,
+        ge=0,
+        description="Значение max-age заголовка Cache-Control для списков в секундах",
+    )
+    websocket_window: int = Field(
+        default=100,
+        ge=1,
+        description="Максимальное число кадров веб-сокета, одновременно находящихся в обработке",
+    )
+    websocket_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Максимальное число кадров веб-сокета, публикуемых одной пачкой",
+    )
+
+    # Объединение сообщений
+    coalesce_enabled: bool = Field(
+        default=False,
+        description="Объединять сообщения send-message с одинаковым содержимым в одно сообщение очереди",
+    )
+    coalesce_delay_ms: float = Field(
+        default=5.0,
+        gt=0,
+        description="Максимальное время накопления объединяемых сообщений в миллисекундах",
+    )
+    coalesce_max_subscribers: int = Field(
+        default=100,
+        ge=1,
+        description="Число подписчиков, при котором объединенное сообщение публикуется без ожидания",
+    )
+
+    # Ограничение нагрузки
+    rate_limit_enabled: bool = Field(default=True, description="Ограничивать частоту запросов клиентов")
+    rate_limit_capacity: int = Field(
+        default=100,
+        ge=1,
+        description="Число запросов клиента к маршруту, которое можно выполнить без паузы",
+    )
+    rate_limit_refill_rate: float = Field(
+        default=50.0,
+        gt=0,
+        description="Допустимая частота запросов клиента к маршруту в секунду",
+    )
+    rate_limit_publish_capacity: int = Field(
+        default=1000,
+        ge=1,
+        description="Число сообщений или кадров веб-сокета, которые клиент может отправить без паузы",
+    )
+    rate_limit_publish_refill_rate: float = Field(
+        default=20.0,
+        gt=0,
+        description="Допустимая частота отправки сообщений или кадров веб-сокета клиентом в секунду",
+    )
+    load_shedding_enabled: bool = Field(default=True, description="Отклонять отправку сообщений при перегрузке")
+    load_shedding_max_publish_latency: float = Field(
+        default=1.0,
+        gt=0,
+        description="Среднее время публикации в секундах, выше которого отправка сообщений отклоняется",
+    )
+    load_shedding_max_outbox_depth: int = Field(
+        default=100000,
+        ge=1,
+        description="Число сообщений в outbox, при котором отправка сообщений отклоняется",
+    )
+    load_shedding_sample_interval: float = Field(
+        default=5.0,
+        gt=0,
+        description="Время в секундах, в течение которого учитываются замеры нагрузки",
+    )
+    load_shedding_retry_after: int = Field(
+        default=5,
+        ge=1,
+        description="Значение заголовка Retry-After при перегрузке в секундах",
+    )
+
+    # Режим outbox
+    outbox_enabled: bool = Field(
+        default=False,
+        description="Сохранять сообщения API в таблицу outbox вместо публикации в брокер во время запроса",
+    )
+    outbox_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Число сообщений outbox, публикуемых ретранслятором за одну транзакцию",
+    )
+    outbox_poll_interval: float = Field(
+        default=0.2,
+        gt=0,
+        description="Интервал проверки новых сообщений outbox в секундах",
+    )
+    outbox_retry_delay: float = Field(
+        default=5.0,
+        gt=0,
+        description="Задержка перед повторной публикацией сообщения outbox в секундах, удваивается с каждой попыткой",
+    )
+    outbox_max_retry_delay: float = Field(
+        default=300.0,
+        gt=0,
+        description="Максимальная задержка перед повторной публикацией сообщения outbox в секундах",
+    )
+    outbox_max_attempts: int = Field(
+        default=10,
+        ge=1,
+        description="Число попыток публикации, после которого сообщение outbox переносится в недоставленные",
+    )
 
     # Работа с токенами
     jwt_algorithm: str = Field(default="RS256")
     jwt_public_key_path: str = Field(default="/app/keys/example_public_key.pem")
+    jwt_key_check_interval: float = Field(
+        default=5.0,
+        ge=0,
+        description="Как часто проверять изменение файла открытого ключа в секундах",
+    )
+    jwt_jwks_url: str = Field(
+        default="",
+        description="Адрес набора ключей JWKS. Если задан, используется вместо файла открытого ключа",
+    )
+    jwt_jwks_lifespan: int = Field(
+        default=300,
+        ge=1,
+        description="Время кеширования набора ключей JWKS в секундах",
+    )
+    jwt_jwks_refetch_interval: float = Field(
+        default=30.0,
+        ge=0,
+        description="Минимальный интервал повторной загрузки набора JWKS из-за неизвестного kid в секундах",
+    )
+    jwt_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Максимальное число проверенных токенов в кеше, 0 отключает кеш",
+    )
+    jwt_cache_ttl: int = Field(
+        default=300,
+        ge=1,
+        description="Максимальное время хранения проверенного токена в кеше в секундах",
+    )
 
     # Настройки ARQ
     arq_job_timeout: int = Field(default=300)
@@ -71,6 +320,26 @@ class AppSettings(BaseSettings):
     periodic_schedule: str = Field(default="* * * * *")  # Каждую минуту
     scheduled_schedule: str = Field(default="* * * * *")
     repeater_schedule: str = Field(default="* * * * *")
+    expiry_schedule: str = Field(
+        default="0 * * * *",
+        description="Расписание выключения периодических уведомлений, у которых наступил stop_date",
+    )
+    scheduler_mode: SchedulerMode = Field(
+        default=SchedulerMode.CRON,
+        description="Режим планировщика: опрос БД по cron или таймеры в памяти с LISTEN/NOTIFY",
+    )
+    misfire_grace_time: int = Field(
+        default=60,
+        description="Допустимое опоздание запуска периодического уведомления в секундах для политики skip",
+    )
+    timer_scheduler_resync_interval: int = Field(
+        default=600,
+        description="Интервал полной сверки таймеров планировщика с БД в секундах",
+    )
+    timer_scheduler_retry_delay: int = Field(
+        default=30,
+        description="Задержка перед повторной рассылкой недоставленного уведомления в режиме таймеров в секундах",
+    )
 
     # Настройки для пакетной обработки
     scheduled_batch_size: int = Field(
@@ -81,6 +350,78 @@ class AppSettings(BaseSettings):
         default=100,
         description="Размер пакета для повторной обработки сломанных уведомлений",
     )
+    repeater_retry_delay: int = Field(
+        default=60,
+        description="Задержка перед первой повторной публикацией сообщения в секундах, удваивается с каждой попыткой",
+    )
+    repeater_max_retry_delay: int = Field(
+        default=3600,
+        description="Максимальная задержка перед повторной публикацией сообщения в секундах",
+    )
+    repeater_max_attempts: int = Field(
+        default=5,
+        description="Число повторных публикаций, после которого сообщение помещается в карантин",
+    )
+    repeater_visibility_timeout: int = Field(
+        default=300,
+        gt=0,
+        description="Время в секундах, через которое неподтвержденное сообщение снова доступно для повтора",
+    )
+    repeater_quarantine_max_length: int = Field(
+        default=10000,
+        gt=0,
+        description="Максимальное количество сообщений в карантине очереди, более старые удаляются",
+    )
+    repeater_quarantine_ttl: int = Field(
+        default=604800,
+        gt=0,
+        description="Время хранения карантина очереди в секундах с момента последнего добавления",
+    )
+    scheduler_concurrency: int = Field(
+        default=10,
+        description="Количество уведомлений, рассылаемых планировщиком одновременно",
+    )
+    scheduler_batch_size: int = Field(
+        default=100,
+        description="Количество подписчиков в одном сообщении рассылки",
+    )
+    scheduler_tick_budget: int = Field(
+        default=240,
+        description="Бюджет времени одного запуска планировщика в секундах, должен быть меньше arq_job_timeout",
+    )
+
+    # Управление темпом публикации по состоянию очередей
+    backpressure_enabled: bool = Field(default=True)
+    backpressure_sample_interval: float = Field(
+        default=1.0,
+        description="Интервал запроса глубины очереди в секундах",
+    )
+    backpressure_max_queue_depth: int = Field(
+        default=10000,
+        description="Глубина очереди, при которой планировщик приостанавливает публикацию",
+    )
+    backpressure_ttl_ratio: float = Field(
+        default=0.8,
+        gt=0,
+        le=1,
+        description="Доля TTL очереди, которую сообщение может провести в ожидании воркера",
+    )
+
+    # Кеширование выборок подписчиков
+    audience_cache_enabled: bool = Field(default=True)
+    audience_cache_lock_ttl: int = Field(
+        default=60,
+        description="Время жизни блокировки наполнения снимка выборки без продвижения в секундах",
+    )
+    audience_cache_poll_interval: float = Field(
+        default=0.2,
+        description="Интервал ожидания новых пачек при чтении наполняемого снимка выборки в секундах",
+    )
+    subscriber_prefetch_batches: int = Field(
+        default=0,
+        ge=0,
+        description="Количество пачек подписчиков, читаемых наперед во время публикации, 0 отключает",
+    )
 
     # Настройки отправки email
     smtp_server: str = Field(default="mailhog")
@@ -0,0 +1,21 @@
+# project
+from services.brokers import BrokerBase
+from services.load_shedding import LoadShedder
+from services.message_coalescer import MessageCoalescer
+
+broker: BrokerBase | None = None
+coalescer: MessageCoalescer | None = None
+load_shedder: LoadShedder | None = None
+
+
+async def get_broker() -> BrokerBase:
+    assert broker is not None, "Broker is not initialized"
+    return broker
+
+
+async def get_coalescer() -> MessageCoalescer | None:
+    return coalescer
+
+
+async def get_load_shedder() -> LoadShedder | None:
+    return load_shedder
@@ -0,0 +1,51 @@
+"""Notification change triggers
+
+Revision ID: 3f1c9a7b2d4e
+Revises: 7d35a64c4c58
+Create Date: 2026-10-19 19:40:12.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7b2d4e'
+down_revision: Union[str, None] = '7d35a64c4c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('periodicnotification', 'schedulednotification')
+
+
+def upgrade() -> None:
+    # Планировщик в режиме таймеров подписывается на канал notification_changes,
+    # чтобы узнавать об изменении времени срабатывания уведомлений без опроса БД
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_notification_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'notification_changes',
+                json_build_object(
+                    'table', TG_TABLE_NAME,
+                    'op', TG_OP,
+                    'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_notification_change();
+        """)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS notify_notification_change();")
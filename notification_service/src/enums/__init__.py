@@ -1,5 +1,5 @@
 # project
-from enums.db import ChannelType, EventType
+from enums.db import ChannelType, EventType, MisfirePolicy
 from enums.subscriber_query_enum import SubscriberQueryEnum
 
-__all__ = ["ChannelType", "EventType", "SubscriberQueryEnum"]
+__all__ = ["ChannelType", "EventType", "MisfirePolicy", "SubscriberQueryEnum"]
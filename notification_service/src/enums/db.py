@@ -21,6 +21,14 @@ class EventType(StrEnum):
     CUSTOM = "custom"
 
 
+class MisfirePolicy(StrEnum):
+    """Политики обработки пропущенных запусков периодических уведомлений."""
+
+    COALESCE = "coalesce"  # Пропущенные запуски схлопываются в один
+    SKIP = "skip"  # Опоздавший запуск пропускается целиком
+    REPLAY = "replay"  # Пропущенные запуски повторяются, но не больше misfire_max_replays
+
+
 EVENT_TO_PRIORITY_MAPPING: dict[EventType, int] = {
     EventType.USER_REGISTRATION: priority_levels.max_priority,
     EventType.NEW_MOVIE: priority_levels.min_priority,
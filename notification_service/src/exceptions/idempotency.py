@@ -0,0 +1,14 @@
+# project
+from exceptions.base import CustomException
+
+
+class IdempotencyKeyReusedError(CustomException):
+    """Ключ идемпотентности повторно использован с другим телом запроса."""
+
+    pass
+
+
+class IdempotencyInProgressError(CustomException):
+    """Запрос с тем же ключом идемпотентности еще обрабатывается."""
+
+    pass
@@ -0,0 +1,18 @@
+# project
+from exceptions.base import CustomException
+
+
+class RateLimitExceededError(CustomException):
+    """Клиент исчерпал лимит запросов."""
+
+    def __init__(self, message: str, headers: dict[str, str]) -> None:
+        super().__init__(message)
+        self.headers = headers
+
+
+class OverloadedError(CustomException):
+    """Сервис перегружен и временно не принимает сообщения."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
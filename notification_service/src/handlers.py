@@ -11,6 +11,11 @@ from starlette.responses import JSONResponse, Response
 # project
 from exceptions.auth_exceptions import AuthError
 from exceptions.db import ForeignKeyNotExistsError
+from exceptions.idempotency import (
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+)
+from exceptions.rate_limit import OverloadedError, RateLimitExceededError
 
 
 async def auth_exception_handler(_: Request, exc: AuthError) -> JSONResponse:
@@ -44,6 +49,41 @@ async def integrity_error_handler(_: Request, exc: IntegrityError) -> JSONRespon
     )
 
 
+async def idempotency_key_reused_handler(_: Request, exc: IdempotencyKeyReusedError) -> JSONResponse:
+    """Обработчик повторного использования ключа идемпотентности с другим телом запроса."""
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": str(exc)},
+    )
+
+
+async def idempotency_in_progress_handler(_: Request, exc: IdempotencyInProgressError) -> JSONResponse:
+    """Обработчик повтора, пришедшего во время выполнения запроса с тем же ключом идемпотентности."""
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def rate_limit_exceeded_handler(_: Request, exc: RateLimitExceededError) -> JSONResponse:
+    """Обработчик превышения лимита запросов."""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers=exc.headers,
+    )
+
+
+async def overloaded_handler(_: Request, exc: OverloadedError) -> JSONResponse:
+    """Обработчик перегрузки сервиса."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 exception_handlers: (
     dict[
         int | type[Exception],
@@ -54,4 +94,8 @@ exception_handlers: (
     AuthError: auth_exception_handler,
     ForeignKeyNotExistsError: foreign_key_error_handler,
     IntegrityError: integrity_error_handler,
+    IdempotencyKeyReusedError: idempotency_key_reused_handler,
+    IdempotencyInProgressError: idempotency_in_progress_handler,
+    RateLimitExceededError: rate_limit_exceeded_handler,
+    OverloadedError: overloaded_handler,
 }
@@ -17,11 +17,15 @@ from sqladmin import Admin
 # project
 from api.v1 import api_router as api_v1_router
 from core.config import settings
-from db import redis
+from db import broker, redis
 from db.db import engine
 from handlers import exception_handlers
+from middlewares.rate_limit import rate_limit_headers
 from middlewares.request_id import request_id_require
-from services.rabbitmq import RabbitMQService
+from services.brokers import create_broker
+from services.brokers.outbox import OutboxBroker
+from services.load_shedding import LoadShedder, MeteredBroker
+from services.message_coalescer import MessageCoalescer
 
 if settings.sentry_dsn:
     sentry_sdk.init(
@@ -32,15 +36,22 @@ if settings.sentry_dsn:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
-    rabbitmq_service = RabbitMQService()
-    await rabbitmq_service.init_queues()
+    broker.broker = OutboxBroker(create_broker()) if settings.outbox_enabled else create_broker()
+    if settings.load_shedding_enabled:
+        broker.load_shedder = LoadShedder()
+        broker.broker = MeteredBroker(broker.broker, broker.load_shedder)
+    await broker.broker.init_queues()
+    if settings.coalesce_enabled:
+        broker.coalescer = MessageCoalescer(broker.broker)
     redis.redis = Redis.from_url(settings.redis_url)
     try:
         yield
     finally:
+        if broker.coalescer is not None:
+            await broker.coalescer.close()
         if redis.redis is not None:
             await redis.redis.aclose()
-        await rabbitmq_service.close()
+        await broker.broker.close()
 
 
 app = FastAPI(
@@ -59,6 +70,7 @@ admin.add_view(TemplateAdmin)
 admin.add_view(ScheduledNotificationAdmin)
 admin.add_view(PeriodicNotificationAdmin)
 
+app.middleware("http")(rate_limit_headers)
 app.middleware("http")(request_id_require)
 
 app.include_router(api_v1_router, prefix="/api-notify/v1")
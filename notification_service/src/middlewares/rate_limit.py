@@ -0,0 +1,18 @@
+# stdlib
+from collections.abc import Callable
+
+# thirdparty
+from fastapi import Request, Response
+
+
+async def rate_limit_headers(
+    request: Request,
+    call_next: Callable,
+) -> Response:
+    """Добавляет в ответ заголовки лимита, проверенного зависимостью маршрута."""
+    response = await call_next(request)
+    rate_limit = getattr(request.state, "rate_limit", None)
+    if rate_limit is not None:
+        for name, value in rate_limit.get_headers().items():
+            response.headers.setdefault(name, value)
+    return response
@@ -1,11 +1,17 @@
 # project
 from models.base import Base
+from models.notification_run import NotificationRun
+from models.outbox_dead_letter import OutboxDeadLetter
+from models.outbox_message import OutboxMessage
 from models.periodic_notification import PeriodicNotification
 from models.scheduled_notification import ScheduledNotification
 from models.template import Template
 
 __all__ = [
     "Base",
+    "NotificationRun",
+    "OutboxDeadLetter",
+    "OutboxMessage",
     "PeriodicNotification",
     "ScheduledNotification",
     "Template",
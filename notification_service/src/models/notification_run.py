@@ -0,0 +1,38 @@
+# stdlib
+from datetime import datetime
+from uuid import UUID
+
+# thirdparty
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+# project
+from enums.rabbitmq import MessageType
+from models.base import Base
+
+
+class NotificationRun(Base):
+    """Модель запуска рассылки уведомления с контрольной точкой продвижения по подписчикам."""
+
+    notification_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    message_type: Mapped[MessageType] = mapped_column(nullable=False)
+    run_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    cursor: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    published_batches: Mapped[int] = mapped_column(default=0)
+    is_completed: Mapped[bool] = mapped_column(default=False)
+
+    __table_args__ = (
+        # Один запуск на каждое срабатывание уведомления
+        Index(
+            "ix_notification_runs_notification_run_time",
+            notification_id,
+            run_time,
+            unique=True,
+        ),
+    )
+
+    @property
+    def is_finished(self) -> bool:
+        """Рассылка завершена или все ее пачки были опубликованы до прерывания."""
+        return self.is_completed or (self.published_batches > 0 and self.cursor is None)
@@ -0,0 +1,18 @@
+# thirdparty
+from sqlalchemy import JSON, LargeBinary, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+# project
+from models.base import Base
+
+
+class OutboxDeadLetter(Base):
+    """Модель сообщения outbox, которое брокер не принял за `outbox_max_attempts` попыток."""
+
+    queue_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    priority: Mapped[int] = mapped_column(default=1)
+    message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    headers: Mapped[dict] = mapped_column(JSON, nullable=True)
+    attempts: Mapped[int] = mapped_column(nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,31 @@
+# stdlib
+from datetime import UTC, datetime
+
+# thirdparty
+from sqlalchemy import JSON, DateTime, Index, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+# project
+from models.base import Base
+
+
+class OutboxMessage(Base):
+    """Модель сообщения, принятого API и ожидающего публикации в брокер."""
+
+    queue_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    priority: Mapped[int] = mapped_column(default=1)
+    message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    headers: Mapped[dict] = mapped_column(JSON, nullable=True)
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Ретранслятор забирает сообщения, время попытки которых наступило, в порядке поступления
+        Index("ix_outbox_message_next_attempt_at", "next_attempt_at", "created_at"),
+    )
@@ -3,14 +3,14 @@ from datetime import UTC, datetime
 from uuid import UUID
 
 # thirdparty
-from croniter import croniter
-from sqlalchemy import JSON, DateTime, ForeignKey, Index, String
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, and_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 # project
-from enums.db import ChannelType, EventType
+from enums.db import ChannelType, EventType, MisfirePolicy
 from models.base import Base
+from services.cron import compile_cron
 
 
 class PeriodicNotification(Base):
@@ -28,6 +28,11 @@ class PeriodicNotification(Base):
     stop_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     subscriber_query_type: Mapped[str] = mapped_column(String(50), nullable=False)
     subscriber_query_params: Mapped[dict] = mapped_column(JSON, nullable=True)
+    misfire_policy: Mapped[MisfirePolicy] = mapped_column(
+        default=MisfirePolicy.COALESCE,
+        server_default=MisfirePolicy.COALESCE.name,
+    )
+    misfire_max_replays: Mapped[int] = mapped_column(default=10, server_default="10")
 
     # Индексы для оптимизации запросов
     __table_args__ = (
@@ -40,10 +45,17 @@ class PeriodicNotification(Base):
         ),
         # Для поиска по пользователю
         Index("ix_periodic_notifications_user", subscriber_query_type),
+        # Для выключения активных уведомлений, у которых наступил stop_date
+        Index(
+            "ix_periodic_notifications_active_stop_date",
+            stop_date,
+            postgresql_where=and_(is_active.is_(True), stop_date.isnot(None)),
+        ),
+        # Для постраничного вывода списка в порядке создания
+        Index("ix_periodic_notifications_created_at_id", "created_at", "id"),
     )
 
     def calculate_next_run(self, from_time: datetime | None = None) -> datetime:
         """Вычисляет время следующего запуска на основе CRON-расписания."""
         base_time = from_time or self.last_run_time or datetime.now(UTC)
-        cron = croniter(self.cron_schedule, base_time)
-        return cron.get_next(datetime)
+        return compile_cron(self.cron_schedule).next_after(base_time)
@@ -40,4 +40,6 @@ class ScheduledNotification(Base):
             subscriber_query_type,
             scheduled_time.desc(),
         ),
+        # Для постраничного вывода списка в порядке создания
+        Index("ix_scheduled_notifications_created_at_id", "created_at", "id"),
     )
@@ -2,7 +2,7 @@
 from uuid import UUID
 
 # thirdparty
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,3 +17,8 @@ class Template(Base):
     subject: Mapped[str] = mapped_column(String(255), nullable=False)
     body: Mapped[str] = mapped_column(Text, nullable=False)
     staff_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+
+    __table_args__ = (
+        # Для постраничного вывода списка в порядке создания
+        Index("ix_template_created_at_id", "created_at", "id"),
+    )
@@ -1,10 +1,12 @@
 # stdlib
+from collections.abc import Collection
+from datetime import datetime
 from typing import Any, Generic, TypeVar
 from uuid import UUID
 
 # thirdparty
 from pydantic import BaseModel
-from sqlalchemy import delete, select
+from sqlalchemy import RowMapping, delete, select, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -52,12 +54,47 @@ class BaseCRUDRepository(
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_existing_ids(self, ids: Collection[UUID]) -> set[UUID]:
+        """Возвращает идентификаторы из переданных, для которых есть записи, одним запросом."""
+        if not ids:
+            return set()
+        query = select(self.model.id).where(self.model.id.in_(ids))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def get_updated_at(self, id: UUID) -> datetime | None:
+        """Получает время последнего изменения записи без загрузки всей строки."""
+        query = select(self.model.updated_at).where(self.model.id == id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
     async def get_multi(self, *, skip: int = 0, limit: int = 100) -> list[ModelType]:
         """Получает список записей с пагинацией."""
         query = select(self.model).offset(skip).limit(limit)
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        *,
+        fields: Collection[str],
+        after: tuple[datetime, UUID] | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[RowMapping]:
+        """
+        Получает страницу записей в порядке (created_at, id) без загрузки ORM-объектов.
+
+        Выбираются только колонки `fields`, а также `id` и `created_at` для построения курсора.
+        Позиция задается значением (created_at, id) последней записи предыдущей страницы.
+        """
+        columns = {field: getattr(self.model, field) for field in (*fields, "id", "created_at")}
+        query = select(*columns.values()).order_by(self.model.created_at, self.model.id).offset(skip).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(self.model.created_at, self.model.id) > after)
+        result = await self.session.execute(query)
+        return list(result.mappings().all())
+
     async def update(self, *, db_obj: ModelType, obj_in: UpdateSchemaType | dict[str, Any]) -> ModelType:
         """Обновляет запись в БД."""
         obj_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
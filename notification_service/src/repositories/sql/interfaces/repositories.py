@@ -1,11 +1,13 @@
 # stdlib
 from abc import ABC, abstractmethod
+from collections.abc import Collection
 from datetime import datetime
 from typing import Any, Generic, TypeVar
 from uuid import UUID
 
 # thirdparty
 from pydantic import BaseModel
+from sqlalchemy import RowMapping
 
 # project
 from models.base import Base
@@ -23,11 +25,33 @@ class IReadRepository(Generic[ModelType], ABC):
         """Получает запись по ID."""
         pass
 
+    @abstractmethod
+    async def get_updated_at(self, id: UUID) -> datetime | None:
+        """Получает время последнего изменения записи."""
+        pass
+
     @abstractmethod
     async def get_multi(self, *, skip: int = 0, limit: int = 100) -> list[ModelType]:
         """Получает список записей с пагинацией."""
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        *,
+        fields: Collection[str],
+        after: tuple[datetime, UUID] | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[RowMapping]:
+        """Получает страницу записей в порядке (created_at, id), начиная после позиции `after`."""
+        pass
+
+    @abstractmethod
+    async def get_existing_ids(self, ids: Collection[UUID]) -> set[UUID]:
+        """Возвращает идентификаторы из переданных, для которых есть записи."""
+        pass
+
     @abstractmethod
     async def get_by_field(self, field: str, value: Any) -> ModelType | None:
         """Получает запись по указанному полю."""
@@ -0,0 +1,88 @@
+# stdlib
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+# thirdparty
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# project
+from enums.rabbitmq import MessageType
+from models import NotificationRun
+
+
+class NotificationRunRepository:
+    """Репозиторий для работы с запусками рассылок уведомлений."""
+
+    def __init__(self, session: AsyncSession):
+        self.model = NotificationRun
+        self.session = session
+
+    async def start(
+        self,
+        message_type: MessageType,
+        run_times: Sequence[tuple[UUID, datetime]],
+    ) -> list[NotificationRun]:
+        """Создает запуски для срабатываний уведомлений или возвращает уже существующие."""
+        if not run_times:
+            return []
+        now = datetime.now(UTC)
+        await self.session.execute(
+            insert(self.model)
+            .values(
+                [
+                    {
+                        "id": uuid4(),
+                        "notification_id": notification_id,
+                        "message_type": message_type,
+                        "run_time": run_time,
+                        "published_batches": 0,
+                        "is_completed": False,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for notification_id, run_time in run_times
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[self.model.notification_id, self.model.run_time])
+        )
+        await self.session.commit()
+
+        result = await self.session.execute(
+            select(self.model).where(tuple_(self.model.notification_id, self.model.run_time).in_(run_times))
+        )
+        return list(result.scalars().all())
+
+    async def checkpoint(self, run_id: UUID, cursor: str | None, published_batches: int) -> None:
+        """Сохраняет позицию, до которой рассылка уже опубликована."""
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == run_id)
+            .values(cursor=cursor, published_batches=published_batches, updated_at=datetime.now(UTC))
+        )
+        await self.session.commit()
+
+    async def complete(self, run_ids: Sequence[UUID]) -> None:
+        """Отмечает запуски завершенными."""
+        if not run_ids:
+            return
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id.in_(run_ids))
+            .values(is_completed=True, updated_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def delete_completed(self, notification_ids: Sequence[UUID]) -> None:
+        """Удаляет завершенные запуски уведомлений, срабатывание которых уже учтено в самом уведомлении."""
+        if not notification_ids:
+            return
+        await self.session.execute(
+            delete(self.model)
+            .where(self.model.notification_id.in_(notification_ids), self.model.is_completed.is_(True))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
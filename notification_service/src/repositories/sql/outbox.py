@@ -0,0 +1,103 @@
+# stdlib
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+# thirdparty
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# project
+from models import OutboxDeadLetter, OutboxMessage
+from services.brokers.base import PublishRequest
+
+
+class OutboxRepository:
+    """Репозиторий для работы с сообщениями, ожидающими публикации в брокер."""
+
+    def __init__(self, session: AsyncSession):
+        self.model = OutboxMessage
+        self.session = session
+
+    async def add(self, messages: Sequence[PublishRequest]) -> None:
+        """Сохраняет сообщения одним пакетным INSERT."""
+        if not messages:
+            return
+        now = datetime.now(UTC)
+        await self.session.execute(
+            insert(self.model),
+            [
+                {
+                    "id": uuid4(),
+                    "queue_name": message.queue_name,
+                    "body": message.body,
+                    "priority": message.priority,
+                    "message_id": message.message_id,
+                    "headers": message.get_headers(),
+                    "next_attempt_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for message in messages
+            ],
+        )
+        await self.session.commit()
+
+    async def count(self, limit: int) -> int:
+        """Считает сообщения outbox, но не больше `limit`, чтобы подсчет не зависел от размера таблицы."""
+        subquery = select(self.model.id).limit(limit).subquery()
+        result = await self.session.execute(select(func.count()).select_from(subquery))
+        return result.scalar_one()
+
+    async def lock_batch(self, limit: int) -> list[OutboxMessage]:
+        """
+        Блокирует до конца транзакции самые старые сообщения, время попытки которых наступило.
+
+        Сообщения, заблокированные другими ретрансляторами, пропускаются, поэтому ретрансляторы
+        могут работать параллельно, не публикуя одно сообщение дважды.
+        """
+        result = await self.session.execute(
+            select(self.model)
+            .where(self.model.next_attempt_at <= datetime.now(UTC))
+            .order_by(self.model.next_attempt_at, self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete(self, ids: Sequence[UUID]) -> None:
+        """Удаляет опубликованные сообщения. Изменение фиксируется вместе с транзакцией блокировки."""
+        if not ids:
+            return
+        await self.session.execute(
+            delete(self.model).where(self.model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+
+    async def move_to_dead_letter(self, messages: Sequence[OutboxMessage], errors: Sequence[str | None]) -> None:
+        """
+        Переносит сообщения, исчерпавшие попытки публикации, в таблицу недоставленных.
+
+        Изменение фиксируется вместе с транзакцией блокировки.
+        """
+        if not messages:
+            return
+        now = datetime.now(UTC)
+        await self.session.execute(
+            insert(OutboxDeadLetter),
+            [
+                {
+                    "id": message.id,
+                    "queue_name": message.queue_name,
+                    "body": message.body,
+                    "priority": message.priority,
+                    "message_id": message.message_id,
+                    "headers": message.headers,
+                    "attempts": message.attempts,
+                    "error": error,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for message, error in zip(messages, errors, strict=True)
+            ],
+        )
+        await self.delete([message.id for message in messages])
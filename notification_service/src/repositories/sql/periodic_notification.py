@@ -1,9 +1,11 @@
 # stdlib
-from datetime import datetime
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
 # thirdparty
-from sqlalchemy import and_, select, update
+from sqlalchemy import ColumnElement, and_, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # project
@@ -27,6 +29,13 @@ class PeriodicNotificationRepository(
     def __init__(self, session: AsyncSession):
         super().__init__(PeriodicNotification, session)
 
+    def is_running(self, current_time: datetime) -> ColumnElement[bool]:
+        """Условие для уведомлений, которые активны и еще не достигли stop_date."""
+        return and_(
+            self.model.is_active.is_(True),
+            or_(self.model.stop_date.is_(None), self.model.stop_date > current_time),
+        )
+
     async def update_active_status(self, current_time: datetime) -> None:
         """Обновляет статус is_active на основе stop_date."""
         await self.session.execute(
@@ -37,19 +46,23 @@ class PeriodicNotificationRepository(
                     self.model.stop_date <= current_time,
                 )
             )
-            .values(is_active=False)
+            .values(is_active=False, updated_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
         )
         await self.session.commit()
 
     async def get_pending(self, current_time: datetime, limit: int | None = None) -> list[PeriodicNotification]:
-        """Получает список уведомлений, готовых к отправке."""
-        await self.update_active_status(current_time)
+        """
+        Получает список уведомлений, готовых к отправке.
 
+        Только читает данные: уведомления после stop_date отсекаются условием запроса, а их статус
+        обновляется отдельной задачей через `update_active_status`.
+        """
         query = (
             select(self.model)
             .where(
                 and_(
-                    self.model.is_active.is_(True),
+                    self.is_running(current_time),
                     self.model.next_run_time <= current_time,
                 )
             )
@@ -73,6 +86,14 @@ class PeriodicNotificationRepository(
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_due_times(self, ids: Sequence[UUID] | None = None) -> list[tuple[UUID, datetime]]:
+        """Получает время следующего запуска активных уведомлений, не загружая остальные поля."""
+        query = select(self.model.id, self.model.next_run_time).where(self.is_running(datetime.now(UTC)))
+        if ids is not None:
+            query = query.where(self.model.id.in_(ids))
+        result = await self.session.execute(query)
+        return [(row.id, row.next_run_time) for row in result]
+
     async def get_active(self) -> list[PeriodicNotification]:
         """Получает список активных периодических уведомлений."""
         query = select(self.model).where(self.model.is_active.is_(True))
@@ -84,3 +105,14 @@ class PeriodicNotificationRepository(
         query = select(self.model).where(self.model.id == notification_id, self.model.is_active.is_(True))
         result = await self.session.execute(query)
         return result.scalar() is not None
+
+    async def update_run_times(self, run_times: Sequence[dict[str, Any]]) -> None:
+        """
+        Обновляет время выполнения нескольких уведомлений одним пакетным UPDATE по первичному ключу.
+
+        Каждый элемент `run_times` должен содержать `id` уведомления и новые значения полей.
+        """
+        if not run_times:
+            return
+        await self.session.execute(update(self.model), list(run_times))
+        await self.session.commit()
@@ -1,9 +1,10 @@
 # stdlib
-from datetime import datetime
+from collections.abc import Sequence
+from datetime import UTC, datetime
 from uuid import UUID
 
 # thirdparty
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # project
@@ -56,3 +57,23 @@ class ScheduledNotificationRepository(
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    async def get_due_times(self, ids: Sequence[UUID] | None = None) -> list[tuple[UUID, datetime]]:
+        """Получает время отправки неотправленных уведомлений, не загружая остальные поля."""
+        query = select(self.model.id, self.model.scheduled_time).where(self.model.is_sent.is_(False))
+        if ids is not None:
+            query = query.where(self.model.id.in_(ids))
+        result = await self.session.execute(query)
+        return [(row.id, row.scheduled_time) for row in result]
+
+    async def mark_sent(self, ids: Sequence[UUID]) -> None:
+        """Отмечает уведомления отправленными одним запросом."""
+        if not ids:
+            return
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(is_sent=True, updated_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
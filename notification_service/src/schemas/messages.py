@@ -9,14 +9,23 @@ from enums.db import ChannelType, EventType
 from enums.rabbitmq import MessageType
 
 
-class Message(BaseModel):
+class MessageHeader(BaseModel):
     event_type: EventType
     channel_type: ChannelType = ChannelType.EMAIL
     template_id: UUID
     context: dict
+
+
+class Message(MessageHeader):
     subscribers: list[UUID]
 
 
+class SocketFrame(BaseModel):
+    # Идентификатор возвращается клиенту без изменений, поэтому числовой id не приводится к строке
+    id: str | int
+    message: Message
+
+
 class MessageResponse(BaseModel):
     status: str
     message: str
@@ -33,3 +42,19 @@ class RabbitMQMessage(BaseModel):
     channel_type: ChannelType
     notification_id: str | None
     message_type: MessageType
+    idempotency_id: str | None = None
+
+    @property
+    def dedup_key(self) -> str | None:
+        """Ключ отметок об отправке подписчикам: уведомление или ключ идемпотентности немедленного сообщения."""
+        return self.notification_id or self.idempotency_id
+
+
+class IngestProgress(BaseModel):
+    status: str
+    subscribers: int = 0
+    invalid: int = 0
+    published_messages: int = 0
+    failed_messages: int = 0
+    failed_subscribers: int = 0
+    message: str | None = None
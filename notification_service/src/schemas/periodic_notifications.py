@@ -4,11 +4,12 @@ from typing import Self
 from uuid import UUID
 
 # thirdparty
-from croniter import CroniterBadCronError, croniter
-from pydantic import BaseModel, field_validator, model_validator
+from croniter import CroniterBadCronError
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 # project
-from enums import ChannelType, EventType, SubscriberQueryEnum
+from enums import ChannelType, EventType, MisfirePolicy, SubscriberQueryEnum
+from services.cron import compile_cron
 
 
 class PeriodicNotificationInput(BaseModel):
@@ -23,12 +24,14 @@ class PeriodicNotificationInput(BaseModel):
     is_active: bool = True
     context: dict | None = None
     stop_date: datetime | None = None
+    misfire_policy: MisfirePolicy = MisfirePolicy.COALESCE
+    misfire_max_replays: int = Field(default=10, ge=1)
 
     @field_validator("cron_schedule")
     @classmethod
     def cron_schedule_validate(cls, v: str) -> str:
         try:
-            croniter(v)
+            compile_cron(v)
         except CroniterBadCronError:
             raise ValueError("Invalid cron schedule string")
         return v
@@ -36,7 +39,7 @@ class PeriodicNotificationInput(BaseModel):
     @model_validator(mode="after")
     def check_dates(self) -> Self:
         if self.next_run_time is None:
-            self.next_run_time = croniter(self.cron_schedule).get_next(datetime).astimezone(UTC)
+            self.next_run_time = compile_cron(self.cron_schedule).next_after(datetime.now(UTC))
         elif self.stop_date and self.next_run_time > self.stop_date:
             raise ValueError("Invalid next run time")
         if self.stop_date and self.stop_date < datetime.now(UTC):
@@ -66,8 +69,14 @@ class PeriodicNotificationResponse(BaseModel):
     is_active: bool
     context: dict | None = None
     stop_date: datetime | None = None
+    misfire_policy: MisfirePolicy
+    misfire_max_replays: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class PeriodicNotificationListItem(PeriodicNotificationResponse):
+    subscriber_query_params: dict | None = None
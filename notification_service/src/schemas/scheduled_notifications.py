@@ -44,3 +44,7 @@ class ScheduledNotificationResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ScheduledNotificationListItem(ScheduledNotificationResponse):
+    subscriber_query_params: dict | None = None
@@ -36,3 +36,7 @@ class TemplateResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TemplateListItem(TemplateResponse):
+    body: str | None = None  # type: ignore[assignment]
@@ -0,0 +1,122 @@
+# stdlib
+import asyncio
+import hashlib
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any
+
+# thirdparty
+import orjson
+from redis.asyncio import Redis
+
+# project
+from core.config import settings
+from services.subscriber_batch import SubscriberBatch
+
+STATE_BUILDING = b"building"
+STATE_COMPLETE = b"complete"
+READ_CHUNK_SIZE = 100
+
+
+@dataclass(frozen=True)
+class AudienceWindow:
+    """Период, в течение которого выборка подписчиков не меняется."""
+
+    key: str
+    ttl: int
+
+
+def daily_window() -> AudienceWindow:
+    """Окно действия выборки до конца текущих календарных суток."""
+    now = datetime.now()
+    end_of_day = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return AudienceWindow(key=now.date().isoformat(), ttl=max(int((end_of_day - now).total_seconds()), 1))
+
+
+def audience_key(query_type: str, params: dict[str, Any] | None, batch_size: int, window: AudienceWindow) -> str:
+    """Строит ключ выборки из типа запроса, нормализованных параметров и окна действия."""
+    params_hash = hashlib.sha1(orjson.dumps(params or {}, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f"audience:{query_type}:{params_hash}:{batch_size}:{window.key}"
+
+
+class AudienceSnapshot:
+    """
+    Снимок выборки подписчиков в Redis.
+
+    Первый резолвер захватывает блокировку и наполняет снимок по мере чтения из источника, остальные
+    читают из снимка вслед за ним. Если наполнявший резолвер упал, наполнение продолжает один из читающих.
+    """
+
+    def __init__(self, redis: Redis, key: str, ttl: int) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self.batches_key = f"{key}:batches"
+        self.state_key = f"{key}:state"
+
+    async def stream(
+        self, fetch: Callable[[], AsyncGenerator[SubscriberBatch, None]]
+    ) -> AsyncGenerator[SubscriberBatch, None]:
+        if await self.acquire():
+            async for batch in self.materialize(fetch()):
+                yield batch
+            return
+
+        index = 0
+        while True:
+            raw_batches = await self.redis.lrange(self.batches_key, index, index + READ_CHUNK_SIZE - 1)  # type: ignore[misc]
+            for raw_batch in raw_batches:
+                yield self.load_batch(raw_batch)
+            index += len(raw_batches)
+            if raw_batches:
+                continue
+
+            state = await self.redis.get(self.state_key)
+            if state == STATE_COMPLETE:
+                # Снимок мог дополниться между чтением списка и проверкой состояния
+                for raw_batch in await self.redis.lrange(self.batches_key, index, -1):  # type: ignore[misc]
+                    yield self.load_batch(raw_batch)
+                return
+            if state is None and await self.acquire():
+                async for batch in self.materialize(fetch(), skip=index):
+                    yield batch
+                return
+            await asyncio.sleep(settings.audience_cache_poll_interval)
+
+    @staticmethod
+    def load_batch(raw_batch: bytes) -> SubscriberBatch:
+        batch = orjson.loads(raw_batch)
+        return SubscriberBatch(subscribers=batch["s"], cursor=batch["c"])
+
+    async def acquire(self) -> bool:
+        return bool(await self.redis.set(self.state_key, STATE_BUILDING, nx=True, ex=settings.audience_cache_lock_ttl))
+
+    async def materialize(
+        self,
+        batches: AsyncGenerator[SubscriberBatch, None],
+        skip: int = 0,
+    ) -> AsyncGenerator[SubscriberBatch, None]:
+        """Наполняет снимок из источника, отдавая наружу пачки начиная с позиции `skip`."""
+        completed = False
+        try:
+            await self.redis.delete(self.batches_key)
+            position = 0
+            async for batch in batches:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.rpush(self.batches_key, orjson.dumps({"s": batch.subscribers, "c": batch.cursor}))
+                    pipe.expire(self.batches_key, settings.audience_cache_lock_ttl)
+                    pipe.expire(self.state_key, settings.audience_cache_lock_ttl)
+                    await pipe.execute()
+                if position >= skip:
+                    yield batch
+                position += 1
+
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.expire(self.batches_key, self.ttl)
+                pipe.set(self.state_key, STATE_COMPLETE, ex=self.ttl)
+                await pipe.execute()
+            completed = True
+        finally:
+            await batches.aclose()
+            if not completed:
+                await self.redis.delete(self.state_key, self.batches_key)
@@ -1,5 +1,10 @@
 # stdlib
+import base64
+import binascii
 import random
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import date
 from uuid import uuid4
 
@@ -7,8 +12,41 @@ from uuid import uuid4
 from core.config import settings
 from schemas.auth_service import UserData
 
+BirthdayKey = tuple[int | None, int | None]
+
+
+@dataclass
+class UsersPage:
+    users: list[dict]
+    next_cursor: str | None = None
+
+
+def encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
 
 class AuthServiceBase:
+    async def get_users_page(
+        self,
+        birth_month: int | None = None,
+        birth_day: int | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> UsersPage:
+        """
+        Возвращает пользователей, упорядоченных по id, начиная после позиции `cursor`.
+
+        Курсор непрозрачен для вызывающего кода: его нужно брать из `next_cursor` предыдущей страницы.
+        """
+        raise NotImplementedError
+
     async def get_users(
         self,
         birth_month: int | None = None,
@@ -29,6 +67,7 @@ class AuthMockService(AuthServiceBase):
     def __init__(self) -> None:
         self.users: list[dict] = []
         self._populate_mock_data()
+        self._buckets = self._build_buckets()
 
     def _populate_mock_data(self) -> None:
         """Генерация тестовых пользователей"""
@@ -44,6 +83,45 @@ class AuthMockService(AuthServiceBase):
                 }
             )
 
+    def _build_buckets(self) -> dict[BirthdayKey, tuple[list[str], list[dict]]]:
+        """Индексы пользователей по (месяц, день), месяцу и дню рождения, отсортированные по id"""
+        grouped: dict[BirthdayKey, list[dict]] = defaultdict(list)
+        for user in self.users:
+            month, day = user["birth_date"].month, user["birth_date"].day
+            for key in ((month, day), (month, None), (None, day), (None, None)):
+                grouped[key].append(user)
+
+        buckets = {}
+        for key, users in grouped.items():
+            users.sort(key=lambda u: str(u["id"]))
+            buckets[key] = ([str(u["id"]) for u in users], users)
+        return buckets
+
+    def _get_bucket(self, birth_month: int | None, birth_day: int | None) -> tuple[list[str], list[dict]]:
+        if birth_month and not 1 <= birth_month <= 12:  # noqa: PLR2004
+            raise ValueError("Invalid birth month")
+
+        if birth_day and not 1 <= birth_day <= 31:  # noqa: PLR2004
+            raise ValueError("Invalid birth day")
+
+        return self._buckets.get((birth_month or None, birth_day or None), ([], []))
+
+    async def get_users_page(
+        self,
+        birth_month: int | None = None,
+        birth_day: int | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> UsersPage:
+        """Имитация поиска пользователей с пагинацией по курсору"""
+        if limit < 1:
+            raise ValueError("Invalid limit")
+        ids, users = self._get_bucket(birth_month, birth_day)
+        start = bisect_right(ids, decode_cursor(cursor)) if cursor else 0
+        end = start + limit
+        next_cursor = encode_cursor(ids[end - 1]) if end < len(ids) else None
+        return UsersPage(users=users[start:end], next_cursor=next_cursor)
+
     async def get_users(
         self,
         birth_month: int | None = None,
@@ -52,22 +130,10 @@ class AuthMockService(AuthServiceBase):
         page_size: int = 100,
     ) -> list[dict]:
         """Имитация поиска пользователей с пагинацией"""
-        if birth_month and not 1 <= birth_month <= 12:  # noqa: PLR2004
-            raise ValueError("Invalid birth month")
-
-        if birth_day and not 1 <= birth_day <= 31:  # noqa: PLR2004
-            raise ValueError("Invalid birth day")
-
-        filtered = [
-            u
-            for u in self.users
-            if (not birth_month or u["birth_date"].month == birth_month)
-            and (not birth_day or u["birth_date"].day == birth_day)
-        ]
-
+        _, users = self._get_bucket(birth_month, birth_day)
         start = (page - 1) * page_size
         end = start + page_size
-        return filtered[start:end]
+        return users[start:end]
 
     @staticmethod
     async def get_user_data(user_id: str) -> UserData:
@@ -0,0 +1,111 @@
+# stdlib
+import asyncio
+import logging
+
+# project
+from core.config import settings
+from enums.rabbitmq import QueueConfig
+from services.brokers import BrokerBase
+
+logger = logging.getLogger(__name__)
+
+# Вес нового замера в скользящем среднем скорости разбора очереди
+DRAIN_RATE_SMOOTHING = 0.3
+
+
+class QueuePacer:
+    """
+    Темп публикации в одну очередь, рассчитанный по ее глубине и скорости разбора.
+
+    Глубина и число потребителей периодически запрашиваются у брокера. Скорость
+    разбора оценивается только пока в очереди есть отставание, иначе она ограничена скоростью публикации,
+    а не возможностями воркеров. Пока у очереди нет потребителей, публикация приостанавливается.
+
+    К глубине из последнего замера добавляются сообщения, зарезервированные еще не завершенными шагами,
+    и сообщения, опубликованные после замера, поэтому новый замер не обнуляет резервы публикаций в процессе.
+    """
+
+    def __init__(self, broker: BrokerBase, queue: QueueConfig) -> None:
+        self.broker = broker
+        self.queue = queue
+        self.depth = 0
+        self.consumers = 0
+        self.drain_rate: float | None = None
+        # Зарезервировано шагами, которые еще публикуют сообщения
+        self.reserved = 0
+        # Опубликовано после последнего замера глубины
+        self.published = 0
+        self.sampled_at: float | None = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, window: int) -> int:
+        """
+        Ожидает, пока очередь сможет принять сообщения, и резервирует место под них.
+
+        Возвращает число сообщений, которые можно опубликовать сейчас, но не больше `window`.
+        После публикации резерв нужно вернуть через `release` вместе с числом опубликованных сообщений.
+        """
+        while True:
+            async with self.lock:
+                await self.refresh()
+                allowed = self.allowance(window)
+                if allowed > 0:
+                    self.reserved += allowed
+                    return allowed
+            logger.debug(
+                f"Queue {self.queue.queue_name} is saturated: depth={self.depth}, "
+                f"consumers={self.consumers}, drain_rate={self.drain_rate}"
+            )
+            await asyncio.sleep(settings.backpressure_sample_interval)
+
+    def release(self, reserved: int, published: int) -> None:
+        self.reserved = max(self.reserved - reserved, 0)
+        self.published += published
+
+    def allowance(self, window: int) -> int:
+        if self.consumers == 0:
+            # Сообщения некому разбирать, они только копятся в очереди и истекают по TTL
+            return 0
+        depth = self.depth + self.reserved + self.published
+        room = settings.backpressure_max_queue_depth - depth
+        if self.drain_rate and self.depth > 0:
+            # Сообщение, опубликованное сейчас, дождется воркера примерно через depth / drain_rate секунд
+            ttl = self.queue.ttl / 1000 * settings.backpressure_ttl_ratio
+            room = min(room, int(self.drain_rate * ttl) - depth)
+            # При отставании публикуем в темпе разбора очереди
+            window = min(window, max(int(self.drain_rate * settings.backpressure_sample_interval), 1))
+        return max(min(window, room), 0)
+
+    async def refresh(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self.sampled_at is not None and now - self.sampled_at < settings.backpressure_sample_interval:
+            return
+
+        stats = await self.broker.get_queue_stats(self.queue.queue_name)
+        if self.sampled_at is not None and self.depth > 0 and stats.message_count > 0:
+            drained = max(self.depth + self.published - stats.message_count, 0)
+            rate = drained / (now - self.sampled_at)
+            if self.drain_rate is None:
+                self.drain_rate = rate
+            else:
+                self.drain_rate = DRAIN_RATE_SMOOTHING * rate + (1 - DRAIN_RATE_SMOOTHING) * self.drain_rate
+        if stats.consumer_count == 0:
+            self.drain_rate = None
+
+        self.depth = stats.message_count
+        self.consumers = stats.consumer_count
+        self.published = 0
+        self.sampled_at = now
+
+
+class QueueBackpressure:
+    """Темп публикации по всем очередям, в которые идет рассылка."""
+
+    def __init__(self, broker: BrokerBase) -> None:
+        self.broker = broker
+        self.pacers: dict[str, QueuePacer] = {}
+
+    def get_pacer(self, queue: QueueConfig) -> QueuePacer:
+        if queue.queue_name not in self.pacers:
+            self.pacers[queue.queue_name] = QueuePacer(self.broker, queue)
+        return self.pacers[queue.queue_name]
@@ -0,0 +1,38 @@
+# project
+from core.config import BrokerBackend, settings
+
+from .amqp import RabbitMQService
+from .base import (
+    BrokerBase,
+    BrokerMessage,
+    BrokerProxy,
+    PublishRequest,
+    QueueStats,
+)
+from .memory import InMemoryBroker
+from .streams import RedisStreamsBroker
+
+BROKER_BACKENDS: dict[BrokerBackend, type[BrokerBase]] = {
+    BrokerBackend.AMQP: RabbitMQService,
+    BrokerBackend.MEMORY: InMemoryBroker,
+    BrokerBackend.REDIS: RedisStreamsBroker,
+}
+
+
+def create_broker(backend: BrokerBackend | None = None) -> BrokerBase:
+    """Создает брокер выбранного в настройках типа."""
+    return BROKER_BACKENDS[backend or settings.broker_backend]()
+
+
+__all__ = [
+    "BROKER_BACKENDS",
+    "BrokerBase",
+    "BrokerMessage",
+    "BrokerProxy",
+    "InMemoryBroker",
+    "PublishRequest",
+    "QueueStats",
+    "RabbitMQService",
+    "RedisStreamsBroker",
+    "create_broker",
+]
@@ -0,0 +1,232 @@
+# stdlib
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+
+# thirdparty
+from aio_pika import DeliveryMode, ExchangeType, Message, connect_robust
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractIncomingMessage,
+    AbstractRobustConnection,
+)
+from aiormq import AMQPConnectionError
+from pamqp.commands import Basic
+
+# project
+from core.config import settings
+from enums.rabbitmq import QueueConfig
+from schemas.messages import MessageResponse
+from services.brokers.base import (
+    BrokerBase,
+    BrokerMessage,
+    PublishRequest,
+    QueueStats,
+)
+from services.priorities import MAX_PRIORITY
+
+EXCHANGE_NAME = "notifications"
+
+
+class PublishingChannel:
+    """Канал публикации с ограничением числа сообщений, ожидающих подтверждения брокера."""
+
+    def __init__(self, channel: AbstractChannel, max_in_flight: int) -> None:
+        self.channel = channel
+        # Сообщения, ожидающие подтверждения или места в канале, по ним выбирается наименее загруженный канал
+        self.in_flight = 0
+        self.limiter = asyncio.Semaphore(max_in_flight)
+        self.reopen_lock = asyncio.Lock()
+
+    async def publish(self, message: Message, routing_key: str) -> None:
+        # Счетчик увеличивается до ожидания семафора, иначе ожидающие публикации не видны при выборе канала
+        self.in_flight += 1
+        try:
+            async with self.limiter:
+                if self.channel.is_closed:
+                    await self.reopen()
+                confirmation = await self.channel.default_exchange.publish(message, routing_key=routing_key)
+        finally:
+            self.in_flight -= 1
+        if isinstance(confirmation, Basic.Nack):
+            raise RuntimeError("Message was rejected by the broker")
+
+    async def reopen(self) -> None:
+        # Канал мог закрыться брокером независимо от соединения, например после ошибки публикации
+        async with self.reopen_lock:
+            if self.channel.is_closed:
+                await self.channel.reopen()
+
+
+class AMQPMessage(BrokerMessage):
+    def __init__(self, message: AbstractIncomingMessage) -> None:
+        super().__init__(
+            body=message.body,
+            message_id=message.message_id,
+            priority=message.priority or 1,
+            headers={
+                key: value.decode() if isinstance(value, bytes) else str(value)
+                for key, value in (message.headers or {}).items()
+                if isinstance(value, str | bytes | int)
+            },
+        )
+        self.message = message
+
+    async def ack(self) -> None:
+        await self.message.ack()
+
+    async def nack(self, requeue: bool = False) -> None:
+        await self.message.nack(requeue=requeue)
+
+
+class RabbitMQService(BrokerBase):
+    """
+    Брокер на RabbitMQ.
+
+    Один экземпляр рассчитан на весь процесс: служебный канал `channel` используется для объявления очередей
+    и потребления, а публикации распределяются по пулу каналов с подтверждениями в пользу наименее загруженного.
+    Соединение и каналы восстанавливаются после разрыва средствами `connect_robust`.
+    """
+
+    def __init__(self, channel_pool_size: int | None = None) -> None:
+        self.connection: AbstractRobustConnection | None = None
+        self.channel: AbstractChannel | None = None
+        self.channel_pool_size = channel_pool_size or settings.rabbitmq_channel_pool_size
+        self.publishing_channels: list[PublishingChannel] = []
+        self.connect_lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        async with self.connect_lock:
+            if self.channel is not None:
+                return
+            self.connection = await self.get_connection()
+            # Подтверждения публикации позволяют узнать, что брокер действительно принял сообщение
+            self.publishing_channels = [
+                PublishingChannel(
+                    await self.connection.channel(publisher_confirms=True),
+                    settings.rabbitmq_channel_max_in_flight,
+                )
+                for _ in range(self.channel_pool_size)
+            ]
+            channel = await self.connection.channel(publisher_confirms=True)
+            await channel.declare_exchange(EXCHANGE_NAME, ExchangeType.DIRECT)
+            self.channel = channel
+
+    async def init_queues(self, queues: Sequence[QueueConfig] | None = None) -> None:
+        await self.connect()
+        assert self.channel is not None, "RabbitMQ channel is not initialized"
+
+        for queue_conf in self.get_queue_configs(queues):
+            queue = await self.channel.declare_queue(
+                queue_conf.queue_name,
+                durable=True,
+                arguments={
+                    "x-message-ttl": queue_conf.ttl,
+                    "x-max-priority": MAX_PRIORITY,
+                },
+            )
+            await queue.bind(EXCHANGE_NAME, routing_key=queue_conf.queue_name)
+
+    async def get_queue_stats(self, queue_name: str) -> QueueStats:
+        """Возвращает глубину очереди и число потребителей с помощью пассивного объявления очереди."""
+        if not self.channel:
+            await self.connect()
+        assert self.channel is not None, "RabbitMQ channel is not initialized"
+
+        queue = await self.channel.declare_queue(queue_name, passive=True)
+        return QueueStats(
+            message_count=queue.declaration_result.message_count or 0,
+            consumer_count=queue.declaration_result.consumer_count or 0,
+        )
+
+    async def consume(self, queue_name: str, prefetch_count: int | None = None) -> AsyncIterator[BrokerMessage]:
+        if not self.connection:
+            await self.connect()
+        assert self.connection is not None, "RabbitMQ connection is not initialized"
+
+        # Отдельный канал, чтобы ограничение prefetch не влияло на служебный канал и другие очереди
+        channel = await self.connection.channel()
+        try:
+            if prefetch_count:
+                await channel.set_qos(prefetch_count=prefetch_count)
+            queue = await channel.get_queue(queue_name)
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    yield AMQPMessage(message)
+        finally:
+            await channel.close()
+
+    @staticmethod
+    async def get_connection() -> AbstractRobustConnection:
+        try:
+            connection = await connect_robust(settings.rabbitmq_url)
+        except AMQPConnectionError as err:
+            raise ValueError("RabbitMQ connection error") from err
+        return connection
+
+    async def close(self) -> None:
+        if self.connection and not self.connection.is_closed:
+            await self.connection.close()
+        self.connection = None
+        self.channel = None
+        self.publishing_channels = []
+
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        """
+        Публикует пачку сообщений конвейером, не дожидаясь подтверждения каждого по отдельности.
+
+        Одновременно в ожидании подтверждения от брокера находится не более `window` сообщений.
+        Результаты возвращаются в том же порядке, что и входные сообщения.
+
+        :param messages: Сообщения для публикации.
+        :param window: Максимальное число неподтвержденных публикаций.
+        """
+        if not messages:
+            return []
+        if not self.channel:
+            await self.connect()
+
+        window = window or settings.rabbitmq_publish_window
+        results: list[MessageResponse | None] = [None] * len(messages)
+        pending: dict[asyncio.Task[MessageResponse], int] = {}
+
+        async def collect(return_when: str) -> None:
+            done, _ = await asyncio.wait(pending, return_when=return_when)
+            for task in done:
+                results[pending.pop(task)] = task.result()
+
+        try:
+            for index, message in enumerate(messages):
+                if len(pending) >= window:
+                    await collect(asyncio.FIRST_COMPLETED)
+                pending[asyncio.create_task(self._publish(message))] = index
+            if pending:
+                await collect(asyncio.ALL_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return [result for result in results if result is not None]
+
+    def get_publishing_channel(self) -> PublishingChannel:
+        return min(self.publishing_channels, key=lambda publishing_channel: publishing_channel.in_flight)
+
+    async def _publish(self, request: PublishRequest) -> MessageResponse:
+        assert self.publishing_channels, "RabbitMQ channel is not initialized"
+
+        message = Message(
+            body=request.body,
+            priority=request.priority,
+            headers=dict(request.get_headers()),
+            delivery_mode=DeliveryMode.PERSISTENT,
+            message_id=request.message_id,
+        )
+
+        try:
+            await self.get_publishing_channel().publish(message, routing_key=request.queue_name)
+        except Exception as e:
+            return request.as_response(e)
+        return request.as_response()
@@ -0,0 +1,191 @@
+# stdlib
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+# project
+from enums.rabbitmq import QueueConfig, RabbitMQQueues
+from schemas.messages import MessageResponse
+
+
+@dataclass
+class PublishRequest:
+    """Сообщение, подготовленное к публикации в очередь."""
+
+    queue_name: str
+    message_body: str | bytes
+    priority: int = 1
+    x_request_id: str | None = None
+    message_id: str | None = None
+    headers: dict[str, str] | None = None
+
+    @property
+    def body(self) -> bytes:
+        return self.message_body.encode() if isinstance(self.message_body, str) else self.message_body
+
+    def get_headers(self) -> dict[str, str]:
+        headers = dict(self.headers or {})
+        if self.x_request_id:
+            headers["X-Request-Id"] = self.x_request_id
+        return headers
+
+    def as_response(self, error: Exception | None = None) -> MessageResponse:
+        return MessageResponse(
+            status="error" if error else "success",
+            message=str(error) if error else "Message successfully added to the queue",
+            queue=self.queue_name,
+            priority=self.priority,
+            x_request_id=self.x_request_id,
+        )
+
+
+@dataclass
+class QueueStats:
+    """Состояние очереди на момент запроса."""
+
+    message_count: int
+    consumer_count: int
+
+
+class BrokerMessage(ABC):
+    """Сообщение, полученное потребителем и ожидающее подтверждения."""
+
+    def __init__(
+        self,
+        body: bytes,
+        message_id: str | None = None,
+        priority: int = 1,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.body = body
+        self.message_id = message_id
+        self.priority = priority
+        self.headers = headers or {}
+
+    @abstractmethod
+    async def ack(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def nack(self, requeue: bool = False) -> None:
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def process(self) -> AsyncGenerator[None, None]:
+        """Подтверждает сообщение после успешной обработки и отклоняет без возврата в очередь при ошибке."""
+        try:
+            yield
+        except BaseException:
+            await self.nack(requeue=False)
+            raise
+        await self.ack()
+
+
+class BrokerBase(ABC):
+    """
+    Брокер сообщений, через который API и планировщик передают уведомления воркерам.
+
+    Очереди описываются `QueueConfig`: сообщения в них выдаются по убыванию приоритета,
+    а не забранные за `ttl` миллисекунд удаляются.
+    """
+
+    @abstractmethod
+    async def connect(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def init_queues(self, queues: Sequence[QueueConfig] | None = None) -> None:
+        """Объявляет очереди, по умолчанию все очереди `RabbitMQQueues`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        """
+        Публикует пачку сообщений и возвращает результаты в том же порядке, что и входные сообщения.
+
+        :param messages: Сообщения для публикации.
+        :param window: Максимальное число неподтвержденных публикаций.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_queue_stats(self, queue_name: str) -> QueueStats:
+        raise NotImplementedError
+
+    @abstractmethod
+    def consume(self, queue_name: str, prefetch_count: int | None = None) -> AsyncIterator[BrokerMessage]:
+        """
+        Выдает сообщения очереди по мере поступления.
+
+        :param prefetch_count: Максимальное число выданных, но еще не подтвержденных сообщений.
+        """
+        raise NotImplementedError
+
+    async def send_message(
+        self,
+        queue_name: str,
+        message_body: str | bytes,
+        priority: int = 1,
+        x_request_id: str | None = None,
+    ) -> MessageResponse:
+        """
+        Отправляет сообщение в указанную очередь с заданным приоритетом и заголовком X-Request-Id.
+
+        :param queue_name: Название очереди.
+        :param message_body: Тело сообщения.
+        :param priority: Приоритет сообщения (по умолчанию 1).
+        :param x_request_id: Значение заголовка X-Request-Id (опционально).
+        """
+        results = await self.send_batch(
+            [
+                PublishRequest(
+                    queue_name=queue_name,
+                    message_body=message_body,
+                    priority=priority,
+                    x_request_id=x_request_id,
+                )
+            ]
+        )
+        return results[0]
+
+    @staticmethod
+    def get_queue_configs(queues: Sequence[QueueConfig] | None = None) -> Sequence[QueueConfig]:
+        return RabbitMQQueues.list_queues() if queues is None else queues
+
+
+class BrokerProxy(BrokerBase):
+    """Брокер, передающий все операции другому брокеру. Основа для брокеров, меняющих отдельные операции."""
+
+    def __init__(self, broker: BrokerBase) -> None:
+        self.broker = broker
+
+    async def connect(self) -> None:
+        await self.broker.connect()
+
+    async def init_queues(self, queues: Sequence[QueueConfig] | None = None) -> None:
+        await self.broker.init_queues(queues)
+
+    async def close(self) -> None:
+        await self.broker.close()
+
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        return await self.broker.send_batch(messages, window)
+
+    async def get_queue_stats(self, queue_name: str) -> QueueStats:
+        return await self.broker.get_queue_stats(queue_name)
+
+    def consume(self, queue_name: str, prefetch_count: int | None = None) -> AsyncIterator[BrokerMessage]:
+        return self.broker.consume(queue_name, prefetch_count)
@@ -0,0 +1,157 @@
+# stdlib
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+
+# project
+from enums.rabbitmq import QueueConfig
+from schemas.messages import MessageResponse
+from services.brokers.base import (
+    BrokerBase,
+    BrokerMessage,
+    PublishRequest,
+    QueueStats,
+)
+from services.priorities import MAX_PRIORITY
+
+
+@dataclass(order=True)
+class QueuedMessage:
+    # Больший приоритет выдается раньше, при равном приоритете соблюдается порядок публикации
+    sort_key: tuple[int, int]
+    expires_at: float = field(compare=False)
+    request: PublishRequest = field(compare=False)
+
+
+class MemoryQueue:
+    """Очередь с приоритетами и TTL сообщений в памяти процесса."""
+
+    def __init__(self, config: QueueConfig) -> None:
+        self.config = config
+        self.messages: list[QueuedMessage] = []
+        self.counter = itertools.count()
+        self.available = asyncio.Condition()
+        self.consumers = 0
+
+    async def put(self, request: PublishRequest) -> None:
+        loop_time = asyncio.get_running_loop().time()
+        priority = max(min(request.priority, MAX_PRIORITY), 0)
+        queued = QueuedMessage((-priority, next(self.counter)), loop_time + self.config.ttl / 1000, request)
+        async with self.available:
+            heapq.heappush(self.messages, queued)
+            self.available.notify()
+
+    async def get(self) -> PublishRequest:
+        async with self.available:
+            while True:
+                self.drop_expired()
+                if self.messages:
+                    return heapq.heappop(self.messages).request
+                await self.available.wait()
+
+    def drop_expired(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if any(queued.expires_at <= now for queued in self.messages):
+            self.messages = [queued for queued in self.messages if queued.expires_at > now]
+            heapq.heapify(self.messages)
+
+    def __len__(self) -> int:
+        self.drop_expired()
+        return len(self.messages)
+
+
+class MemoryMessage(BrokerMessage):
+    def __init__(self, queue: MemoryQueue, request: PublishRequest, credits: asyncio.Semaphore | None) -> None:
+        super().__init__(
+            body=request.body,
+            message_id=request.message_id,
+            priority=request.priority,
+            headers=request.get_headers(),
+        )
+        self.queue = queue
+        self.request = request
+        self.credits = credits
+        self.settled = False
+
+    async def ack(self) -> None:
+        self.settle()
+
+    async def nack(self, requeue: bool = False) -> None:
+        if not self.settled and requeue:
+            await self.queue.put(self.request)
+        self.settle()
+
+    def settle(self) -> None:
+        if self.settled:
+            return
+        self.settled = True
+        if self.credits is not None:
+            self.credits.release()
+
+
+class InMemoryBroker(BrokerBase):
+    """
+    Брокер в памяти процесса на очередях asyncio с приоритетами.
+
+    Повторяет семантику очередей RabbitMQ, на которую полагается сервис: приоритет сообщений, TTL и
+    ограничение числа неподтвержденных сообщений у потребителя. Сообщения не переживают процесс, поэтому
+    брокер предназначен для тестов и нагрузочных замеров всего конвейера на одной машине.
+    """
+
+    def __init__(self) -> None:
+        self.queues: dict[str, MemoryQueue] = {}
+
+    async def connect(self) -> None:
+        pass
+
+    async def init_queues(self, queues: Sequence[QueueConfig] | None = None) -> None:
+        for config in self.get_queue_configs(queues):
+            if config.queue_name not in self.queues:
+                self.queues[config.queue_name] = MemoryQueue(config)
+
+    async def close(self) -> None:
+        self.queues.clear()
+
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        results = []
+        for message in messages:
+            queue = self.queues.get(message.queue_name)
+            if queue is None:
+                results.append(message.as_response(ValueError(f"Queue {message.queue_name} does not exist")))
+                continue
+            await queue.put(message)
+            results.append(message.as_response())
+        return results
+
+    async def get_queue_stats(self, queue_name: str) -> QueueStats:
+        queue = self.get_queue(queue_name)
+        return QueueStats(message_count=len(queue), consumer_count=queue.consumers)
+
+    async def consume(self, queue_name: str, prefetch_count: int | None = None) -> AsyncIterator[BrokerMessage]:
+        queue = self.get_queue(queue_name)
+        credits = asyncio.Semaphore(prefetch_count) if prefetch_count else None
+        queue.consumers += 1
+        try:
+            while True:
+                if credits is not None:
+                    await credits.acquire()
+                try:
+                    request = await queue.get()
+                except BaseException:
+                    if credits is not None:
+                        credits.release()
+                    raise
+                yield MemoryMessage(queue, request, credits)
+        finally:
+            queue.consumers -= 1
+
+    def get_queue(self, queue_name: str) -> MemoryQueue:
+        if queue_name not in self.queues:
+            raise ValueError(f"Queue {queue_name} does not exist")
+        return self.queues[queue_name]
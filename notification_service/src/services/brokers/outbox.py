@@ -0,0 +1,42 @@
+# stdlib
+import logging
+from collections.abc import Sequence
+
+# thirdparty
+from sqlalchemy.exc import SQLAlchemyError
+
+# project
+from db.db import async_session
+from repositories.sql.outbox import OutboxRepository
+from schemas.messages import MessageResponse
+from services.brokers.base import BrokerProxy, PublishRequest
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxBroker(BrokerProxy):
+    """
+    Брокер API в режиме outbox.
+
+    Публикуемые сообщения сохраняются в таблицу outbox одним пакетным INSERT и сразу считаются принятыми,
+    поэтому время ответа API не зависит от брокера. В брокер их пачками переносит ретранслятор
+    `workers/outbox_relay.py`. Остальные операции выполняет брокер, переданный в конструктор.
+    """
+
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        if not messages:
+            return []
+        try:
+            async with async_session() as session:
+                await OutboxRepository(session).add(messages)
+        except SQLAlchemyError as e:
+            logger.exception(f"Failed to save {len(messages)} messages to the outbox")
+            return [message.as_response(e) for message in messages]
+        return [
+            message.as_response().model_copy(update={"message": "Message accepted for publishing"})
+            for message in messages
+        ]
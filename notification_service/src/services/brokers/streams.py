@@ -0,0 +1,313 @@
+# stdlib
+import asyncio
+import logging
+import os
+import socket
+from collections.abc import AsyncIterator, Sequence
+from uuid import uuid4
+
+# thirdparty
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+# project
+from core.config import settings
+from enums.rabbitmq import QueueConfig
+from schemas.messages import MessageResponse
+from services.brokers.base import (
+    BrokerBase,
+    BrokerMessage,
+    PublishRequest,
+    QueueStats,
+)
+from services.priorities import MAX_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+GROUP_NAME = "notifications"
+
+# Удаляет из потоков сообщения старше ARGV[4] мс и забирает для потребителя ARGV[2] группы ARGV[1]
+# не больше ARGV[3] новых сообщений, начиная с потока наибольшего приоритета
+READ_SCRIPT = """
+local now = redis.call('TIME')
+local cutoff = string.format('%d', tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000) - tonumber(ARGV[4]))
+local remaining = tonumber(ARGV[3])
+local result = {}
+for _, key in ipairs(KEYS) do
+    if remaining <= 0 then
+        break
+    end
+    redis.call('XTRIM', key, 'MINID', cutoff)
+    local reply = redis.call('XREADGROUP', 'GROUP', ARGV[1], ARGV[2], 'COUNT', remaining, 'STREAMS', key, '>')
+    if reply then
+        remaining = remaining - #reply[1][2]
+        table.insert(result, reply[1])
+    end
+end
+return result
+"""
+
+# Удаляет из потоков сообщения старше ARGV[2] мс и возвращает число сообщений и число выданных,
+# но не подтвержденных группой ARGV[1]
+STATS_SCRIPT = """
+local now = redis.call('TIME')
+local cutoff = string.format('%d', tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000) - tonumber(ARGV[2]))
+local length = 0
+local pending = 0
+for _, key in ipairs(KEYS) do
+    redis.call('XTRIM', key, 'MINID', cutoff)
+    length = length + redis.call('XLEN', key)
+    pending = pending + redis.call('XPENDING', key, ARGV[1])[1]
+end
+return {length, pending}
+"""
+
+StreamEntry = tuple[str, bytes, dict[bytes, bytes]]
+
+
+class StreamMessage(BrokerMessage):
+    def __init__(
+        self,
+        broker: "RedisStreamsBroker",
+        stream: str,
+        entry_id: bytes,
+        fields: dict[bytes, bytes],
+        credits: asyncio.Semaphore,
+    ) -> None:
+        super().__init__(
+            body=fields[b"body"],
+            message_id=fields.get(b"message_id", b"").decode() or None,
+            priority=int(fields.get(b"priority", b"1")),
+            headers=orjson.loads(fields.get(b"headers", b"{}")),
+        )
+        self.broker = broker
+        self.stream = stream
+        self.entry_id = entry_id
+        self.fields = fields
+        self.credits = credits
+        self.settled = False
+
+    async def ack(self) -> None:
+        if self.settled:
+            return
+        async with self.broker.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, GROUP_NAME, self.entry_id)
+            pipe.xdel(self.stream, self.entry_id)
+            await pipe.execute()
+        self.settle()
+
+    async def nack(self, requeue: bool = False) -> None:
+        if self.settled:
+            return
+        async with self.broker.redis.pipeline(transaction=True) as pipe:
+            if requeue:
+                # Копия встает в конец потока своего приоритета и будет выдана группе заново
+                pipe.xadd(self.stream, self.fields, maxlen=settings.redis_stream_max_length, approximate=True)
+            pipe.xack(self.stream, GROUP_NAME, self.entry_id)
+            pipe.xdel(self.stream, self.entry_id)
+            await pipe.execute()
+        self.settle()
+
+    def settle(self) -> None:
+        self.settled = True
+        self.credits.release()
+
+
+class RedisStreamsBroker(BrokerBase):
+    """
+    Брокер на Redis Streams для развертываний без RabbitMQ.
+
+    Каждая очередь хранится в отдельном потоке на каждый уровень приоритета, а воркеры читают их через
+    общую группу потребителей, начиная с потока наибольшего приоритета. Подтвержденные сообщения удаляются
+    из потока, поэтому длина потоков соответствует глубине очереди. TTL очереди соблюдается обрезкой потоков
+    по MINID при каждом чтении, длина потока дополнительно ограничена `redis_stream_max_length`.
+    Сообщения, зависшие у упавшего потребителя дольше `redis_stream_claim_idle` мс,
+    забираются другими потребителями через XAUTOCLAIM.
+    """
+
+    def __init__(self) -> None:
+        self.redis = Redis.from_url(settings.redis_url)
+        self.read_script = self.redis.register_script(READ_SCRIPT)
+        self.stats_script = self.redis.register_script(STATS_SCRIPT)
+        self.queues: dict[str, QueueConfig] = {config.queue_name: config for config in self.get_queue_configs()}
+
+    @staticmethod
+    def stream_keys(queue_name: str) -> list[str]:
+        # Общий hash tag держит потоки очереди в одном слоте, чтобы скрипты работали и в Redis Cluster
+        return [f"stream:{{{queue_name}}}:{priority}" for priority in range(MAX_PRIORITY, -1, -1)]
+
+    @classmethod
+    def stream_key(cls, queue_name: str, priority: int) -> str:
+        return cls.stream_keys(queue_name)[MAX_PRIORITY - max(min(priority, MAX_PRIORITY), 0)]
+
+    async def connect(self) -> None:
+        await self.redis.ping()
+
+    async def init_queues(self, queues: Sequence[QueueConfig] | None = None) -> None:
+        for config in self.get_queue_configs(queues):
+            for key in self.stream_keys(config.queue_name):
+                try:
+                    # Группа с позиции 0 получит и сообщения, опубликованные до ее создания
+                    await self.redis.xgroup_create(key, GROUP_NAME, id="0", mkstream=True)
+                except ResponseError as e:
+                    if "BUSYGROUP" not in str(e):
+                        raise
+            self.queues[config.queue_name] = config
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        """
+        Публикует пачку сообщений конвейером Redis.
+
+        Сообщения отправляются частями по `window` команд за один обмен с сервером.
+        Результаты возвращаются в том же порядке, что и входные сообщения.
+        """
+        window = window or settings.rabbitmq_publish_window
+        results: list[MessageResponse] = []
+        for start in range(0, len(messages), window):
+            chunk = messages[start : start + window]
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for message in chunk:
+                    if message.queue_name in self.queues:
+                        pipe.xadd(
+                            self.stream_key(message.queue_name, message.priority),
+                            {
+                                "body": message.body,
+                                "message_id": message.message_id or "",
+                                "priority": message.priority,
+                                "headers": orjson.dumps(message.get_headers()),
+                            },
+                            maxlen=settings.redis_stream_max_length,
+                            approximate=True,
+                        )
+                try:
+                    replies = iter(await pipe.execute(raise_on_error=False))
+                except RedisError as e:
+                    results.extend(message.as_response(e) for message in chunk)
+                    continue
+            for message in chunk:
+                if message.queue_name not in self.queues:
+                    results.append(message.as_response(ValueError(f"Queue {message.queue_name} does not exist")))
+                    continue
+                reply = next(replies)
+                results.append(message.as_response(reply if isinstance(reply, Exception) else None))
+        return results
+
+    async def get_queue_stats(self, queue_name: str) -> QueueStats:
+        config = self.get_queue(queue_name)
+        keys = self.stream_keys(queue_name)
+        length, pending = await self.stats_script(keys=keys, args=[GROUP_NAME, config.ttl])
+
+        # Потребитель считается живым, пока обращается к группе чаще, чем истекает срок возврата его сообщений
+        consumers: set[bytes] = set()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.xinfo_consumers(key, GROUP_NAME)
+            for stream_consumers in await pipe.execute():
+                consumers.update(
+                    consumer["name"]
+                    for consumer in stream_consumers
+                    if consumer["idle"] < settings.redis_stream_claim_idle
+                )
+        # Сообщения с истекшим TTL удаляются, даже если выданы, поэтому разность может уйти в минус
+        return QueueStats(message_count=max(length - pending, 0), consumer_count=len(consumers))
+
+    async def consume(self, queue_name: str, prefetch_count: int | None = None) -> AsyncIterator[BrokerMessage]:
+        """
+        Выдает сообщения очереди, забирая их из потоков пачками не больше свободного лимита `prefetch_count`.
+
+        Если новых сообщений нет, ожидает их блокирующим XREAD, который ничего не забирает у группы.
+        Забранные, но не выданные к закрытию генератора сообщения вернутся в работу через XAUTOCLAIM.
+        """
+        config = self.get_queue(queue_name)
+        keys = self.stream_keys(queue_name)
+        consumer = f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+        limit = prefetch_count or settings.redis_stream_read_count
+        credits = asyncio.Semaphore(limit)
+        loop = asyncio.get_running_loop()
+        next_claim = loop.time()
+        try:
+            while True:
+                count = await self.acquire_credits(credits, limit)
+                try:
+                    entries = []
+                    if loop.time() >= next_claim:
+                        entries = await self.claim_stale(keys, consumer, count)
+                        next_claim = loop.time() + settings.redis_stream_claim_idle / 2000
+                    if not entries:
+                        entries = await self.read(keys, consumer, count, config.ttl)
+                    if not entries:
+                        await self.redis.xread(
+                            dict.fromkeys(keys, "$"),
+                            count=1,
+                            block=settings.redis_stream_block_timeout,
+                        )
+                finally:
+                    for _ in range(count - len(entries)):
+                        credits.release()
+                for key, entry_id, fields in entries:
+                    yield StreamMessage(self, key, entry_id, fields, credits)
+        finally:
+            await self.remove_consumer(keys, consumer)
+
+    async def read(self, keys: list[str], consumer: str, count: int, ttl: int) -> list[StreamEntry]:
+        streams = await self.read_script(keys=keys, args=[GROUP_NAME, consumer, count, ttl])
+        return [
+            (key.decode(), entry_id, self.parse_fields(fields))
+            for key, stream_entries in streams
+            for entry_id, fields in stream_entries
+        ]
+
+    async def claim_stale(self, keys: list[str], consumer: str, count: int) -> list[StreamEntry]:
+        """Забирает сообщения, которые дольше `redis_stream_claim_idle` мс не подтверждены другими потребителями."""
+        entries: list[StreamEntry] = []
+        for key in keys:
+            if len(entries) >= count:
+                break
+            _, claimed, *_ = await self.redis.xautoclaim(
+                key,
+                GROUP_NAME,
+                consumer,
+                min_idle_time=settings.redis_stream_claim_idle,
+                count=count - len(entries),
+            )
+            # Сообщения, удаленные из потока по TTL, XAUTOCLAIM не возвращает
+            entries.extend((key, entry_id, fields) for entry_id, fields in claimed if fields)
+        if entries:
+            logger.warning(f"Claimed {len(entries)} stale messages for consumer {consumer}")
+        return entries
+
+    async def remove_consumer(self, keys: list[str], consumer: str) -> None:
+        # Потребителя с невыданными сообщениями оставляем, чтобы их можно было забрать через XAUTOCLAIM
+        try:
+            for key in keys:
+                if not await self.redis.xpending_range(key, GROUP_NAME, "-", "+", 1, consumername=consumer):
+                    await self.redis.xgroup_delconsumer(key, GROUP_NAME, consumer)
+        except RedisError as e:
+            logger.warning(f"Failed to remove stream consumer {consumer}: {e}")
+
+    @staticmethod
+    async def acquire_credits(credits: asyncio.Semaphore, limit: int) -> int:
+        """Ожидает хотя бы одно свободное место под сообщение и занимает все свободные без ожидания."""
+        await credits.acquire()
+        count = 1
+        while count < limit and not credits.locked():
+            await credits.acquire()
+            count += 1
+        return count
+
+    @staticmethod
+    def parse_fields(fields: list[bytes]) -> dict[bytes, bytes]:
+        return dict(zip(fields[::2], fields[1::2], strict=True))
+
+    def get_queue(self, queue_name: str) -> QueueConfig:
+        if queue_name not in self.queues:
+            raise ValueError(f"Queue {queue_name} does not exist")
+        return self.queues[queue_name]
@@ -0,0 +1,38 @@
+# stdlib
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+# thirdparty
+from croniter import croniter
+
+CRON_CACHE_SIZE = 1024
+
+
+class CompiledCron:
+    """Разобранное CRON-выражение для многократного вычисления времени запусков без повторного парсинга."""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self._iterator = croniter(expression)
+        self._lock = threading.Lock()
+
+    def next_after(self, base_time: datetime) -> datetime:
+        """Возвращает ближайшее время запуска строго после `base_time`."""
+        with self._lock:
+            self._iterator.set_current(base_time, force=True)
+            return self._iterator.get_next(datetime)
+
+    def prev_before(self, base_time: datetime, count: int = 1) -> datetime:
+        """Возвращает время `count`-го по счету запуска, предшествующего `base_time`."""
+        with self._lock:
+            self._iterator.set_current(base_time, force=True)
+            for _ in range(count - 1):
+                self._iterator.get_prev(datetime)
+            return self._iterator.get_prev(datetime)
+
+
+@lru_cache(maxsize=CRON_CACHE_SIZE)
+def compile_cron(expression: str) -> CompiledCron:
+    """Возвращает общий для процесса разобранный экземпляр CRON-выражения."""
+    return CompiledCron(expression)
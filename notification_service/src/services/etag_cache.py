@@ -0,0 +1,70 @@
+# stdlib
+import hashlib
+import logging
+from datetime import datetime
+from uuid import UUID
+
+# thirdparty
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+# project
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(id: UUID, updated_at: datetime) -> str:
+    """Сильный ETag записи: меняется при каждом изменении `updated_at`."""
+    digest = hashlib.sha1(f"{id}:{updated_at.isoformat()}".encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Сравнивает ETag со значением If-None-Match по правилам слабого сравнения."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+class EtagCache:
+    """
+    Кеш ETag записей в Redis, чтобы отвечать 304 без чтения строки из БД.
+
+    API сбрасывает запись кеша при изменении и удалении. Изменения в обход API (воркеры, админка)
+    становятся видны не позже чем через `etag_cache_ttl` секунд. Ошибки Redis не прерывают запрос,
+    а приводят к проверке по БД.
+    """
+
+    def __init__(self, redis: Redis | None, kind: str) -> None:
+        self.redis = redis
+        self.kind = kind
+
+    def get_key(self, id: UUID) -> str:
+        return f"etag:{self.kind}:{id}"
+
+    async def get(self, id: UUID) -> str | None:
+        if self.redis is None:
+            return None
+        try:
+            etag = await self.redis.get(self.get_key(id))
+        except RedisError as e:
+            logger.warning(f"Failed to read etag of {self.kind} {id}: {e}")
+            return None
+        return etag.decode() if etag is not None else None
+
+    async def set(self, id: UUID, etag: str) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self.get_key(id), etag, ex=settings.etag_cache_ttl)
+        except RedisError as e:
+            logger.warning(f"Failed to cache etag of {self.kind} {id}: {e}")
+
+    async def invalidate(self, id: UUID) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(self.get_key(id))
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate etag of {self.kind} {id}: {e}")
@@ -0,0 +1,118 @@
+# stdlib
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+# thirdparty
+import orjson
+from redis.asyncio import Redis
+
+# project
+from core.config import settings
+from exceptions.idempotency import (
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+# Сохраняет ответ ARGV[2] на ARGV[3] секунд, только если ключ KEYS[1] все еще захвачен записью ARGV[1]
+COMPLETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+    return 1
+end
+return 0
+"""
+
+# Удаляет ключ KEYS[1], только если он все еще захвачен записью ARGV[1]
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def get_idempotent_message_id(scope: str, owner: str, key: str) -> str:
+    """
+    Идентификатор публикуемого сообщения, одинаковый для всех повторов запроса с ключом идемпотентности.
+
+    Ключ выбирает клиент, поэтому идентификатор зависит и от владельца ключа: одинаковые ключи разных клиентов
+    не должны приводить к отбрасыванию сообщений друг друга.
+    """
+    return str(uuid5(NAMESPACE_URL, f"{scope}:{owner}:{key}"))
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: bytes
+
+
+class IdempotencyStore:
+    """
+    Результат запроса, сохраненный в Redis по ключу идемпотентности клиента `owner`.
+
+    Первый запрос с ключом захватывает запись на `idempotency_lock_timeout` секунд и после выполнения сохраняет
+    в нее ответ на `idempotency_ttl` секунд. Повторы получают сохраненный ответ. Повтор, пришедший во время
+    выполнения первого запроса, ждет его ответа не дольше `idempotency_wait_timeout` секунд.
+    Ключ, повторно использованный с другим телом запроса, отклоняется.
+
+    Запись захвата содержит токен попытки, а ответ сохраняется и ключ освобождается только попыткой,
+    которая его захватила: запрос, выполнявшийся дольше `idempotency_lock_timeout`, не затрет захват повтора.
+    """
+
+    def __init__(self, redis: Redis, scope: str, owner: str, key: str, request_body: bytes) -> None:
+        self.redis = redis
+        self.scope = scope
+        self.owner = owner
+        self.key = key
+        self.fingerprint = hashlib.sha256(request_body).hexdigest()
+        self.pending = orjson.dumps({"fingerprint": self.fingerprint, "attempt": uuid4().hex})
+        self.complete_script = redis.register_script(COMPLETE_SCRIPT)
+        self.release_script = redis.register_script(RELEASE_SCRIPT)
+
+    @property
+    def redis_key(self) -> str:
+        return f"idempotency:{self.scope}:{self.owner}:{self.key}"
+
+    @property
+    def message_id(self) -> str:
+        return get_idempotent_message_id(self.scope, self.owner, self.key)
+
+    async def begin(self) -> StoredResponse | None:
+        """Захватывает ключ для выполнения запроса или возвращает ответ, сохраненный для него ранее."""
+        deadline = time.monotonic() + settings.idempotency_wait_timeout
+        while True:
+            if await self.redis.set(self.redis_key, self.pending, nx=True, ex=settings.idempotency_lock_timeout):
+                return None
+            raw_record = await self.redis.get(self.redis_key)
+            if raw_record is None:
+                # Запись истекла между командами, пробуем захватить ключ снова
+                continue
+            record = orjson.loads(raw_record)
+            if record["fingerprint"] != self.fingerprint:
+                raise IdempotencyKeyReusedError(f"Idempotency key {self.key} was used with a different request body")
+            if "status_code" in record:
+                return StoredResponse(status_code=record["status_code"], body=record["body"].encode())
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgressError(f"Request with idempotency key {self.key} is still in progress")
+            await asyncio.sleep(settings.idempotency_poll_interval)
+
+    async def complete(self, status_code: int, body: bytes) -> None:
+        record = {"fingerprint": self.fingerprint, "status_code": status_code, "body": body.decode()}
+        stored = await self.complete_script(
+            keys=[self.redis_key], args=[self.pending, orjson.dumps(record), settings.idempotency_ttl]
+        )
+        if not stored:
+            logger.warning(f"Idempotency key {self.key} lock expired before the response was stored")
+
+    async def release(self) -> None:
+        """Освобождает ключ запроса, завершившегося без сохраняемого ответа, чтобы повтор выполнил его заново."""
+        await self.release_script(keys=[self.redis_key], args=[self.pending])
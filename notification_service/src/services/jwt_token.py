@@ -1,8 +1,16 @@
 # stdlib
+import asyncio
+import hashlib
 import logging
+import math
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
 
 # thirdparty
 import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import ValidationError
@@ -15,23 +23,166 @@ from schemas.auth import JwtToken
 logger = logging.getLogger(__name__)
 
 
-class JWTBearer(HTTPBearer):
-    def __init__(self, auto_error: bool = True) -> None:
-        super().__init__(auto_error=auto_error)
+class PublicKeyProvider:
+    """
+    Открытый ключ проверки подписи токенов.
 
-    async def __call__(self, request: Request) -> JwtToken | None:  # type: ignore
-        credentials: HTTPAuthorizationCredentials | None = await super().__call__(request)
-        if credentials is None:
+    Ключ из PEM-файла разбирается один раз и перечитывается только после изменения файла, которое проверяется
+    не чаще раза в `jwt_key_check_interval` секунд. Если задан `jwt_jwks_url`, ключ выбирается по `kid` токена
+    из набора JWKS. Набор кешируется на `jwt_jwks_lifespan` секунд и загружается в отдельном потоке, чтобы
+    не блокировать цикл событий. Из-за неизвестного `kid` набор запрашивается заново не чаще раза
+    в `jwt_jwks_refetch_interval` секунд, поэтому токены с выдуманным `kid` не нагружают сервер ключей.
+    """
+
+    def __init__(self) -> None:
+        self.key: Any = None
+        self.key_stat: tuple[float, int] | None = None
+        self.checked_at: float | None = None
+        self.jwks_client = (
+            jwt.PyJWKClient(settings.jwt_jwks_url, cache_jwk_set=False) if settings.jwt_jwks_url else None
+        )
+        self.jwks_keys: dict[str | None, Any] = {}
+        self.jwks_fetched_at: float | None = None
+        self.jwks_lock = asyncio.Lock()
+        self.version = 0
+
+    async def get_key(self, jwt_token: str) -> Any:
+        if self.jwks_client is not None:
+            return await self.get_jwks_key(jwt_token)
+
+        now = time.monotonic()
+        if self.checked_at is None or now - self.checked_at >= settings.jwt_key_check_interval:
+            self.checked_at = now
+            self.reload_if_changed()
+        return self.key
+
+    async def get_jwks_key(self, jwt_token: str) -> Any:
+        kid = jwt.get_unverified_header(jwt_token).get("kid")
+        key = self.jwks_keys.get(kid)
+        fetched_ago = math.inf if self.jwks_fetched_at is None else time.monotonic() - self.jwks_fetched_at
+        if key is not None and fetched_ago < settings.jwt_jwks_lifespan:
+            return key
+        if key is not None or fetched_ago >= settings.jwt_jwks_refetch_interval:
+            try:
+                await self.refresh_jwks()
+            except jwt.exceptions.PyJWKClientError:
+                if key is None:
+                    raise
+                # Недоступность сервера ключей не должна отклонять токены, подписанные уже известным ключом
+                logger.warning(f"Failed to refresh JWKS from {settings.jwt_jwks_url}, using cached key {kid}")
+                return key
+            key = self.jwks_keys.get(kid)
+        if key is None:
+            raise jwt.exceptions.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    async def refresh_jwks(self) -> None:
+        assert self.jwks_client is not None
+        fetched_at = self.jwks_fetched_at
+        async with self.jwks_lock:
+            # Пока ждали блокировку, набор мог загрузить другой запрос
+            if self.jwks_fetched_at != fetched_at:
+                return
+            try:
+                signing_keys = await asyncio.to_thread(self.jwks_client.get_signing_keys, True)
+            finally:
+                # Неудачная загрузка тоже откладывает следующую попытку
+                self.jwks_fetched_at = time.monotonic()
+        keys = {signing_key.key_id: signing_key.key for signing_key in signing_keys}
+        # Токены, проверенные отозванными ключами, проверяются заново
+        if self.jwks_keys and keys.keys() != self.jwks_keys.keys():
+            logger.info(f"JWKS key set changed: {sorted(map(str, keys))}")
+            self.version += 1
+        self.jwks_keys = keys
+
+    def reload_if_changed(self) -> None:
+        try:
+            stat = Path(settings.jwt_public_key_path).stat()
+        except FileNotFoundError as err:
+            raise ValueError(f"Public key file not found at: {settings.jwt_public_key_path}") from err
+        key_stat = (stat.st_mtime, stat.st_size)
+        if key_stat == self.key_stat:
+            return
+        try:
+            self.key = load_pem_public_key(settings.jwt_public_key.encode())
+        except ValueError as err:
+            raise ValueError(f"Error reading public key: {err!s}") from err
+        if self.key_stat is not None:
+            logger.info(f"Public key reloaded from {settings.jwt_public_key_path}")
+        self.key_stat = key_stat
+        self.version += 1
+
+
+class VerifiedTokenCache:
+    """
+    LRU недавно проверенных токенов по хешу токена.
+
+    Запись живет не дольше `jwt_cache_ttl` секунд и не дольше `exp` токена, поэтому повторная проверка
+    подписи выполняется не чаще раза в `jwt_cache_ttl` секунд на токен.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.tokens: OrderedDict[bytes, tuple[JwtToken, float]] = OrderedDict()
+
+    @staticmethod
+    def get_key(jwt_token: str) -> bytes:
+        return hashlib.sha256(jwt_token.encode()).digest()
+
+    def get(self, jwt_token: str) -> JwtToken | None:
+        key = self.get_key(jwt_token)
+        cached = self.tokens.get(key)
+        if cached is None:
+            return None
+        token, expires_at = cached
+        if expires_at <= time.time():
+            del self.tokens[key]
             return None
+        self.tokens.move_to_end(key)
+        return token
 
-        return self.verify_jwt(credentials.credentials)
+    def set(self, jwt_token: str, token: JwtToken) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = min(token.exp, time.time() + settings.jwt_cache_ttl)
+        key = self.get_key(jwt_token)
+        self.tokens[key] = (token, expires_at)
+        self.tokens.move_to_end(key)
+        while len(self.tokens) > self.max_size:
+            self.tokens.popitem(last=False)
+
+    def clear(self) -> None:
+        self.tokens.clear()
+
+
+class TokenVerifier:
+    def __init__(self) -> None:
+        self.key_provider = PublicKeyProvider()
+        self.cache = VerifiedTokenCache(settings.jwt_cache_size)
+        self.key_version = 0
+
+    async def verify(self, jwt_token: str) -> JwtToken:
+        try:
+            key = await self.key_provider.get_key(jwt_token)
+        except jwt.exceptions.PyJWTError as err:
+            raise AuthError("JWT token error") from err
+        # Токены, проверенные старым ключом, после смены ключа проверяются заново
+        if self.key_version != self.key_provider.version:
+            self.key_version = self.key_provider.version
+            self.cache.clear()
+
+        if (cached := self.cache.get(jwt_token)) is not None:
+            return cached
+        token = self.decode(jwt_token, key)
+        self.cache.set(jwt_token, token)
+        return token
 
     @staticmethod
-    def verify_jwt(jwt_token: str) -> JwtToken:
+    def decode(jwt_token: str, key: Any) -> JwtToken:
         try:
             token = jwt.decode(
                 jwt_token,
-                settings.jwt_public_key,
+                key,
                 algorithms=[settings.jwt_algorithm],
                 options={"verify_exp": False},
             )
@@ -45,3 +196,22 @@ class JWTBearer(HTTPBearer):
             )
         except (jwt.exceptions.PyJWTError, ValidationError) as err:
             raise AuthError("JWT token error") from err
+
+
+token_verifier = TokenVerifier()
+
+
+class JWTBearer(HTTPBearer):
+    def __init__(self, auto_error: bool = True) -> None:
+        super().__init__(auto_error=auto_error)
+
+    async def __call__(self, request: Request) -> JwtToken | None:  # type: ignore
+        credentials: HTTPAuthorizationCredentials | None = await super().__call__(request)
+        if credentials is None:
+            return None
+
+        return await self.verify_jwt(credentials.credentials)
+
+    @staticmethod
+    async def verify_jwt(jwt_token: str) -> JwtToken:
+        return await token_verifier.verify(jwt_token)
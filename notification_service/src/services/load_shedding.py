@@ -0,0 +1,102 @@
+# stdlib
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+
+# project
+from core.config import settings
+from db.db import async_session
+from repositories.sql.outbox import OutboxRepository
+from schemas.messages import MessageResponse
+from services.brokers import BrokerBase, BrokerProxy, PublishRequest
+
+logger = logging.getLogger(__name__)
+
+# Вес нового замера в скользящем среднем времени публикации
+LATENCY_SMOOTHING = 0.3
+
+
+class LoadShedder:
+    """
+    Признак перегрузки, при которой API перестает принимать сообщения.
+
+    Перегрузкой считается среднее время публикации выше `load_shedding_max_publish_latency` или очередь
+    outbox длиннее `load_shedding_max_outbox_depth`. Замер времени публикации учитывается не дольше
+    `load_shedding_sample_interval` секунд: пока сообщения не принимаются, замеры не обновляются, и после
+    этого интервала запросы снова пропускаются, чтобы проверить, спала ли нагрузка.
+    """
+
+    def __init__(self) -> None:
+        self.publish_latency: float | None = None
+        self.observed_at: float | None = None
+        self.outbox_depth = 0
+        self.outbox_sampled_at: float | None = None
+        self.lock = asyncio.Lock()
+
+    def observe_publish(self, duration: float) -> None:
+        if self.publish_latency is None or not self.is_latency_fresh():
+            self.publish_latency = duration
+        else:
+            self.publish_latency += LATENCY_SMOOTHING * (duration - self.publish_latency)
+        self.observed_at = time.monotonic()
+
+    def is_latency_fresh(self) -> bool:
+        return (
+            self.observed_at is not None
+            and time.monotonic() - self.observed_at < settings.load_shedding_sample_interval
+        )
+
+    async def get_overload_reason(self) -> str | None:
+        """Возвращает причину перегрузки или None, если сообщения можно принимать."""
+        if settings.outbox_enabled:
+            await self.refresh_outbox_depth()
+            if self.outbox_depth >= settings.load_shedding_max_outbox_depth:
+                return f"Outbox depth is above {settings.load_shedding_max_outbox_depth}"
+        if (
+            self.publish_latency is not None
+            and self.is_latency_fresh()
+            and self.publish_latency > settings.load_shedding_max_publish_latency
+        ):
+            return f"Publish latency is above {settings.load_shedding_max_publish_latency}s"
+        return None
+
+    async def refresh_outbox_depth(self) -> None:
+        if not self.is_outbox_sample_stale():
+            return
+        async with self.lock:
+            # Пока ждали блокировку, глубину мог обновить другой запрос
+            if not self.is_outbox_sample_stale():
+                return
+            try:
+                async with async_session() as session:
+                    self.outbox_depth = await OutboxRepository(session).count(settings.load_shedding_max_outbox_depth)
+            except Exception:
+                logger.exception("Failed to sample outbox depth")
+            self.outbox_sampled_at = time.monotonic()
+
+    def is_outbox_sample_stale(self) -> bool:
+        return (
+            self.outbox_sampled_at is None
+            or time.monotonic() - self.outbox_sampled_at >= settings.load_shedding_sample_interval
+        )
+
+
+class MeteredBroker(BrokerProxy):
+    """Брокер, сообщающий время каждой публикации в `LoadShedder`."""
+
+    def __init__(self, broker: BrokerBase, load_shedder: LoadShedder) -> None:
+        super().__init__(broker)
+        self.load_shedder = load_shedder
+
+    async def send_batch(
+        self,
+        messages: Sequence[PublishRequest],
+        window: int | None = None,
+    ) -> list[MessageResponse]:
+        started_at = time.monotonic()
+        try:
+            return await self.broker.send_batch(messages, window)
+        finally:
+            if messages:
+                self.load_shedder.observe_publish(time.monotonic() - started_at)
@@ -0,0 +1,102 @@
+# stdlib
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from uuid import UUID
+
+# thirdparty
+import orjson
+
+# project
+from core.config import settings
+from enums.db import ChannelType, EventType, get_priority_for_event
+from enums.rabbitmq import get_queue_for_event
+from schemas.messages import Message, MessageHeader, MessageResponse
+from services.brokers import BrokerBase, PublishRequest
+from services.message_ingest import build_message_body
+
+logger = logging.getLogger(__name__)
+
+CoalesceKey = tuple[UUID, str, EventType, ChannelType]
+
+
+@dataclass
+class PendingBatch:
+    """Накапливаемое сообщение и результаты, которых ждут вызывающие."""
+
+    header: MessageHeader
+    x_request_id: str | None
+    subscribers: list[UUID] = field(default_factory=list)
+    waiters: list[tuple[asyncio.Future[MessageResponse], str | None]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class MessageCoalescer:
+    """
+    Объединение немедленных сообщений с одинаковым содержимым в одно сообщение очереди.
+
+    Сообщения с одинаковыми шаблоном, контекстом, типом события и каналом накапливаются не дольше
+    `coalesce_delay_ms` миллисекунд или до `coalesce_max_subscribers` подписчиков и публикуются одним
+    сообщением со всеми их подписчиками. Каждый вызывающий получает результат этой публикации.
+    """
+
+    def __init__(self, broker: BrokerBase) -> None:
+        self.broker = broker
+        self.batches: dict[CoalesceKey, PendingBatch] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def get_key(message: MessageHeader) -> CoalesceKey:
+        context_hash = hashlib.sha256(orjson.dumps(message.context, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return message.template_id, context_hash, message.event_type, message.channel_type
+
+    async def submit(self, message: Message, x_request_id: str | None = None) -> MessageResponse:
+        """Добавляет подписчиков сообщения в накапливаемую пачку и дожидается ее публикации."""
+        key = self.get_key(message)
+        batch = self.batches.get(key)
+        if batch is None:
+            batch = self.batches[key] = PendingBatch(header=message, x_request_id=x_request_id)
+            batch.timer = asyncio.get_running_loop().call_later(
+                settings.coalesce_delay_ms / 1000, self.schedule_flush, key
+            )
+        future: asyncio.Future[MessageResponse] = asyncio.get_running_loop().create_future()
+        batch.subscribers.extend(message.subscribers)
+        batch.waiters.append((future, x_request_id))
+        if len(batch.subscribers) >= settings.coalesce_max_subscribers:
+            self.schedule_flush(key)
+        return await future
+
+    def schedule_flush(self, key: CoalesceKey) -> None:
+        batch = self.batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self.flush(batch))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self, batch: PendingBatch) -> None:
+        request = PublishRequest(
+            queue_name=get_queue_for_event(batch.header.event_type).queue_name,
+            message_body=build_message_body(batch.header, batch.subscribers),
+            priority=get_priority_for_event(batch.header.event_type),
+            x_request_id=batch.x_request_id,
+        )
+        try:
+            (result,) = await self.broker.send_batch([request])
+        except Exception as e:
+            logger.exception(f"Failed to publish coalesced message for {len(batch.waiters)} requests")
+            result = request.as_response(e)
+        for future, x_request_id in batch.waiters:
+            # Вызывающий мог не дождаться результата, например после разрыва соединения
+            if not future.done():
+                future.set_result(result.model_copy(update={"x_request_id": x_request_id}))
+
+    async def close(self) -> None:
+        """Публикует накопленные пачки и дожидается окончания публикаций."""
+        for key in list(self.batches):
+            self.schedule_flush(key)
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
@@ -0,0 +1,166 @@
+# stdlib
+import logging
+from collections.abc import AsyncIterator, Sequence
+from uuid import UUID, uuid4
+
+# thirdparty
+import orjson
+
+# project
+from core.config import settings
+from enums.db import get_priority_for_event
+from enums.rabbitmq import MessageType, get_queue_for_event
+from exceptions.rate_limit import RateLimitExceededError
+from schemas.messages import IngestProgress, MessageHeader
+from services.brokers import BrokerBase, PublishRequest
+from services.rate_limiter import RateLimiter, RateLimitResult
+
+logger = logging.getLogger(__name__)
+
+
+class LineTooLongError(ValueError):
+    pass
+
+
+def build_message_body(
+    header: MessageHeader,
+    subscribers: Sequence[UUID | str],
+    idempotency_id: str | None = None,
+) -> bytes:
+    """Собирает тело немедленного сообщения без промежуточной модели, формат совпадает с `RabbitMQMessage`."""
+    return orjson.dumps(
+        {
+            "template_id": str(header.template_id),
+            "context": header.context,
+            "subscribers": subscribers,
+            "event_type": header.event_type,
+            "channel_type": header.channel_type,
+            "notification_id": None,
+            "message_type": MessageType.IMMEDIATE,
+            "idempotency_id": idempotency_id,
+        }
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_length: int) -> AsyncIterator[bytes]:
+    """Разбивает поток байтов на непустые строки, не накапливая в памяти больше одной незавершенной строки."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line := line.strip():
+                yield line
+        if len(buffer) > max_line_length:
+            raise LineTooLongError(f"Line exceeds {max_line_length} bytes")
+    if buffer := buffer.strip():
+        yield buffer
+
+
+def parse_subscriber(line: bytes) -> UUID | None:
+    """Разбирает идентификатор подписчика, записанный строкой JSON или без кавычек."""
+    try:
+        return UUID(line.strip(b'"').decode())
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+class SubscriberStreamIngestor:
+    """
+    Потоковая отправка сообщения списку подписчиков, который не помещается в один запрос.
+
+    Идентификаторы подписчиков читаются построчно и публикуются сообщениями по `stream_ingest_chunk_size`
+    подписчиков по мере чтения, поэтому в памяти одновременно находится не больше одной такой пачки.
+    Итоговый прогресс возвращается после чтения всего потока.
+
+    Если задан `idempotency_id`, идентификаторы пачек выводятся из него и номера пачки, поэтому при повторной
+    отправке того же потока воркер отбрасывает уже обработанные пачки.
+
+    Если задан `limiter`, каждая пачка списывается из лимита отправки клиента `rate_limit_key` как одно
+    сообщение, а при исчерпании лимита чтение прекращается со статусом `rate_limited`.
+    """
+
+    def __init__(
+        self,
+        broker: BrokerBase,
+        header: MessageHeader,
+        x_request_id: str | None = None,
+        idempotency_id: str | None = None,
+        limiter: RateLimiter | None = None,
+        rate_limit_key: str | None = None,
+    ) -> None:
+        self.broker = broker
+        self.header = header
+        self.x_request_id = x_request_id
+        self.idempotency_id = idempotency_id
+        self.limiter = limiter
+        self.rate_limit_key = rate_limit_key
+        # Результат последней проверки лимита, по нему в ответ добавляются заголовки лимита
+        self.rate_limit: RateLimitResult | None = None
+        self.queue = get_queue_for_event(header.event_type)
+        self.priority = get_priority_for_event(header.event_type)
+        self.progress = IngestProgress(status="in_progress")
+
+    async def ingest(self, lines: AsyncIterator[bytes]) -> IngestProgress:
+        chunk: list[UUID] = []
+        try:
+            async for line in lines:
+                subscriber = parse_subscriber(line)
+                if subscriber is None:
+                    self.progress.invalid += 1
+                    continue
+                chunk.append(subscriber)
+                if len(chunk) >= settings.stream_ingest_chunk_size:
+                    await self.publish(chunk)
+                    chunk = []
+            if chunk:
+                await self.publish(chunk)
+        except LineTooLongError as e:
+            self.progress.status = "error"
+            self.progress.message = str(e)
+        except RateLimitExceededError as e:
+            self.progress.status = "rate_limited"
+            self.progress.message = str(e)
+        else:
+            self.progress.status = "completed"
+        logger.info(
+            f"Stream ingestion of template {self.header.template_id} finished with status {self.progress.status}: "
+            f"{self.progress.subscribers} subscribers, {self.progress.failed_messages} failed messages"
+        )
+        return self.progress
+
+    async def publish(self, subscribers: list[UUID]) -> None:
+        await self.charge_rate_limit()
+        # Собственный идентификатор каждой пачки позволяет воркеру отбросить ее повторную доставку
+        chunk_number = self.progress.published_messages + self.progress.failed_messages
+        message_id = f"{self.idempotency_id}:{chunk_number}" if self.idempotency_id else str(uuid4())
+        (result,) = await self.broker.send_batch(
+            [
+                PublishRequest(
+                    queue_name=self.queue.queue_name,
+                    message_body=build_message_body(self.header, subscribers, self.idempotency_id),
+                    priority=self.priority,
+                    x_request_id=self.x_request_id,
+                    message_id=message_id,
+                )
+            ]
+        )
+        if result.status == "success":
+            self.progress.published_messages += 1
+            self.progress.subscribers += len(subscribers)
+        else:
+            self.progress.failed_messages += 1
+            self.progress.failed_subscribers += len(subscribers)
+            self.progress.message = result.message
+
+    async def charge_rate_limit(self) -> None:
+        if self.limiter is None or self.rate_limit_key is None:
+            return
+        result = await self.limiter.hit(
+            self.rate_limit_key, settings.rate_limit_publish_capacity, settings.rate_limit_publish_refill_rate
+        )
+        if result is None:
+            return
+        self.rate_limit = result
+        if not result.allowed:
+            raise RateLimitExceededError("Rate limit exceeded", result.get_headers())
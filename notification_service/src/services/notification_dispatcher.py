@@ -0,0 +1,270 @@
+# stdlib
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Sequence
+from datetime import datetime
+from uuid import UUID
+
+# thirdparty
+import orjson
+
+# project
+from core.config import settings
+from enums.db import get_priority_for_event
+from enums.rabbitmq import MessageType, get_queue_for_event
+from models import NotificationRun, PeriodicNotification, ScheduledNotification
+from services.backpressure import QueueBackpressure
+from services.brokers import BrokerBase, PublishRequest
+from services.notification_runs import (
+    Notification,
+    NotificationRunTracker,
+    get_batch_message_id,
+)
+from services.notification_state import NotificationStateService
+from services.subscriber_batch import SubscriberBatch
+from services.subscriber_resolver import SubscriberResolver
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationFanOut:
+    """
+    Состояние рассылки одного уведомления, которое продвигается шагами по одному окну публикаций.
+
+    Рассылка продолжается с контрольной точки запуска `run`, а номер пачки в запуске задает
+    идентификатор сообщения, по которому потребители отбрасывают повторы.
+    """
+
+    def __init__(
+        self,
+        notification: Notification,
+        message_type: MessageType,
+        batches: AsyncGenerator[SubscriberBatch, None],
+        run: NotificationRun,
+    ) -> None:
+        self.notification = notification
+        self.message_type = message_type
+        self.batches = batches
+        self.run = run
+        self.queue = get_queue_for_event(notification.event_type)
+        self.priority = get_priority_for_event(notification.event_type)
+        self.published = 0
+        self.failed = 0
+        # Курсор и номер следующей пачки, с которых можно продолжить рассылку
+        self.cursor = run.cursor
+        self.batch_index = run.published_batches
+
+    async def step(self, broker: BrokerBase, window: int) -> bool:
+        """
+        Публикует не более `window` пачек подписчиков.
+
+        Возвращает False, когда подписчики закончились или публикация пачки не удалась. Контрольная точка
+        продвигается только за пачки, опубликованные подряд до первой ошибки, поэтому неудавшаяся пачка
+        и все следующие за ней публикуются повторно в следующий запуск.
+        """
+        pending: list[PublishRequest] = []
+        cursors: list[str | None] = []
+        exhausted = True
+        async for subscribers_batch in self.batches:
+            pending.append(self.build_request(subscribers_batch.subscribers, self.batch_index + len(pending)))
+            cursors.append(subscribers_batch.cursor)
+            if len(pending) >= window:
+                exhausted = False
+                break
+
+        results = await broker.send_batch(pending, window=window)
+        failed = [result for result in results if result.status != "success"]
+        self.published += len(results) - len(failed)
+        self.failed += len(failed)
+        published_prefix = next(
+            (index for index, result in enumerate(results) if result.status != "success"),
+            len(results),
+        )
+        if published_prefix:
+            self.cursor = cursors[published_prefix - 1]
+            self.batch_index += published_prefix
+        if failed:
+            logger.error(
+                f"Failed to publish {len(failed)} batches of notification {self.notification.id}: {failed[0].message}"
+            )
+            return False
+        return not exhausted
+
+    def build_request(self, subscribers_batch: list[str], batch_index: int) -> PublishRequest:
+        message_body = {
+            "template_id": str(self.notification.template_id),
+            "context": self.notification.context,
+            "subscribers": subscribers_batch,
+            "event_type": self.notification.event_type,
+            "channel_type": self.notification.channel_type,
+            "notification_id": str(self.notification.id),
+            "message_type": self.message_type,
+        }
+        return PublishRequest(
+            queue_name=self.queue.queue_name,
+            message_body=orjson.dumps(message_body),
+            priority=self.priority,
+            message_id=get_batch_message_id(self.run.id, batch_index),
+        )
+
+    async def close(self) -> None:
+        await self.batches.aclose()
+
+
+class NotificationDispatcher:
+    """
+    Рассылает несколько уведомлений параллельно в рамках одного запуска планировщика.
+
+    Каждое уведомление за один шаг публикует не больше одного окна сообщений и возвращается в конец очереди,
+    поэтому небольшие рассылки не ждут окончания крупных. Новые шаги не начинаются после исчерпания
+    бюджета времени, а незавершенные к этому моменту уведомления дорассылаются в следующий запуск.
+    Размер окна ограничивается глубиной и скоростью разбора целевой очереди, если включен `backpressure_enabled`.
+
+    После каждого шага сохраняется контрольная точка запуска, поэтому прерванная рассылка продолжается
+    с последней сохраненной пачки, а не с начала. Уведомление с неопубликованной пачкой не считается
+    разосланным и дорассылается с этой пачки в следующий запуск.
+    """
+
+    def __init__(
+        self,
+        broker: BrokerBase,
+        resolver: SubscriberResolver | None = None,
+        concurrency: int = settings.scheduler_concurrency,
+        time_budget: float = settings.scheduler_tick_budget,
+        runs: NotificationRunTracker | None = None,
+    ) -> None:
+        self.broker = broker
+        self.resolver = resolver or SubscriberResolver()
+        self.runs = runs or NotificationRunTracker()
+        self.concurrency = concurrency
+        self.time_budget = time_budget
+        self.backpressure = QueueBackpressure(broker) if settings.backpressure_enabled else None
+
+    async def dispatch(self, notifications: Sequence[Notification], message_type: MessageType) -> set[UUID]:
+        """Рассылает уведомления и возвращает идентификаторы тех, что были разосланы полностью."""
+        completed: set[UUID] = set()
+        if not notifications:
+            return completed
+
+        deadline = asyncio.get_running_loop().time() + self.time_budget
+        runs = await self.runs.start(notifications, message_type)
+        # Запуски, разосланные до сбоя, повторно не рассылаются
+        completed.update(notification_id for notification_id, run in runs.items() if run.is_finished)
+        fan_outs = [
+            self.create_fan_out(notification, message_type, runs[notification.id])
+            for notification in notifications
+            if notification.id in runs and notification.id not in completed
+        ]
+        queue: asyncio.Queue[NotificationFanOut] = asyncio.Queue()
+        for fan_out in fan_outs:
+            queue.put_nowait(fan_out)
+
+        workers = [
+            asyncio.create_task(self.run_worker(queue, completed, deadline))
+            for _ in range(min(self.concurrency, len(fan_outs)))
+        ]
+        try:
+            async with asyncio.timeout_at(deadline):
+                await queue.join()
+        except TimeoutError:
+            logger.warning(
+                f"Scheduler time budget of {self.time_budget}s exceeded, "
+                f"{len(fan_outs) - len(completed)} notifications postponed to the next run"
+            )
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for fan_out in fan_outs:
+                await fan_out.close()
+        await self.runs.complete(
+            [run for notification_id, run in runs.items() if notification_id in completed and not run.is_completed]
+        )
+        return completed
+
+    async def dispatch_periodic(
+        self,
+        state_service: NotificationStateService,
+        notifications: Sequence[PeriodicNotification],
+        current_time: datetime,
+    ) -> set[UUID]:
+        """
+        Рассылает периодические уведомления и переносит разосланные на следующий запуск.
+
+        Возвращает идентификаторы разосланных уведомлений и запусков, пропущенных по политике SKIP.
+        """
+        to_fire, skipped = state_service.split_misfired_periodic(notifications, current_time)
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} misfired periodic notifications")
+            await state_service.skip_periodic_runs(skipped, current_time)
+
+        completed = await self.dispatch(to_fire, MessageType.PERIODIC)
+        await state_service.update_periodic_run_times(
+            [notification for notification in to_fire if notification.id in completed],
+            current_time,
+        )
+        await self.runs.cleanup(list(completed))
+        return completed | {notification.id for notification in skipped}
+
+    async def dispatch_scheduled(
+        self,
+        state_service: NotificationStateService,
+        notifications: Sequence[ScheduledNotification],
+    ) -> set[UUID]:
+        """Рассылает запланированные уведомления и отмечает разосланные отправленными."""
+        completed = await self.dispatch(notifications, MessageType.SCHEDULED)
+        await state_service.mark_scheduled_sent_many(list(completed))
+        await self.runs.cleanup(list(completed))
+        return completed
+
+    async def run_worker(
+        self,
+        queue: asyncio.Queue[NotificationFanOut],
+        completed: set[UUID],
+        deadline: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            fan_out = await queue.get()
+            try:
+                if loop.time() >= deadline:
+                    continue
+                if await self.step(fan_out):
+                    queue.put_nowait(fan_out)
+                elif not fan_out.failed:
+                    completed.add(fan_out.notification.id)
+            except Exception:
+                logger.exception(f"Failed to dispatch notification {fan_out.notification.id}")
+            finally:
+                queue.task_done()
+
+    async def step(self, fan_out: NotificationFanOut) -> bool:
+        window = settings.rabbitmq_publish_window
+        if self.backpressure is None:
+            has_more = await fan_out.step(self.broker, window)
+        else:
+            pacer = self.backpressure.get_pacer(fan_out.queue)
+            window = await pacer.acquire(window)
+            published = fan_out.published
+            try:
+                has_more = await fan_out.step(self.broker, window)
+            finally:
+                pacer.release(window, fan_out.published - published)
+        await self.runs.checkpoint(fan_out.run, fan_out.cursor, fan_out.batch_index)
+        return has_more
+
+    def create_fan_out(
+        self,
+        notification: Notification,
+        message_type: MessageType,
+        run: NotificationRun,
+    ) -> NotificationFanOut:
+        if run.published_batches:
+            logger.info(f"Resuming notification {notification.id} after {run.published_batches} published batches")
+        batches = self.resolver.resolve(
+            query_type=notification.subscriber_query_type,
+            params=notification.subscriber_query_params,
+            batch_size=settings.scheduler_batch_size,
+            cursor=run.cursor,
+        )
+        return NotificationFanOut(notification, message_type, batches, run)
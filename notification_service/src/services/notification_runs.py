@@ -0,0 +1,65 @@
+# stdlib
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID, uuid5
+
+# thirdparty
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# project
+from db.db import async_session
+from enums.rabbitmq import MessageType
+from models import NotificationRun, PeriodicNotification, ScheduledNotification
+from repositories.sql.notification_run import NotificationRunRepository
+
+Notification = PeriodicNotification | ScheduledNotification
+
+
+def get_run_time(notification: Notification) -> datetime:
+    """Время срабатывания, которое обслуживает текущая рассылка уведомления."""
+    if isinstance(notification, PeriodicNotification):
+        return notification.next_run_time
+    return notification.scheduled_time
+
+
+def get_batch_message_id(run_id: UUID, batch_index: int) -> str:
+    """Детерминированный идентификатор сообщения с пачкой подписчиков, одинаковый при повторной публикации."""
+    return str(uuid5(run_id, str(batch_index)))
+
+
+class NotificationRunTracker:
+    """
+    Хранит контрольные точки рассылок.
+
+    Каждая операция выполняется в собственной короткой сессии, поэтому трекер можно использовать
+    из параллельно работающих задач рассылки.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = async_session) -> None:
+        self.session_factory = session_factory
+
+    async def start(
+        self,
+        notifications: Sequence[Notification],
+        message_type: MessageType,
+    ) -> dict[UUID, NotificationRun]:
+        """Возвращает запуски рассылок по идентификаторам уведомлений, продолжая незавершенные."""
+        run_times = {notification.id: get_run_time(notification) for notification in notifications}
+        async with self.session_factory() as session:
+            runs = await NotificationRunRepository(session).start(message_type, list(run_times.items()))
+        return {run.notification_id: run for run in runs if run_times.get(run.notification_id) == run.run_time}
+
+    async def checkpoint(self, run: NotificationRun, cursor: str | None, published_batches: int) -> None:
+        async with self.session_factory() as session:
+            await NotificationRunRepository(session).checkpoint(run.id, cursor, published_batches)
+        run.cursor = cursor
+        run.published_batches = published_batches
+
+    async def complete(self, runs: Sequence[NotificationRun]) -> None:
+        async with self.session_factory() as session:
+            await NotificationRunRepository(session).complete([run.id for run in runs])
+
+    async def cleanup(self, notification_ids: Sequence[UUID]) -> None:
+        """Удаляет завершенные запуски после того, как срабатывание учтено в уведомлении."""
+        async with self.session_factory() as session:
+            await NotificationRunRepository(session).delete_completed(notification_ids)
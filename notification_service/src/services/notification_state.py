@@ -1,11 +1,14 @@
 # stdlib
-from datetime import UTC, datetime
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 # thirdparty
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # project
+from core.config import settings
+from enums.db import MisfirePolicy
 from models import PeriodicNotification, ScheduledNotification
 from repositories.sql.periodic_notification import (
     PeriodicNotificationRepository,
@@ -13,6 +16,7 @@ from repositories.sql.periodic_notification import (
 from repositories.sql.scheduled_notification import (
     ScheduledNotificationRepository,
 )
+from services.cron import compile_cron
 
 
 class NotificationStateService:
@@ -31,21 +35,102 @@ class NotificationStateService:
         """Получает список периодических уведомлений, готовых к отправке."""
         return await self.periodic_repo.get_pending(current_time)
 
+    async def expire_periodic(self, current_time: datetime) -> None:
+        """Выключает периодические уведомления, у которых наступил stop_date."""
+        await self.periodic_repo.update_active_status(current_time)
+
+    async def get_periodic_by_ids(self, ids: Sequence[UUID]) -> list[PeriodicNotification]:
+        """Получает активные периодические уведомления по их ID."""
+        return await self.periodic_repo.get_by_ids(list(ids))
+
+    async def get_periodic_due_times(self, ids: Sequence[UUID] | None = None) -> list[tuple[UUID, datetime]]:
+        """Получает время следующего запуска активных периодических уведомлений."""
+        return await self.periodic_repo.get_due_times(ids)
+
     async def update_periodic_run_time(self, notification_id: UUID, last_run_time: datetime | None = None) -> None:
         """Обновляет время выполнения периодического уведомления."""
         notification = await self.periodic_repo.get(notification_id)
         if not notification:
             return
 
-        next_run_time = notification.calculate_next_run(last_run_time)
+        last_run_time = last_run_time or datetime.now(UTC)
         await self.periodic_repo.update(
             db_obj=notification,
             obj_in={
-                "last_run_time": last_run_time or datetime.now(UTC),
-                "next_run_time": next_run_time,
+                "last_run_time": last_run_time,
+                "next_run_time": self.calculate_next_run_time(notification, last_run_time),
             },
         )
 
+    async def update_periodic_run_times(
+        self,
+        notifications: Sequence[PeriodicNotification],
+        last_run_time: datetime | None = None,
+    ) -> None:
+        """Пересчитывает время следующего запуска уведомлений в памяти и сохраняет его одним запросом."""
+        last_run_time = last_run_time or datetime.now(UTC)
+        updated_at = datetime.now(UTC)
+        await self.periodic_repo.update_run_times(
+            [
+                {
+                    "id": notification.id,
+                    "last_run_time": last_run_time,
+                    "next_run_time": self.calculate_next_run_time(notification, last_run_time),
+                    "updated_at": updated_at,
+                }
+                for notification in notifications
+            ]
+        )
+
+    async def skip_periodic_runs(self, notifications: Sequence[PeriodicNotification], current_time: datetime) -> None:
+        """Переносит пропущенные запуски уведомлений на ближайшее время без рассылки."""
+        updated_at = datetime.now(UTC)
+        await self.periodic_repo.update_run_times(
+            [
+                {
+                    "id": notification.id,
+                    "next_run_time": self.calculate_next_run_time(notification, current_time),
+                    "updated_at": updated_at,
+                }
+                for notification in notifications
+            ]
+        )
+
+    @staticmethod
+    def split_misfired_periodic(
+        notifications: Sequence[PeriodicNotification],
+        current_time: datetime,
+    ) -> tuple[list[PeriodicNotification], list[PeriodicNotification]]:
+        """Отделяет от готовых к рассылке уведомлений опоздавшие запуски с политикой SKIP."""
+        grace_time = timedelta(seconds=settings.misfire_grace_time)
+        to_fire, skipped = [], []
+        for notification in notifications:
+            if (
+                notification.misfire_policy == MisfirePolicy.SKIP
+                and current_time - notification.next_run_time > grace_time
+            ):
+                skipped.append(notification)
+            else:
+                to_fire.append(notification)
+        return to_fire, skipped
+
+    @staticmethod
+    def calculate_next_run_time(notification: PeriodicNotification, current_time: datetime) -> datetime:
+        """
+        Вычисляет время следующего запуска с учетом политики обработки пропущенных запусков.
+
+        При COALESCE и SKIP все пропущенные запуски отбрасываются. При REPLAY следующим становится
+        ближайший пропущенный запуск, но в очереди на повтор остается не больше `misfire_max_replays` запусков.
+        """
+        cron = compile_cron(notification.cron_schedule)
+        if notification.misfire_policy != MisfirePolicy.REPLAY:
+            return cron.next_after(max(current_time, notification.next_run_time))
+
+        next_run_time = cron.next_after(notification.next_run_time)
+        if next_run_time > current_time:
+            return next_run_time
+        return max(next_run_time, cron.prev_before(current_time, notification.misfire_max_replays))
+
     async def get_user_periodic(self, user_id: UUID) -> list[PeriodicNotification]:
         """Получает список периодических уведомлений пользователя."""
         return await self.periodic_repo.get_by_field_multi("subscribers", user_id)
@@ -56,6 +141,14 @@ class NotificationStateService:
         """Получает список запланированных уведомлений, готовых к отправке."""
         return await self.scheduled_repo.get_pending(current_time, limit=batch_size)
 
+    async def get_scheduled_by_ids(self, ids: Sequence[UUID]) -> list[ScheduledNotification]:
+        """Получает неотправленные запланированные уведомления по их ID."""
+        return await self.scheduled_repo.get_by_ids(list(ids))
+
+    async def get_scheduled_due_times(self, ids: Sequence[UUID] | None = None) -> list[tuple[UUID, datetime]]:
+        """Получает время отправки неотправленных запланированных уведомлений."""
+        return await self.scheduled_repo.get_due_times(ids)
+
     async def get_user_scheduled(self, user_id: UUID) -> list[ScheduledNotification]:
         """Получает список запланированных уведомлений пользователя."""
         return await self.scheduled_repo.get_by_field_multi("subscribers", user_id)
@@ -71,6 +164,10 @@ class NotificationStateService:
             obj_in={"is_sent": True},
         )
 
+    async def mark_scheduled_sent_many(self, notification_ids: Sequence[UUID]) -> None:
+        """Отмечает несколько запланированных уведомлений как отправленные."""
+        await self.scheduled_repo.mark_sent(notification_ids)
+
     async def update_scheduled_retry(
         self,
         notification_id: UUID,
@@ -0,0 +1,99 @@
+# stdlib
+import hashlib
+import logging
+import math
+from dataclasses import dataclass
+
+# thirdparty
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.requests import HTTPConnection
+
+logger = logging.getLogger(__name__)
+
+# Атомарно пополняет корзину KEYS[1] емкостью ARGV[1] со скоростью ARGV[2] токенов в секунду по времени сервера
+# и списывает ARGV[3] токенов, если их хватает. Возвращает признак успеха, остаток и время до появления токенов.
+# Дробные значения возвращаются строками, так как Lua-числа приводятся к целым.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    # Секунды до полного пополнения корзины
+    reset: int
+    retry_after: int
+
+    def get_headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+def get_client_identity(connection: HTTPConnection) -> str:
+    """Идентифицирует клиента по токену доступа, а без него - по адресу."""
+    authorization = connection.headers.get("Authorization", "")
+    token = authorization.removeprefix("Bearer ").strip() or connection.cookies.get("access_token")
+    if token:
+        return "token:" + hashlib.sha256(token.encode()).hexdigest()[:32]
+    address = connection.headers.get("X-Real-IP") or (connection.client.host if connection.client else "unknown")
+    return f"address:{address}"
+
+
+class RateLimiter:
+    """
+    Лимиты запросов по алгоритму token bucket, хранящиеся в Redis.
+
+    Корзина пополняется и списывается одним Lua-скриптом, поэтому лимит соблюдается при любом числе
+    экземпляров API. При ошибке Redis запрос пропускается: недоступность лимитов не должна останавливать API.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> RateLimitResult | None:
+        """Списывает `cost` запросов из корзины `key`. Возвращает None, если лимит проверить не удалось."""
+        try:
+            allowed, tokens, retry_after = await self.script(
+                keys=[f"ratelimit:{key}"], args=[capacity, refill_rate, cost]
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to check rate limit {key}: {e}")
+            return None
+        remaining = float(tokens)
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=capacity,
+            remaining=math.floor(remaining),
+            reset=math.ceil((capacity - remaining) / refill_rate),
+            retry_after=math.ceil(float(retry_after)),
+        )
@@ -0,0 +1,123 @@
+# stdlib
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from uuid import uuid4
+
+# thirdparty
+import orjson
+from redis.asyncio import Redis
+
+# project
+from core.config import settings
+from services.brokers import PublishRequest
+
+logger = logging.getLogger(__name__)
+
+# Номер попытки доставки, с которым сообщение повторно опубликовано в очередь
+ATTEMPT_HEADER = "X-Retry-Attempt"
+
+# Атомарно забирает не больше ARGV[2] сообщений, время повтора которых не позже ARGV[1],
+# и переносит их время повтора на ARGV[3], чтобы неподтвержденные сообщения вернулись после сбоя воркера
+DRAIN_SCRIPT = """
+local entries = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, entry in ipairs(entries) do
+    redis.call('ZADD', KEYS[1], 'XX', ARGV[3], entry)
+end
+return entries
+"""
+
+
+@dataclass
+class RetryEntry:
+    """Сообщение, ожидающее повторной публикации в очередь."""
+
+    queue_name: str
+    body: str
+    priority: int = 1
+    headers: dict[str, str] = field(default_factory=dict)
+    attempts: int = 1
+    id: str = field(default_factory=lambda: uuid4().hex)
+
+    def as_publish_request(self) -> PublishRequest:
+        # Собственный идентификатор не дает потребителю принять повтор за дубликат исходного сообщения
+        return PublishRequest(
+            queue_name=self.queue_name,
+            message_body=self.body,
+            priority=self.priority,
+            message_id=self.id,
+            headers={**self.headers, ATTEMPT_HEADER: str(self.attempts)},
+        )
+
+
+class RetryStore:
+    """
+    Хранилище сообщений для повторной публикации на основе sorted set Redis.
+
+    Оценка элемента - время следующей попытки, поэтому воркер забирает только сообщения, для которых
+    истекла задержка, пачкой за один вызов скрипта. Забранные сообщения не удаляются, а откладываются
+    на `repeater_visibility_timeout` и удаляются только после подтверждения публикации через `ack`,
+    поэтому сообщения, забранные упавшим воркером, будут повторены снова.
+
+    Задержка растет экспоненциально с числом попыток, а сообщения, исчерпавшие `repeater_max_attempts`,
+    переносятся в список карантина очереди, ограниченный `repeater_quarantine_max_length` сообщениями
+    и `repeater_quarantine_ttl` секундами хранения.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.drain_script = redis.register_script(DRAIN_SCRIPT)
+
+    @staticmethod
+    def retry_key(queue_name: str) -> str:
+        return f"retry:{queue_name}"
+
+    @staticmethod
+    def quarantine_key(queue_name: str) -> str:
+        return f"retry:{queue_name}:quarantine"
+
+    @staticmethod
+    def dump_entry(entry: RetryEntry) -> bytes:
+        return orjson.dumps(asdict(entry))
+
+    @staticmethod
+    def get_delay(attempts: int) -> float:
+        return min(settings.repeater_retry_delay * 2 ** max(attempts - 1, 0), settings.repeater_max_retry_delay)
+
+    async def add(self, entries: list[RetryEntry], delay: float | None = None) -> None:
+        """Откладывает сообщения до следующей попытки или помещает в карантин, если попытки исчерпаны."""
+        if not entries:
+            return
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for entry in entries:
+                payload = self.dump_entry(entry)
+                if entry.attempts > settings.repeater_max_attempts:
+                    logger.error(f"Message {entry.id} quarantined after {entry.attempts} attempts")
+                    quarantine_key = self.quarantine_key(entry.queue_name)
+                    pipe.rpush(quarantine_key, payload)
+                    pipe.ltrim(quarantine_key, -settings.repeater_quarantine_max_length, -1)
+                    pipe.expire(quarantine_key, settings.repeater_quarantine_ttl)
+                    continue
+                retry_delay = self.get_delay(entry.attempts) if delay is None else delay
+                pipe.zadd(self.retry_key(entry.queue_name), {payload: now + retry_delay})
+            await pipe.execute()
+
+    async def drain(self, queue_name: str, count: int) -> list[RetryEntry]:
+        """
+        Забирает не больше `count` сообщений очереди, время повтора которых наступило.
+
+        Сообщения остаются в хранилище до вызова `ack` и снова становятся доступными
+        через `repeater_visibility_timeout` секунд.
+        """
+        now = time.time()
+        payloads = await self.drain_script(
+            keys=[self.retry_key(queue_name)],
+            args=[now, count, now + settings.repeater_visibility_timeout],
+        )
+        return [RetryEntry(**orjson.loads(payload)) for payload in payloads]
+
+    async def ack(self, queue_name: str, entries: list[RetryEntry]) -> None:
+        """Удаляет сообщения, публикация которых подтверждена брокером."""
+        if entries:
+            await self.redis.zrem(self.retry_key(queue_name), *(self.dump_entry(entry) for entry in entries))
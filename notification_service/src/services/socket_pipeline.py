@@ -0,0 +1,109 @@
+# stdlib
+import asyncio
+import logging
+from typing import Any
+
+# thirdparty
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+# project
+from core.config import settings
+from db.db import async_session
+from enums.db import get_priority_for_event
+from enums.rabbitmq import get_queue_for_event
+from repositories.sql.template import TemplateRepository
+from schemas.messages import SocketFrame
+from services.brokers import BrokerBase, PublishRequest
+from services.message_ingest import build_message_body
+
+logger = logging.getLogger(__name__)
+
+
+class SocketPipeline:
+    """
+    Конвейерная обработка сообщений одного веб-сокета.
+
+    Клиент может отправлять кадры, не дожидаясь ответа: одновременно в обработке находится не больше
+    `websocket_window` кадров, остальные ждут свободного места, и чтение сокета приостанавливается. Кадры,
+    накопившиеся к моменту публикации, проверяются одним запросом шаблонов и публикуются одной пачкой.
+    Подтверждения приходят по мере публикации пачек, поэтому их порядок может отличаться от порядка кадров.
+    """
+
+    def __init__(self, websocket: WebSocket, broker: BrokerBase, x_request_id: str | None = None) -> None:
+        self.websocket = websocket
+        self.broker = broker
+        self.x_request_id = x_request_id
+        self.window = asyncio.Semaphore(settings.websocket_window)
+        self.frames: asyncio.Queue[SocketFrame] = asyncio.Queue()
+        self.send_lock = asyncio.Lock()
+        self.tasks: set[asyncio.Task] = set()
+
+    async def submit(self, frame: SocketFrame) -> None:
+        """Ставит кадр в очередь на публикацию, ожидая свободного места в окне."""
+        await self.window.acquire()
+        self.frames.put_nowait(frame)
+
+    async def run(self) -> None:
+        """Собирает накопившиеся кадры в пачки и публикует их, не дожидаясь окончания предыдущих публикаций."""
+        while True:
+            batch = [await self.frames.get()]
+            while len(batch) < settings.websocket_batch_size and not self.frames.empty():
+                batch.append(self.frames.get_nowait())
+            task = asyncio.create_task(self.publish(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def publish(self, batch: list[SocketFrame]) -> None:
+        try:
+            acks = await self.publish_frames(batch)
+        except Exception as e:
+            logger.exception(f"Failed to publish {len(batch)} websocket frames")
+            acks = [{"id": frame.id, "status": "error", "detail": str(e)} for frame in batch]
+        finally:
+            for _ in batch:
+                self.window.release()
+        await self.reply(acks)
+
+    async def publish_frames(self, batch: list[SocketFrame]) -> list[dict[str, Any]]:
+        # Сессия БД берется только на время проверки шаблонов, а не на все время жизни сокета
+        async with async_session() as session:
+            existing_template_ids = await TemplateRepository(session).get_existing_ids(
+                {frame.message.template_id for frame in batch}
+            )
+
+        acks: list[dict[str, Any]] = []
+        published: list[SocketFrame] = []
+        requests: list[PublishRequest] = []
+        for frame in batch:
+            if frame.message.template_id not in existing_template_ids:
+                acks.append({"id": frame.id, "status": "validation_error", "detail": "Шаблон не найден!"})
+                continue
+            published.append(frame)
+            requests.append(
+                PublishRequest(
+                    queue_name=get_queue_for_event(frame.message.event_type).queue_name,
+                    message_body=build_message_body(frame.message, frame.message.subscribers),
+                    priority=get_priority_for_event(frame.message.event_type),
+                    x_request_id=self.x_request_id,
+                )
+            )
+
+        results = await self.broker.send_batch(requests)
+        acks.extend(
+            {"id": frame.id, "status": result.status, "result": result.message}
+            for frame, result in zip(published, results, strict=True)
+        )
+        return acks
+
+    async def reply(self, acks: list[dict[str, Any]]) -> None:
+        """Отправляет подтверждения одним кадром. Отправки из разных пачек не должны перемешиваться."""
+        async with self.send_lock:
+            try:
+                await self.websocket.send_json(acks)
+            except (WebSocketDisconnect, RuntimeError):
+                logger.info(f"Websocket closed before {len(acks)} acks were sent")
+
+    async def close(self) -> None:
+        """Дожидается публикации принятых в обработку пачек. Кадры, еще не взятые в пачку, отбрасываются."""
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
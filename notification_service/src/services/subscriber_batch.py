@@ -0,0 +1,10 @@
+# stdlib
+from dataclasses import dataclass
+
+
+@dataclass
+class SubscriberBatch:
+    """Пачка подписчиков и непрозрачный курсор, с которого выборка продолжается после этой пачки."""
+
+    subscribers: list[str]
+    cursor: str | None = None
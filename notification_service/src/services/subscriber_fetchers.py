@@ -4,21 +4,28 @@ from datetime import datetime
 from typing import Any
 
 # project
+from services.audience_cache import daily_window
 from services.auth_service import auth_service
+from services.subscriber_batch import SubscriberBatch
 from services.subscriber_resolver import SubscriberResolver
 
 
-@SubscriberResolver.register("birthday_today")
-async def fetch_birthday_users(params: dict[str, Any], batch_size: int) -> AsyncGenerator[list[str], None]:
-    page = 1
+@SubscriberResolver.register("birthday_today", cache_window=daily_window)
+async def fetch_birthday_users(
+    params: dict[str, Any],
+    batch_size: int,
+    cursor: str | None = None,
+) -> AsyncGenerator[SubscriberBatch, None]:
+    today = datetime.now()
     while True:
-        users = await auth_service.get_users(
-            birth_month=datetime.now().month,
-            birth_day=datetime.now().day,
-            page=page,
-            page_size=batch_size,
+        page = await auth_service.get_users_page(
+            birth_month=today.month,
+            birth_day=today.day,
+            cursor=cursor,
+            limit=batch_size,
         )
-        if not users:
+        if page.users:
+            yield SubscriberBatch(subscribers=[str(u["id"]) for u in page.users], cursor=page.next_cursor)
+        if page.next_cursor is None:
             break
-        yield [str(u["id"]) for u in users]
-        page += 1
+        cursor = page.next_cursor
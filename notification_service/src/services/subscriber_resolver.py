@@ -1,29 +1,147 @@
 # stdlib
+import asyncio
 from collections.abc import AsyncGenerator, Callable
 from typing import Any, ClassVar, Protocol
 
+# thirdparty
+from redis.asyncio import Redis
+
+# project
+from core.config import settings
+from services.audience_cache import (
+    AudienceSnapshot,
+    AudienceWindow,
+    audience_key,
+)
+from services.subscriber_batch import SubscriberBatch
+
 
 class SubscriberFetcher(Protocol):
-    def __call__(self, params: dict[str, Any], batch_size: int) -> AsyncGenerator[list[str], None]: ...
+    """
+    Функция выборки подписчиков.
+
+    Каждая пачка несет курсор, переданный в который `cursor` продолжает выборку сразу после этой пачки.
+    Для последней пачки курсор равен None.
+    """
+
+    def __call__(
+        self,
+        params: dict[str, Any],
+        batch_size: int,
+        cursor: str | None = None,
+    ) -> AsyncGenerator[SubscriberBatch, None]: ...
 
 
 class SubscriberResolver:
     _fetchers: ClassVar[dict[str, SubscriberFetcher]] = {}
+    _cache_windows: ClassVar[dict[str, Callable[[], AudienceWindow]]] = {}
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        self.redis = redis
 
     @classmethod
-    def register(cls, query_type: str) -> Callable[[SubscriberFetcher], SubscriberFetcher]:
+    def register(
+        cls,
+        query_type: str,
+        cache_window: Callable[[], AudienceWindow] | None = None,
+    ) -> Callable[[SubscriberFetcher], SubscriberFetcher]:
+        """
+        Регистрирует функцию выборки подписчиков.
+
+        :param query_type: Тип запроса подписчиков.
+        :param cache_window: Окно, в течение которого выборка не меняется и может браться из снимка.
+        """
+
         def decorator(func: SubscriberFetcher) -> SubscriberFetcher:
             cls._fetchers[query_type] = func
+            if cache_window is not None:
+                cls._cache_windows[query_type] = cache_window
             return func
 
         return decorator
 
     async def resolve(
-        self, query_type: str, params: dict[str, Any], batch_size: int = 100
-    ) -> AsyncGenerator[list[str], None]:
+        self,
+        query_type: str,
+        params: dict[str, Any],
+        batch_size: int = 100,
+        cursor: str | None = None,
+        prefetch: int | None = None,
+    ) -> AsyncGenerator[SubscriberBatch, None]:
+        """
+        Возвращает подписчиков пачками.
+
+        :param cursor: Курсор пачки, после которой нужно продолжить выборку. Продолжение всегда
+            читается из источника, минуя снимок выборки.
+        :param prefetch: Сколько пачек читать наперед, пока вызывающий код публикует текущие.
+            По умолчанию берется из `subscriber_prefetch_batches`, 0 отключает упреждающее чтение.
+        """
         if query_type not in self._fetchers:
             raise ValueError(f"Unknown subscriber query type: {query_type}")
 
-        generator = self._fetchers[query_type](params, batch_size)
-        async for batch in generator:
+        if prefetch is None:
+            prefetch = settings.subscriber_prefetch_batches
+        batches = self._read_batches(query_type, params, batch_size, cursor)
+        if prefetch > 0:
+            batches = prefetch_batches(batches, prefetch)
+        try:
+            async for batch in batches:
+                yield batch
+        finally:
+            await batches.aclose()
+
+    async def _read_batches(
+        self,
+        query_type: str,
+        params: dict[str, Any],
+        batch_size: int,
+        cursor: str | None,
+    ) -> AsyncGenerator[SubscriberBatch, None]:
+        fetcher = self._fetchers[query_type]
+        cache_window = self._cache_windows.get(query_type)
+        if cursor is not None or self.redis is None or cache_window is None or not settings.audience_cache_enabled:
+            async for batch in fetcher(params, batch_size, cursor):
+                yield batch
+            return
+
+        window = cache_window()
+        snapshot = AudienceSnapshot(self.redis, audience_key(query_type, params, batch_size, window), window.ttl)
+        async for batch in snapshot.stream(lambda: fetcher(params, batch_size)):
             yield batch
+
+
+async def prefetch_batches(
+    batches: AsyncGenerator[SubscriberBatch, None],
+    size: int,
+) -> AsyncGenerator[SubscriberBatch, None]:
+    """
+    Читает пачки в фоновой задаче не более чем на `size` пачек вперед.
+
+    Ошибка источника пробрасывается вызывающему коду после уже прочитанных пачек. При закрытии
+    генератора фоновое чтение отменяется, а источник закрывается.
+    """
+    # None в буфере означает, что источник исчерпан
+    buffer: asyncio.Queue[SubscriberBatch | Exception | None] = asyncio.Queue(maxsize=size)
+
+    async def produce() -> None:
+        try:
+            async for batch in batches:
+                await buffer.put(batch)
+        except Exception as e:
+            await buffer.put(e)
+        else:
+            await buffer.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await buffer.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        await batches.aclose()
@@ -17,21 +17,29 @@ async def test_client():
 
 
 @pytest.fixture(scope="session")
-def valid_token():
+def issue_token():
     private_key_path = Path("/app") / "tools" / "keys" / "example_private_key.pem"
     with open(private_key_path) as key_file:
         private_key = key_file.read()
 
-    now = datetime.now(UTC)
-    payload = {
-        "user": str(uuid4()),
-        "session_version": 1,
-        "iat": now,
-        "exp": now + timedelta(days=7),
-        "role": "staff_user",
-        "type": "access",
-    }
-    return jwt.encode(payload, private_key, algorithm="RS256")
+    def _issue_token() -> str:
+        now = datetime.now(UTC)
+        payload = {
+            "user": str(uuid4()),
+            "session_version": 1,
+            "iat": now,
+            "exp": now + timedelta(days=7),
+            "role": "staff_user",
+            "type": "access",
+        }
+        return jwt.encode(payload, private_key, algorithm="RS256")
+
+    return _issue_token
+
+
+@pytest.fixture(scope="session")
+def valid_token(issue_token):
+    return issue_token()
 
 
 @pytest.fixture
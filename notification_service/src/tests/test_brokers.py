@@ -0,0 +1,162 @@
+# stdlib
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from uuid import uuid4
+
+# thirdparty
+import pytest
+
+# project
+from enums.rabbitmq import QueueConfig
+from services.brokers import (
+    BROKER_BACKENDS,
+    BrokerBase,
+    BrokerMessage,
+    PublishRequest,
+    create_broker,
+)
+
+RECEIVE_TIMEOUT = 5
+
+
+@pytest.fixture(params=list(BROKER_BACKENDS))
+async def broker(request):
+    broker = create_broker(request.param)
+    await broker.connect()
+    yield broker
+    await broker.close()
+
+
+@pytest.fixture
+async def create_queue(broker: BrokerBase):
+    async def _create_queue(ttl: int = 60_000) -> str:
+        config = QueueConfig(f"test.{uuid4().hex}", ttl=ttl)
+        await broker.init_queues([config])
+        return config.queue_name
+
+    return _create_queue
+
+
+async def receive(broker: BrokerBase, queue_name: str, count: int) -> list[BrokerMessage]:
+    messages: list[BrokerMessage] = []
+    async with asyncio.timeout(RECEIVE_TIMEOUT), aclosing(broker.consume(queue_name, prefetch_count=count)) as stream:
+        async for message in stream:
+            await message.ack()
+            messages.append(message)
+            if len(messages) == count:
+                break
+    return messages
+
+
+async def next_message(stream: AsyncIterator[BrokerMessage]) -> BrokerMessage:
+    return await asyncio.wait_for(anext(stream), RECEIVE_TIMEOUT)
+
+
+@pytest.mark.asyncio
+async def test_publish_and_consume(broker: BrokerBase, create_queue):
+    queue_name = await create_queue()
+    message_id = str(uuid4())
+
+    results = await broker.send_batch(
+        [
+            PublishRequest(
+                queue_name=queue_name,
+                message_body='{"key": "value"}',
+                priority=3,
+                x_request_id="request-id",
+                message_id=message_id,
+                headers={"X-Custom": "custom"},
+            )
+        ]
+    )
+
+    assert [result.status for result in results] == ["success"]
+    (message,) = await receive(broker, queue_name, 1)
+    assert message.body == b'{"key": "value"}'
+    assert message.message_id == message_id
+    assert message.priority == 3
+    assert message.headers["X-Request-Id"] == "request-id"
+    assert message.headers["X-Custom"] == "custom"
+
+
+@pytest.mark.asyncio
+async def test_send_batch_keeps_order(broker: BrokerBase, create_queue):
+    queue_name = await create_queue()
+    requests = [PublishRequest(queue_name=queue_name, message_body=str(i)) for i in range(50)]
+
+    results = await broker.send_batch(requests, window=8)
+
+    assert all(result.status == "success" for result in results)
+    messages = await receive(broker, queue_name, len(requests))
+    assert [message.body.decode() for message in messages] == [str(i) for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_delivered_first(broker: BrokerBase, create_queue):
+    queue_name = await create_queue()
+    await broker.send_batch(
+        [
+            PublishRequest(queue_name=queue_name, message_body="low", priority=1),
+            PublishRequest(queue_name=queue_name, message_body="high", priority=5),
+            PublishRequest(queue_name=queue_name, message_body="medium", priority=3),
+        ]
+    )
+
+    messages = await receive(broker, queue_name, 3)
+
+    assert [message.body for message in messages] == [b"high", b"medium", b"low"]
+
+
+@pytest.mark.asyncio
+async def test_nack_with_requeue_redelivers(broker: BrokerBase, create_queue):
+    queue_name = await create_queue()
+    await broker.send_message(queue_name, "retry me")
+
+    async with aclosing(broker.consume(queue_name, prefetch_count=1)) as stream:
+        message = await next_message(stream)
+        await message.nack(requeue=True)
+        redelivered = await next_message(stream)
+        await redelivered.ack()
+
+    assert redelivered.body == b"retry me"
+
+
+@pytest.mark.asyncio
+async def test_failed_processing_drops_message(broker: BrokerBase, create_queue):
+    queue_name = await create_queue()
+    await broker.send_message(queue_name, "poison")
+    await broker.send_message(queue_name, "next")
+
+    async with aclosing(broker.consume(queue_name, prefetch_count=1)) as stream:
+        message = await next_message(stream)
+        with pytest.raises(RuntimeError):
+            async with message.process():
+                raise RuntimeError("processing failed")
+        following = await next_message(stream)
+        await following.ack()
+
+    assert following.body == b"next"
+
+
+@pytest.mark.asyncio
+async def test_expired_messages_are_not_delivered(broker: BrokerBase, create_queue):
+    queue_name = await create_queue(ttl=100)
+    await broker.send_message(queue_name, "expired")
+    await asyncio.sleep(0.5)
+    await broker.send_message(queue_name, "fresh")
+
+    (message,) = await receive(broker, queue_name, 1)
+
+    assert message.body == b"fresh"
+
+
+@pytest.mark.asyncio
+async def test_queue_stats(broker: BrokerBase, create_queue):
+    queue_name = await create_queue()
+    await broker.send_batch([PublishRequest(queue_name=queue_name, message_body=str(i)) for i in range(3)])
+
+    stats = await broker.get_queue_stats(queue_name)
+
+    assert stats.message_count == 3
+    assert stats.consumer_count == 0
@@ -0,0 +1,106 @@
+# stdlib
+import asyncio
+from uuid import uuid4
+
+# thirdparty
+import orjson
+import pytest
+
+# project
+from core.config import settings
+from enums.db import EventType
+from enums.rabbitmq import get_queue_for_event
+from schemas.messages import Message
+from services.brokers import BrokerBase, create_broker
+from services.message_coalescer import MessageCoalescer
+
+RECEIVE_TIMEOUT = 5
+
+
+@pytest.fixture
+async def broker():
+    broker = create_broker("memory")
+    await broker.connect()
+    await broker.init_queues()
+    yield broker
+    await broker.close()
+
+
+@pytest.fixture
+async def coalescer(broker: BrokerBase):
+    coalescer = MessageCoalescer(broker)
+    yield coalescer
+    await coalescer.close()
+
+
+@pytest.fixture
+def build_message():
+    template_id = uuid4()
+
+    def _build_message(subscribers_count: int = 1) -> Message:
+        return Message(
+            event_type=EventType.NEW_MOVIE,
+            template_id=template_id,
+            context={"username": "test_user"},
+            subscribers=[uuid4() for _ in range(subscribers_count)],
+        )
+
+    return _build_message
+
+
+def get_queue_name() -> str:
+    return get_queue_for_event(EventType.NEW_MOVIE).queue_name
+
+
+@pytest.mark.asyncio
+async def test_waiters_share_one_publish(broker: BrokerBase, coalescer: MessageCoalescer, build_message):
+    messages = [build_message() for _ in range(5)]
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.submit(message, f"request-{index}") for index, message in enumerate(messages))),
+        RECEIVE_TIMEOUT,
+    )
+
+    assert [result.status for result in results] == ["success"] * len(messages)
+    assert [result.x_request_id for result in results] == [f"request-{index}" for index in range(len(messages))]
+    assert (await broker.get_queue_stats(get_queue_name())).message_count == 1
+    (published,) = broker.get_queue(get_queue_name()).messages
+    body = orjson.loads(published.request.message_body)
+    assert body["subscribers"] == [str(message.subscribers[0]) for message in messages]
+
+
+@pytest.mark.asyncio
+async def test_flush_at_max_subscribers(broker: BrokerBase, coalescer: MessageCoalescer, build_message, monkeypatch):
+    # Задержка больше таймаута теста: публикацию может вызвать только заполнение пачки
+    monkeypatch.setattr(settings, "coalesce_delay_ms", RECEIVE_TIMEOUT * 10_000)
+    monkeypatch.setattr(settings, "coalesce_max_subscribers", 3)
+
+    first = asyncio.create_task(coalescer.submit(build_message(2)))
+    await asyncio.sleep(0)
+    assert not first.done()
+
+    second = await asyncio.wait_for(coalescer.submit(build_message(1)), RECEIVE_TIMEOUT)
+
+    assert second.status == "success"
+    assert (await first).status == "success"
+    assert not coalescer.batches
+    assert (await broker.get_queue_stats(get_queue_name())).message_count == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_error_reaches_every_waiter(
+    broker: BrokerBase, coalescer: MessageCoalescer, build_message, monkeypatch
+):
+    async def failing_send_batch(*args, **kwargs):
+        raise ConnectionError("broker is unavailable")
+
+    monkeypatch.setattr(broker, "send_batch", failing_send_batch)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.submit(build_message(), f"request-{index}") for index in range(3))),
+        RECEIVE_TIMEOUT,
+    )
+
+    assert [result.status for result in results] == ["error"] * 3
+    assert {result.message for result in results} == {"broker is unavailable"}
+    assert [result.x_request_id for result in results] == [f"request-{index}" for index in range(3)]
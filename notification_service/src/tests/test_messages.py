@@ -1,4 +1,5 @@
 # stdlib
+import json
 import tempfile
 from uuid import uuid4
 
@@ -6,6 +7,9 @@ from uuid import uuid4
 import pytest
 from httpx import AsyncClient
 
+# project
+from core.config import settings
+
 
 @pytest.mark.asyncio
 async def test_send_message(test_client: AsyncClient, headers):
@@ -166,3 +170,191 @@ async def test_send_message_with_missing_required_fields(test_client: AsyncClien
     errors = send_response.json()["detail"]
     assert any("event_type" in error["loc"] for error in errors)
     assert any("template_id" in error["loc"] for error in errors)
+
+
+@pytest.mark.asyncio
+async def test_send_batch(test_client: AsyncClient, create_template, headers):
+    test_template_data = {
+        "name": "Test Template",
+        "subject": "Test Subject",
+        "body": "Test Body",
+    }
+
+    template = await create_template(test_template_data)
+
+    messages_data = [
+        {
+            "event_type": "user_registration",
+            "template_id": template["id"],
+            "context": {"username": "test_user"},
+            "subscribers": [str(uuid4())],
+        },
+        {
+            "event_type": "new_movie",
+            "template_id": str(uuid4()),
+            "context": {"username": "test_user"},
+            "subscribers": [str(uuid4())],
+        },
+        {
+            "event_type": "new_movie",
+            "template_id": template["id"],
+            "context": {"username": "test_user"},
+            "subscribers": [str(uuid4())],
+        },
+    ]
+
+    send_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-batch/",
+        json=messages_data,
+        headers=headers,
+    )
+
+    assert send_response.status_code == 201, send_response.text
+    response_data = send_response.json()
+    assert [item["status"] for item in response_data] == ["success", "error", "success"]
+    assert response_data[0]["queue"] == "notifications.high"
+    assert response_data[1]["message"] == "Template not found"
+    assert response_data[2]["queue"] == "notifications.low"
+
+
+@pytest.mark.asyncio
+async def test_send_batch_too_large(test_client: AsyncClient, headers):
+    message_data = {
+        "event_type": "custom",
+        "template_id": str(uuid4()),
+        "context": {},
+        "subscribers": [str(uuid4())],
+    }
+
+    send_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-batch/",
+        json=[message_data] * (settings.send_batch_max_size + 1),
+        headers=headers,
+    )
+
+    assert send_response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_send_stream(test_client: AsyncClient, create_template, headers):
+    test_template_data = {
+        "name": "Test Template",
+        "subject": "Test Subject",
+        "body": "Test Body",
+    }
+
+    template = await create_template(test_template_data)
+
+    header = {
+        "event_type": "new_movie",
+        "template_id": template["id"],
+        "context": {"username": "test_user"},
+    }
+    subscribers_count = settings.stream_ingest_chunk_size * 2 + 1
+    lines = [json.dumps(header)] + [str(uuid4()) for _ in range(subscribers_count)] + ["not-a-uuid"]
+
+    send_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-stream/",
+        content="\n".join(lines).encode(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert send_response.status_code == 201, send_response.text
+    progress = send_response.json()
+    assert progress["status"] == "completed"
+    assert progress["subscribers"] == subscribers_count
+    assert progress["invalid"] == 1
+    assert progress["published_messages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_send_stream_large_chunked_body(test_client: AsyncClient, create_template, headers):
+    template = await create_template({"name": "Test Template", "subject": "Test Subject", "body": "Test Body"})
+    header = {"event_type": "new_movie", "template_id": template["id"], "context": {}}
+    subscribers_count = 20000
+
+    async def body():
+        yield json.dumps(header).encode() + b"\n"
+        # Мелкие части тела отправляются chunked, пока сервер уже публикует первые пачки
+        for _ in range(subscribers_count // 100):
+            yield "".join(f"{uuid4()}\n" for _ in range(100)).encode()
+
+    send_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-stream/",
+        content=body(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert send_response.status_code == 201, send_response.text
+    progress = send_response.json()
+    assert progress["status"] == "completed"
+    assert progress["subscribers"] == subscribers_count
+    assert progress["failed_subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_send_stream_with_invalid_template(test_client: AsyncClient, headers):
+    header = {"event_type": "new_movie", "template_id": str(uuid4()), "context": {}}
+
+    send_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-stream/",
+        content=f"{json.dumps(header)}\n{uuid4()}\n".encode(),
+        headers=headers,
+    )
+
+    assert send_response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_send_message_with_idempotency_key(test_client: AsyncClient, create_template, headers):
+    template = await create_template({"name": "Test Template", "subject": "Test Subject", "body": "Test Body"})
+    message_data = {
+        "event_type": "user_registration",
+        "template_id": template["id"],
+        "context": {"username": "test_user"},
+        "subscribers": [str(uuid4())],
+    }
+    idempotency_headers = {**headers, "Content-Type": "application/json", "Idempotency-Key": str(uuid4())}
+
+    first_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-message/",
+        json=message_data,
+        headers=idempotency_headers,
+    )
+    assert first_response.status_code == 201, first_response.text
+    assert "Idempotent-Replayed" not in first_response.headers
+
+    retry_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-message/",
+        json=message_data,
+        headers=idempotency_headers,
+    )
+    assert retry_response.status_code == 201
+    assert retry_response.headers["Idempotent-Replayed"] == "true"
+    assert retry_response.json() == first_response.json()
+
+
+@pytest.mark.asyncio
+async def test_send_message_with_reused_idempotency_key(test_client: AsyncClient, create_template, headers):
+    template = await create_template({"name": "Test Template", "subject": "Test Subject", "body": "Test Body"})
+    message_data = {
+        "event_type": "user_registration",
+        "template_id": template["id"],
+        "context": {"username": "test_user"},
+        "subscribers": [str(uuid4())],
+    }
+    idempotency_headers = {**headers, "Content-Type": "application/json", "Idempotency-Key": str(uuid4())}
+
+    first_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-message/",
+        json=message_data,
+        headers=idempotency_headers,
+    )
+    assert first_response.status_code == 201, first_response.text
+
+    reused_response = await test_client.post(
+        "http://api:8000/api-notify/v1/messages/send-message/",
+        json={**message_data, "subscribers": [str(uuid4())]},
+        headers=idempotency_headers,
+    )
+    assert reused_response.status_code == 422
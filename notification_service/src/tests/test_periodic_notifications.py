@@ -189,3 +189,45 @@ async def test_create_periodic_notification_with_invalid_cron(
     )
     assert response.status_code == 422
     assert "cron_schedule" in response.json()["detail"][0]["loc"]
+
+
+@pytest.mark.asyncio
+async def test_create_periodic_notification_with_misfire_policy(
+    test_client: AsyncClient, create_template, headers
+):
+    test_template_data = {
+        "name": "Test Template",
+        "subject": "Test Subject",
+        "body": "Test Body",
+    }
+
+    template = await create_template(test_template_data)
+
+    periodic_data = {
+        "subscriber_query_type": "birthday_today",
+        "subscriber_query_params": None,
+        "template_id": template["id"],
+        "channel_type": "email",
+        "cron_schedule": "0 9 * * *",
+        "event_type": "custom",
+        "misfire_policy": "replay",
+        "misfire_max_replays": 3,
+    }
+
+    response = await test_client.post(
+        "http://api:8000/api-notify/v1/periodic/",
+        json=periodic_data,
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["misfire_policy"] == "replay"
+    assert response.json()["misfire_max_replays"] == 3
+
+    periodic_data["misfire_policy"] = "invalid_policy"
+    response = await test_client.post(
+        "http://api:8000/api-notify/v1/periodic/",
+        json=periodic_data,
+        headers=headers,
+    )
+    assert response.status_code == 422
+    assert "misfire_policy" in response.json()["detail"][0]["loc"]
@@ -0,0 +1,94 @@
+# stdlib
+import asyncio
+from uuid import uuid4
+
+# thirdparty
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+# project
+from api.v1.rate_limit import get_rate_limiter, reject_overloaded
+from core.config import settings
+from db.broker import get_load_shedder
+from handlers import exception_handlers
+from services.load_shedding import LoadShedder
+
+
+@pytest.fixture
+def load_shedder():
+    return LoadShedder()
+
+
+@pytest.fixture
+async def shedding_client(load_shedder: LoadShedder):
+    app = FastAPI(exception_handlers=exception_handlers)
+
+    @app.post("/publish", dependencies=[Depends(reject_overloaded)])
+    async def publish() -> dict:
+        return {"status": "success"}
+
+    app.dependency_overrides[get_rate_limiter] = lambda: None
+    app.dependency_overrides[get_load_shedder] = lambda: load_shedder
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_get_all_templates_rate_limit_exceeded(test_client: AsyncClient, headers, issue_token):
+    # Собственный токен не дает исчерпанному лимиту повлиять на остальные тесты
+    headers["Authorization"] = f"Bearer {issue_token()}"
+
+    responses = await asyncio.gather(
+        *(
+            test_client.get("http://api:8000/api-notify/v1/templates/", headers=headers)
+            for _ in range(settings.rate_limit_capacity * 2)
+        )
+    )
+
+    rejected = [response for response in responses if response.status_code == 429]
+    assert rejected
+    assert int(rejected[0].headers["Retry-After"]) >= 1
+    assert rejected[0].headers["RateLimit-Remaining"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_send_batch_rate_limit_charged_per_message(test_client: AsyncClient, headers, issue_token):
+    headers["Authorization"] = f"Bearer {issue_token()}"
+    message_data = {
+        "event_type": "new_movie",
+        "template_id": str(uuid4()),
+        "context": {},
+        "subscribers": [str(uuid4())],
+    }
+    batch = [message_data] * settings.send_batch_max_size
+
+    # Пачки исчерпывают корзину по числу сообщений, а не по числу запросов
+    responses = []
+    for _ in range(settings.rate_limit_publish_capacity // settings.send_batch_max_size + 1):
+        responses.append(
+            await test_client.post("http://api:8000/api-notify/v1/messages/send-batch/", json=batch, headers=headers)
+        )
+
+    assert responses[0].status_code == 201, responses[0].text
+    assert responses[-1].status_code == 429
+    assert int(responses[-1].headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_publish_rejected_when_overloaded(shedding_client: AsyncClient, load_shedder: LoadShedder):
+    load_shedder.observe_publish(settings.load_shedding_max_publish_latency * 2)
+
+    response = await shedding_client.post("/publish")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.load_shedding_retry_after)
+
+
+@pytest.mark.asyncio
+async def test_publish_accepted_when_latency_is_normal(shedding_client: AsyncClient, load_shedder: LoadShedder):
+    load_shedder.observe_publish(settings.load_shedding_max_publish_latency / 2)
+
+    response = await shedding_client.post("/publish")
+
+    assert response.status_code == 200
@@ -0,0 +1,51 @@
+# stdlib
+import asyncio
+import json
+from uuid import uuid4
+
+# thirdparty
+import pytest
+from websockets.asyncio.client import connect
+
+
+@pytest.mark.asyncio
+async def test_pipeline_socket_replies_match_frame_ids(create_template, valid_token):
+    template = await create_template(
+        {
+            "name": "Test Template",
+            "subject": "Test Subject",
+            "body": "Test Body",
+        }
+    )
+
+    def build_frame(frame_id: str | int, template_id: str) -> dict:
+        return {
+            "id": frame_id,
+            "message": {
+                "event_type": "new_movie",
+                "template_id": template_id,
+                "context": {"username": "test_user"},
+                "subscribers": [str(uuid4())],
+            },
+        }
+
+    frames = [build_frame(index, template["id"]) for index in range(5)]
+    frames += [build_frame(f"missing-{index}", str(uuid4())) for index in range(3)]
+    expected_statuses = {frame["id"]: "success" for frame in frames[:5]}
+    expected_statuses |= {frame["id"]: "validation_error" for frame in frames[5:]}
+
+    async with connect(
+        "ws://api:8000/api-notify/v1/sockets/ws/v2/send-message",
+        additional_headers={"Cookie": f"access_token={valid_token}"},
+    ) as websocket:
+        # Кадры отправляются подряд, не дожидаясь подтверждений
+        for frame in frames:
+            await websocket.send(json.dumps(frame))
+
+        acks = []
+        while len(acks) < len(frames):
+            acks.extend(json.loads(await asyncio.wait_for(websocket.recv(), timeout=10)))
+
+    assert sorted((ack["id"] for ack in acks), key=str) == sorted(expected_statuses, key=str)
+    for ack in acks:
+        assert ack["status"] == expected_statuses[ack["id"]], ack
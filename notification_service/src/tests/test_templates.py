@@ -171,3 +171,107 @@ async def test_get_all_templates(test_client: AsyncClient, headers):
 
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+@pytest.mark.asyncio
+async def test_get_all_templates_with_cursor(test_client: AsyncClient, create_template, headers):
+    test_data = {
+        "name": "Test Template",
+        "subject": "Test Subject",
+        "body": "Test Body",
+    }
+    created_ids = {(await create_template(test_data))["id"] for _ in range(3)}
+
+    seen_ids: list[str] = []
+    params: dict[str, str | int] = {"page_size": 2}
+    while True:
+        response = await test_client.get(
+            "http://api:8000/api-notify/v1/templates/",
+            params=params,
+            headers=headers,
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert all("body" not in template for template in page)
+        seen_ids.extend(template["id"] for template in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"page_size": 2, "cursor": cursor}
+
+    assert len(seen_ids) == len(set(seen_ids))
+    assert created_ids <= set(seen_ids)
+
+
+@pytest.mark.asyncio
+async def test_get_all_templates_with_body(test_client: AsyncClient, create_template, headers):
+    await create_template({"name": "Test Template", "subject": "Test Subject", "body": "Test Body"})
+
+    response = await test_client.get(
+        "http://api:8000/api-notify/v1/templates/",
+        params={"include": "body"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert all("body" in template for template in response.json())
+
+
+@pytest.mark.asyncio
+async def test_get_all_templates_with_invalid_cursor(test_client: AsyncClient, headers):
+    response = await test_client.get(
+        "http://api:8000/api-notify/v1/templates/",
+        params={"cursor": "not-a-cursor"},
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_template_not_modified(test_client: AsyncClient, create_template, headers):
+    template = await create_template({"name": "Test Template", "subject": "Test Subject", "body": "Test Body"})
+    url = f"http://api:8000/api-notify/v1/templates/{template['id']}"
+
+    response = await test_client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    not_modified_response = await test_client.get(url, headers={**headers, "If-None-Match": etag})
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers["ETag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_update_template_changes_etag(test_client: AsyncClient, create_template, headers):
+    template = await create_template({"name": "Test Template", "subject": "Test Subject", "body": "Test Body"})
+    url = f"http://api:8000/api-notify/v1/templates/{template['id']}"
+
+    response = await test_client.get(url, headers=headers)
+    etag = response.headers["ETag"]
+
+    headers.pop("Content-Type", None)
+    with tempfile.NamedTemporaryFile(mode="w+", suffix=".txt") as tmp_file:
+        tmp_file.write("Updated Body")
+        tmp_file.seek(0)
+        update_response = await test_client.put(
+            url,
+            data={"name": "Updated Template", "subject": "Updated Subject"},
+            files={"body": ("updated.txt", tmp_file, "text/plain")},
+            headers=headers,
+        )
+    assert update_response.status_code == 200
+    assert update_response.headers["ETag"] != etag
+
+    response = await test_client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["body"] == "Updated Body"
+
+
+@pytest.mark.asyncio
+async def test_get_all_templates_rate_limit_headers(test_client: AsyncClient, headers):
+    response = await test_client.get("http://api:8000/api-notify/v1/templates/", headers=headers)
+
+    assert response.status_code == 200
+    assert int(response.headers["RateLimit-Limit"]) > 0
+    assert int(response.headers["RateLimit-Remaining"]) < int(response.headers["RateLimit-Limit"])
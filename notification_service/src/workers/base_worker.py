@@ -5,10 +5,11 @@ from typing import Any
 
 # thirdparty
 from arq.worker import CronJob
+from redis.asyncio import Redis
 
 # project
 from core.config import settings
-from services.rabbitmq import RabbitMQService
+from services.brokers import create_broker
 
 CRON_ARGS = 5
 
@@ -64,10 +65,13 @@ def create_cron_job(
 
 
 async def startup(ctx: dict) -> None:
-    rabbitmq_service = RabbitMQService()
-    await rabbitmq_service.init_queues()
-    ctx["rabbitmq"] = rabbitmq_service
+    broker = create_broker()
+    await broker.init_queues()
+    ctx["broker"] = broker
+    # ctx["redis"] занят пулом ArqRedis, через который arq управляет задачами, поэтому клиент задач хранится отдельно
+    ctx["redis_client"] = Redis.from_url(settings.redis_url)
 
 
 async def shutdown(ctx: dict) -> None:
-    pass
+    await ctx["redis_client"].aclose()
+    await ctx["broker"].close()
@@ -11,7 +11,8 @@ from core.config import settings
 from db.db import async_session
 from enums.rabbitmq import RabbitMQQueues
 from schemas.messages import RabbitMQMessage
-from services.rabbitmq import RabbitMQService
+from services.brokers import BrokerBase, BrokerMessage, create_broker
+from services.retry_store import ATTEMPT_HEADER, RetryEntry, RetryStore
 from workers.former.message_processor import (
     MessageProcessorError,
     MessageProcessorService,
@@ -22,38 +23,107 @@ from workers.senders.base import SenderSendMessageError
 logger = logging.getLogger(__name__)
 EXPECTED_ARG_COUNT = 2
 
+# Состояния сообщения в ключе message:{message_id}
+MESSAGE_PROCESSING = "processing"
+MESSAGE_DONE = "done"
+
 
 class FormerWorker:
-    def __init__(self, queue_name: str) -> None:
+    def __init__(self, queue_name: str, broker: BrokerBase | None = None) -> None:
         self.queue_name = queue_name
+        self.broker = broker or create_broker()
         self.redis = Redis.from_url(settings.redis_url)
+        self.retry_store = RetryStore(self.redis)
 
     async def consume_messages(self) -> None:
-        service = RabbitMQService()
-        await service.init_queues()
-
-        assert service.channel is not None, "RabbitMQ channel is not initialized"
-
-        queue = await service.channel.get_queue(self.queue_name)
-        if queue is None:
-            raise ValueError(f"Queue {self.queue_name} does not exist")
-
-        async with queue.iterator() as queue_iter:
-            async for message in queue_iter:
-                async with message.process():
-                    async with async_session() as session:
-                        rabbit_message = RabbitMQMessage.model_validate_json(message.body.decode())
-                        processor = MessageProcessorService(session, rabbit_message, self.redis)
-                        try:
-                            await processor.initialize()
-                        except MessageProcessorError as e:
-                            logger.warning(f"Failed to process message: {e}")
-                            continue
-                        await self.send_notification(rabbit_message, processor, message.body.decode())
+        await self.broker.init_queues()
 
-    async def send_notification(
-        self, rabbit_message: RabbitMQMessage, processor: MessageProcessorService, origin_message: str
+        async for message in self.broker.consume(self.queue_name):
+            state = await self.claim_message(message.message_id)
+            if state == MESSAGE_DONE:
+                logger.info(f"Skipping duplicate message {message.message_id}")
+                await message.ack()
+                continue
+            if state == MESSAGE_PROCESSING:
+                # Сообщение обрабатывает другой воркер или воркер упал, не сняв аренду. Сообщение возвращается
+                # в очередь, пока аренда не истечет или обработка не завершится
+                logger.info(f"Message {message.message_id} is leased by another worker, requeueing")
+                await asyncio.sleep(settings.message_lease_retry_delay)
+                await message.nack(requeue=True)
+                continue
+            async with message.process():
+                try:
+                    await self.process_message(message)
+                except Exception:
+                    await self.release_message(message.message_id)
+                    raise
+                await self.complete_message(message.message_id)
+
+    async def process_message(self, message: BrokerMessage) -> None:
+        async with async_session() as session:
+            rabbit_message = RabbitMQMessage.model_validate_json(message.body)
+            processor = MessageProcessorService(session, rabbit_message, self.redis)
+            try:
+                await processor.initialize()
+            except MessageProcessorError as e:
+                logger.warning(f"Failed to process message: {e}")
+                return
+            failed_subscribers = await self.send_notification(rabbit_message, processor)
+
+        if failed_subscribers:
+            await self.schedule_retry(message, rabbit_message, failed_subscribers)
+
+    async def schedule_retry(
+        self,
+        message: BrokerMessage,
+        rabbit_message: RabbitMQMessage,
+        failed_subscribers: list[str],
     ) -> None:
+        """Откладывает повторную отправку только тем подписчикам, которым она не удалась."""
+        headers = {key: value for key, value in message.headers.items() if key != ATTEMPT_HEADER}
+        attempt = message.headers.get(ATTEMPT_HEADER)
+        entry = RetryEntry(
+            queue_name=self.queue_name,
+            body=rabbit_message.model_copy(update={"subscribers": failed_subscribers}).model_dump_json(),
+            priority=message.priority,
+            headers=headers,
+            attempts=int(attempt) + 1 if attempt and attempt.isdigit() else 1,
+        )
+        await self.retry_store.add([entry])
+
+    async def claim_message(self, message_id: str | None) -> str | None:
+        """
+        Берет аренду на обработку сообщения на `message_processing_lease` секунд.
+
+        Возвращает None, если аренда получена, иначе состояние сообщения: `MESSAGE_PROCESSING`, пока аренда
+        другой обработки не истекла, или `MESSAGE_DONE`, если сообщение уже обработано. Аренда воркера,
+        упавшего во время обработки, истекает сама, и повторная доставка сообщения обрабатывается заново.
+        """
+        if message_id is None:
+            return None
+        key = f"message:{message_id}"
+        while not await self.redis.set(key, MESSAGE_PROCESSING, nx=True, ex=settings.message_processing_lease):
+            state = await self.redis.get(key)
+            if state is not None:
+                return state.decode()
+            # Аренда истекла между командами, пробуем взять ее снова
+        return None
+
+    async def complete_message(self, message_id: str | None) -> None:
+        """Заменяет аренду отметкой об обработке, по которой повторные доставки отбрасываются."""
+        if message_id is not None:
+            await self.redis.set(f"message:{message_id}", MESSAGE_DONE, ex=settings.message_dedup_ttl)
+
+    async def release_message(self, message_id: str | None) -> None:
+        """Снимает аренду с сообщения, обработка которого прервалась, чтобы его можно было обработать повторно."""
+        if message_id is not None:
+            await self.redis.delete(f"message:{message_id}")
+
+    async def send_notification(
+        self, rabbit_message: RabbitMQMessage, processor: MessageProcessorService
+    ) -> list[str]:
+        """Отправляет уведомление подписчикам и возвращает тех, кому отправить не удалось."""
+        failed_subscribers = []
         async for subscriber, subscriber_email, formed_message in await processor.process_message():
             sender_service_class = SENDER_SERVICES.get(rabbit_message.channel_type)
             if sender_service_class is None:
@@ -68,12 +138,11 @@ class FormerWorker:
                 await sender_service.send_message()
             except SenderSendMessageError:
                 logger.warning(f"Failed to send message to {subscriber_email}")
-                await self.redis.rpush(self.queue_name, origin_message)
+                failed_subscribers.append(subscriber)
             else:
-                if rabbit_message.notification_id is not None:
-                    await self.redis.setex(
-                        f"{subscriber}:{rabbit_message.notification_id}", settings.redis_message_ttl, 1
-                    )
+                if rabbit_message.dedup_key is not None:
+                    await self.redis.setex(f"{subscriber}:{rabbit_message.dedup_key}", settings.redis_message_ttl, 1)
+        return failed_subscribers
 
 
 if __name__ == "__main__":
@@ -75,7 +75,7 @@ class MessageProcessorService:
 
     async def process_subscribers(self, message: RabbitMQMessage) -> AsyncGenerator[tuple[str, str, str], None]:
         for subscriber in message.subscribers:
-            if message.notification_id and await self.notification_sent(subscriber, message.notification_id):
+            if message.dedup_key and await self.notification_sent(subscriber, message.dedup_key):
                 continue
 
             subscriber_data = await self.get_subscriber_data(subscriber)
@@ -85,8 +85,8 @@ class MessageProcessorService:
                 await self.fill_template(subscriber_data.model_dump() | message.context),
             )
 
-    async def notification_sent(self, subscriber: str, notification_id: str) -> bool:
-        return await self.redis.exists(f"{subscriber}:{notification_id}")
+    async def notification_sent(self, subscriber: str, dedup_key: str) -> bool:
+        return await self.redis.exists(f"{subscriber}:{dedup_key}")
 
     @staticmethod
     async def get_subscriber_data(subscriber_id: str) -> UserData:
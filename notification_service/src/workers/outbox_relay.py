@@ -0,0 +1,100 @@
+# stdlib
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+# project
+from core.config import settings
+from db.db import async_session
+from models import OutboxMessage
+from repositories.sql.outbox import OutboxRepository
+from services.brokers import BrokerBase, PublishRequest, create_broker
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Ретранслятор сообщений из таблицы outbox в брокер.
+
+    Сообщения забираются пачками по `outbox_batch_size` с блокировкой строк, публикуются с ожиданием
+    подтверждения брокера и удаляются в той же транзакции, поэтому сообщение пропадает из outbox только
+    после того, как брокер его принял.
+
+    Не принятое брокером сообщение остается в outbox, а его следующая попытка откладывается с экспоненциально
+    растущей задержкой, поэтому оно не блокирует публикацию остальных сообщений. После `outbox_max_attempts`
+    попыток сообщение переносится в таблицу недоставленных `outboxdeadletter`.
+    """
+
+    def __init__(self, broker: BrokerBase | None = None) -> None:
+        self.broker = broker or create_broker()
+
+    async def run(self) -> None:
+        await self.broker.init_queues()
+        try:
+            while True:
+                try:
+                    relayed, failed = await self.relay_batch()
+                except Exception:
+                    logger.exception("Failed to relay outbox messages")
+                    await asyncio.sleep(settings.outbox_retry_delay)
+                    continue
+                if failed and not relayed:
+                    # Брокер не принимает сообщения, повтор откладывается, чтобы не нагружать его еще больше
+                    await asyncio.sleep(settings.outbox_retry_delay)
+                elif relayed < settings.outbox_batch_size:
+                    await asyncio.sleep(settings.outbox_poll_interval)
+        finally:
+            await self.broker.close()
+
+    async def relay_batch(self) -> tuple[int, int]:
+        """Переносит в брокер одну пачку сообщений и возвращает число опубликованных и не принятых брокером."""
+        async with async_session() as session:
+            repo = OutboxRepository(session)
+            messages = await repo.lock_batch(settings.outbox_batch_size)
+            if not messages:
+                return 0, 0
+            results = await self.broker.send_batch([self.as_publish_request(message) for message in messages])
+            published_ids = []
+            dead_letters: list[OutboxMessage] = []
+            dead_letter_errors: list[str | None] = []
+            now = datetime.now(UTC)
+            for message, result in zip(messages, results, strict=True):
+                if result.status == "success":
+                    published_ids.append(message.id)
+                    continue
+                message.attempts += 1
+                if message.attempts >= settings.outbox_max_attempts:
+                    dead_letters.append(message)
+                    dead_letter_errors.append(result.message)
+                else:
+                    message.next_attempt_at = now + timedelta(seconds=self.get_retry_delay(message.attempts))
+            await repo.delete(published_ids)
+            await repo.move_to_dead_letter(dead_letters, dead_letter_errors)
+            await session.commit()
+
+        failed = len(messages) - len(published_ids)
+        if failed:
+            logger.error(f"Broker rejected {failed} of {len(messages)} outbox messages")
+        if dead_letters:
+            logger.error(f"{len(dead_letters)} outbox messages moved to dead letters after exhausting attempts")
+        return len(published_ids), failed
+
+    @staticmethod
+    def get_retry_delay(attempts: int) -> float:
+        return min(settings.outbox_retry_delay * 2 ** max(attempts - 1, 0), settings.outbox_max_retry_delay)
+
+    @staticmethod
+    def as_publish_request(message: OutboxMessage) -> PublishRequest:
+        # Идентификатор строки outbox позволяет воркеру отбросить повтор, опубликованный после сбоя ретранслятора
+        return PublishRequest(
+            queue_name=message.queue_name,
+            message_body=message.body,
+            priority=message.priority,
+            message_id=message.message_id or str(message.id),
+            headers=message.headers,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(OutboxRelay().run())
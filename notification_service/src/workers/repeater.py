@@ -9,34 +9,58 @@ from redis.asyncio import Redis
 # project
 from core.config import settings
 from enums.rabbitmq import RabbitMQQueues
+from services.retry_store import RetryEntry, RetryStore
 from workers.base_worker import BaseTask, shutdown, startup
 
 if TYPE_CHECKING:
     # project
-    from services.rabbitmq import RabbitMQService
+    from services.brokers import BrokerBase
 
 logger = logging.getLogger(__name__)
 
 
 async def process_redis_messages(ctx: dict) -> None:
-    redis = Redis.from_url(settings.redis_url)
-    rabbitmq_service: RabbitMQService = ctx["rabbitmq"]
+    redis: Redis = ctx["redis_client"]
+    broker: BrokerBase = ctx["broker"]
+    retry_store = RetryStore(redis)
 
     for queue in RabbitMQQueues:
         queue_name = queue.value.queue_name
-        for _ in range(settings.repeater_batch_size):
-            message = await redis.lpop(queue_name)
-            if not message:
-                break
+        await migrate_legacy_messages(redis, retry_store, queue_name)
 
-            try:
-                await rabbitmq_service.send_message(queue_name=queue_name, message_body=message, priority=1)
-                logger.info(f"Message successfully requeued to {queue_name}")
-            except Exception as e:
-                logger.error(f"Failed to requeue message to {queue_name}: {e}")
-                await redis.rpush(queue_name, message)
+        requeued = 0
+        while entries := await retry_store.drain(queue_name, settings.repeater_batch_size):
+            results = await broker.send_batch([entry.as_publish_request() for entry in entries])
+            published: list[RetryEntry] = []
+            failed: list[RetryEntry] = []
+            for entry, result in zip(entries, results, strict=True):
+                if result.status == "success":
+                    published.append(entry)
+                else:
+                    failed.append(entry)
+            await retry_store.ack(queue_name, published)
+            requeued += len(published)
+            if failed:
+                logger.error(f"Failed to requeue {len(failed)} messages to {queue_name}")
+                # Брокер не принял сообщения, это не ошибка самих сообщений, поэтому попытка не засчитывается,
+                # а сообщения откладываются на обычную задержку вместо `repeater_visibility_timeout`
+                await retry_store.add(failed, delay=settings.repeater_retry_delay)
+                break
+            if len(entries) < settings.repeater_batch_size:
                 break
 
+        if requeued:
+            logger.info(f"{requeued} messages successfully requeued to {queue_name}")
+
+
+async def migrate_legacy_messages(redis: Redis, retry_store: RetryStore, queue_name: str) -> None:
+    """Переносит сообщения из списков, в которые их складывали предыдущие версии воркеров."""
+    while messages := await redis.lpop(queue_name, settings.repeater_batch_size):  # type: ignore[misc]
+        await retry_store.add(
+            [RetryEntry(queue_name=queue_name, body=message.decode()) for message in messages],
+            delay=0,
+        )
+
 
 tasks = [
     BaseTask(
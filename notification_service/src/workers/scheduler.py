@@ -2,14 +2,12 @@
 from datetime import UTC, datetime
 
 # thirdparty
-import orjson
 from arq.connections import RedisSettings
 
 # project
 from core.config import settings
 from db.db import get_session
-from enums.db import get_priority_for_event
-from enums.rabbitmq import MessageType, get_queue_for_event
+from services.notification_dispatcher import NotificationDispatcher
 from services.notification_state import NotificationStateService
 from services.subscriber_resolver import SubscriberResolver
 from workers.base_worker import BaseTask, shutdown, startup
@@ -17,43 +15,17 @@ from workers.base_worker import BaseTask, shutdown, startup
 
 async def send_periodic_notifications(ctx: dict) -> None:
     current_time = datetime.now(UTC)
-    resolver = SubscriberResolver()
+    dispatcher = NotificationDispatcher(ctx["broker"], SubscriberResolver(ctx["redis_client"]))
 
     async for session in get_session():
         state_service = NotificationStateService(session)
         notifications = await state_service.get_pending_periodic(current_time)
-
-        for notification in notifications:
-            async for subscribers_batch in resolver.resolve(
-                query_type=notification.subscriber_query_type,
-                params=notification.subscriber_query_params,
-                batch_size=100,
-            ):
-                message_body = {
-                    "template_id": str(notification.template_id),
-                    "context": notification.context,
-                    "subscribers": subscribers_batch,
-                    "event_type": notification.event_type,
-                    "channel_type": notification.channel_type,
-                    "notification_id": str(notification.id),
-                    "message_type": MessageType.PERIODIC,
-                }
-
-                queue = get_queue_for_event(notification.event_type)
-                priority = get_priority_for_event(notification.event_type)
-
-                await ctx["rabbitmq"].send_message(
-                    queue_name=queue.queue_name,
-                    message_body=orjson.dumps(message_body),
-                    priority=priority,
-                )
-
-            await state_service.update_periodic_run_time(notification.id, current_time)
+        await dispatcher.dispatch_periodic(state_service, notifications, current_time)
 
 
 async def send_scheduled_notifications(ctx: dict) -> None:
     current_time = datetime.now(UTC)
-    resolver = SubscriberResolver()
+    dispatcher = NotificationDispatcher(ctx["broker"], SubscriberResolver(ctx["redis_client"]))
 
     async for session in get_session():
         state_service = NotificationStateService(session)
@@ -61,31 +33,13 @@ async def send_scheduled_notifications(ctx: dict) -> None:
             current_time,
             batch_size=settings.scheduled_batch_size,
         )
+        await dispatcher.dispatch_scheduled(state_service, notifications)
 
-        for notification in notifications:
-            async for subscribers_batch in resolver.resolve(
-                query_type=notification.subscriber_query_type,
-                params=notification.subscriber_query_params,
-                batch_size=100,
-            ):
-                message_body = {
-                    "template_id": str(notification.template_id),
-                    "context": notification.context,
-                    "subscribers": subscribers_batch,
-                    "event_type": notification.event_type,
-                    "channel_type": notification.channel_type,
-                    "notification_id": str(notification.id),
-                    "message_type": MessageType.SCHEDULED,
-                }
-
-                queue = get_queue_for_event(notification.event_type)
-                priority = get_priority_for_event(notification.event_type)
 
-                await ctx["rabbitmq"].send_message(
-                    queue_name=queue.queue_name,
-                    message_body=orjson.dumps(message_body),
-                    priority=priority,
-                )
+async def expire_periodic_notifications(ctx: dict) -> None:
+    async for session in get_session():
+        state_service = NotificationStateService(session)
+        await state_service.expire_periodic(datetime.now(UTC))
 
 
 tasks = [
@@ -101,6 +55,12 @@ tasks = [
         coroutine=send_scheduled_notifications,
         cron_schedule=settings.scheduled_schedule,
     ),
+    BaseTask(
+        name="expire_periodic_notifications",
+        function="src.workers.scheduler.expire_periodic_notifications",
+        coroutine=expire_periodic_notifications,
+        cron_schedule=settings.expiry_schedule,
+    ),
 ]
 
 scheduler_settings = {
@@ -0,0 +1,263 @@
+# stdlib
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+# thirdparty
+import asyncpg
+import orjson
+from redis.asyncio import Redis
+from sqlalchemy.engine import make_url
+
+# project
+from core.config import settings
+from db.db import async_session
+from enums.rabbitmq import MessageType
+from services.brokers import create_broker
+from services.notification_dispatcher import NotificationDispatcher
+from services.notification_state import NotificationStateService
+from services.subscriber_resolver import SubscriberResolver
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "notification_changes"
+LISTENER_RETRY_INTERVAL = 5
+TABLE_TO_MESSAGE_TYPE = {
+    "periodicnotification": MessageType.PERIODIC,
+    "schedulednotification": MessageType.SCHEDULED,
+}
+
+TimerKey = tuple[MessageType, UUID]
+
+
+class TimerHeap:
+    """Min-куча времени срабатывания уведомлений. Устаревшие записи удаляются лениво при чтении вершины."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int, TimerKey]] = []
+        self._due: dict[TimerKey, datetime] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def set(self, key: TimerKey, due_time: datetime) -> None:
+        if self._due.get(key) == due_time:
+            return
+        self._due[key] = due_time
+        heapq.heappush(self._heap, (due_time, next(self._counter), key))
+
+    def discard(self, key: TimerKey) -> None:
+        self._due.pop(key, None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._due.clear()
+
+    def next_due(self) -> datetime | None:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[TimerKey]:
+        """Извлекает все уведомления, время которых наступило."""
+        keys = []
+        while (due_time := self.next_due()) is not None and due_time <= now:
+            _, _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            keys.append(key)
+        return keys
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            due_time, _, key = self._heap[0]
+            if self._due.get(key) == due_time:
+                return
+            heapq.heappop(self._heap)
+
+
+class TimerScheduler:
+    """
+    Долгоживущий планировщик, который держит время срабатывания уведомлений в памяти.
+
+    Изменения строк приходят через LISTEN/NOTIFY от триггеров на таблицах уведомлений, поэтому БД
+    не опрашивается в простое, а уведомления рассылаются точно в срок. Раз в
+    `timer_scheduler_resync_interval` секунд выполняется полная сверка на случай потерянных событий.
+    """
+
+    def __init__(self) -> None:
+        self.heap = TimerHeap()
+        self.broker = create_broker()
+        self.redis = Redis.from_url(settings.redis_url)
+        self.dispatcher = NotificationDispatcher(self.broker, SubscriberResolver(self.redis))
+        self.listener: asyncpg.Connection | None = None
+        self.wakeup = asyncio.Event()
+        self.changed: set[TimerKey] = set()
+        self.in_flight: set[TimerKey] = set()
+        self.tasks: set[asyncio.Task] = set()
+        self.next_resync = 0.0
+
+    async def run(self) -> None:
+        await self.broker.init_queues()
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self.wakeup.clear()
+                await self.ensure_listener()
+                if loop.time() >= self.next_resync:
+                    await self.resync()
+                await self.refresh_changed()
+                self.fire_due()
+                await self.sleep_until_next_event()
+        finally:
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            if self.listener is not None and not self.listener.is_closed():
+                await self.listener.close()
+            await self.broker.close()
+            await self.redis.aclose()
+
+    async def ensure_listener(self) -> None:
+        if self.listener is not None and not self.listener.is_closed():
+            return
+        dsn = make_url(settings.database_dsn).set(drivername="postgresql").render_as_string(hide_password=False)
+        try:
+            self.listener = await asyncpg.connect(dsn)
+            await self.listener.add_listener(NOTIFY_CHANNEL, self.on_notify)
+            self.listener.add_termination_listener(lambda _: self.wakeup.set())
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning(f"Failed to listen for notification changes: {e}")
+            self.listener = None
+            return
+        # События, произошедшие до подписки, могли быть пропущены
+        self.next_resync = 0.0
+
+    def on_notify(self, _connection: object, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            event = orjson.loads(payload)
+            key = (TABLE_TO_MESSAGE_TYPE[event["table"]], UUID(event["id"]))
+        except (orjson.JSONDecodeError, KeyError, ValueError):
+            logger.warning(f"Unexpected notification change payload: {payload}")
+            return
+        self.changed.add(key)
+        self.wakeup.set()
+
+    async def resync(self) -> None:
+        # Изменения, пришедшие во время выборки, могут в нее не попасть, поэтому они остаются в `changed`
+        # и перечитываются отдельно
+        self.changed.clear()
+        async with async_session() as session:
+            state_service = NotificationStateService(session)
+            # В режиме таймеров задачи ARQ не запускаются, поэтому истекшие уведомления выключаются при сверке
+            await state_service.expire_periodic(datetime.now(UTC))
+            periodic = await state_service.get_periodic_due_times()
+            scheduled = await state_service.get_scheduled_due_times()
+
+        self.heap.clear()
+        self.set_due_times(MessageType.PERIODIC, periodic)
+        self.set_due_times(MessageType.SCHEDULED, scheduled)
+        self.next_resync = asyncio.get_running_loop().time() + settings.timer_scheduler_resync_interval
+        logger.info(f"Timer scheduler synchronized {len(self.heap)} notifications")
+
+    async def refresh_changed(self) -> None:
+        changed = self.changed - self.in_flight
+        if not changed:
+            return
+        self.changed -= changed
+
+        periodic_ids = [notification_id for kind, notification_id in changed if kind == MessageType.PERIODIC]
+        scheduled_ids = [notification_id for kind, notification_id in changed if kind == MessageType.SCHEDULED]
+        async with async_session() as session:
+            state_service = NotificationStateService(session)
+            periodic = await state_service.get_periodic_due_times(periodic_ids) if periodic_ids else []
+            scheduled = await state_service.get_scheduled_due_times(scheduled_ids) if scheduled_ids else []
+
+        # Уведомления, которых нет в выборке, удалены, выключены или уже отправлены
+        for key in changed:
+            self.heap.discard(key)
+        self.set_due_times(MessageType.PERIODIC, periodic)
+        self.set_due_times(MessageType.SCHEDULED, scheduled)
+
+    def set_due_times(self, kind: MessageType, due_times: Iterable[tuple[UUID, datetime]]) -> None:
+        for notification_id, due_time in due_times:
+            key = (kind, notification_id)
+            if key not in self.in_flight:
+                self.heap.set(key, due_time)
+
+    def fire_due(self) -> None:
+        now = datetime.now(UTC)
+        keys = self.heap.pop_due(now)
+        if not keys:
+            return
+        self.in_flight.update(keys)
+        for kind in (MessageType.PERIODIC, MessageType.SCHEDULED):
+            ids = [notification_id for key_kind, notification_id in keys if key_kind == kind]
+            if ids:
+                task = asyncio.create_task(self.fire(kind, ids, now))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def fire(self, kind: MessageType, ids: list[UUID], now: datetime) -> None:
+        dispatched: set[UUID] = set()
+        expired: set[UUID] = set()
+        completed: set[UUID] = set()
+        try:
+            async with async_session() as session:
+                state_service = NotificationStateService(session)
+                if kind == MessageType.PERIODIC:
+                    periodic = []
+                    for notification in await state_service.get_periodic_by_ids(ids):
+                        if notification.stop_date is not None and notification.stop_date <= now:
+                            expired.add(notification.id)
+                        elif notification.next_run_time <= now:
+                            periodic.append(notification)
+                    dispatched = {notification.id for notification in periodic}
+                    completed = await self.dispatcher.dispatch_periodic(state_service, periodic, now)
+                else:
+                    scheduled = [
+                        notification
+                        for notification in await state_service.get_scheduled_by_ids(ids)
+                        if notification.scheduled_time <= now
+                    ]
+                    dispatched = {notification.id for notification in scheduled}
+                    completed = await self.dispatcher.dispatch_scheduled(state_service, scheduled)
+        except Exception:
+            logger.exception(f"Failed to fire {len(ids)} {kind} notifications")
+        finally:
+            self.after_fire(kind, ids, dispatched - completed, expired)
+
+    def after_fire(self, kind: MessageType, ids: list[UUID], failed: set[UUID], expired: set[UUID]) -> None:
+        retry_time = datetime.now(UTC) + timedelta(seconds=settings.timer_scheduler_retry_delay)
+        for notification_id in ids:
+            key = (kind, notification_id)
+            self.in_flight.discard(key)
+            if notification_id in failed:
+                # Повтор с задержкой, чтобы не зациклиться на постоянной ошибке рассылки
+                self.heap.set(key, retry_time)
+            elif notification_id not in expired:
+                # Время следующего срабатывания перечитывается из БД
+                self.changed.add(key)
+        self.wakeup.set()
+
+    async def sleep_until_next_event(self) -> None:
+        loop = asyncio.get_running_loop()
+        timeout = self.next_resync - loop.time()
+        if self.listener is None:
+            timeout = min(timeout, LISTENER_RETRY_INTERVAL)
+        next_due = self.heap.next_due()
+        if next_due is not None:
+            timeout = min(timeout, (next_due - datetime.now(UTC)).total_seconds())
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+        except TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    asyncio.run(TimerScheduler().run())